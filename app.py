@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, send_file, session
+from flask import Flask, render_template, request, jsonify, send_file, session, Response, stream_with_context, g, has_request_context
 import os
 import sys
 import json
@@ -15,17 +15,26 @@ try:
     from core.document_analyzer import DocumentAnalyzer
     from core.ai_feedback_engine import AIFeedbackEngine
     from core.database_manager import db_manager  # ✅ NEW: Auto-save database
-    from utils.statistics_manager import StatisticsManager
+    from utils.statistics_manager import SessionStatistics
     from utils.document_processor import DocumentProcessor
-    from utils.pattern_analyzer import DocumentPatternAnalyzer
+    from utils.pattern_analyzer import get_pattern_analyzer
     from utils.audit_logger import AuditLogger
-    from utils.learning_system import FeedbackLearningSystem
+    from utils.learning_system import get_learning_system
     from utils.s3_export_manager import S3ExportManager
     from utils.activity_logger import ActivityLogger
+    from core.single_flight import get_single_flight, make_flight_key
+    from core.speculative_analysis import SpeculativeAnalyzer, SpeculativeConfig, plan_speculative_sections
+    from utils.thread_pool_manager import get_task_manager, TaskQueueFull
+    from core.circuit_breaker import get_circuit_breaker
+    from core.session_store import create_session_store
+    from utils.task_functions import analyze_section_sync
 except ImportError as e:
     print(f"⚠️ Import error: {e}")
     print("Creating fallback components...")
 
+# In-process task queue used instead of RQ when Redis is unavailable (opt-in)
+LOCAL_TASK_QUEUE_ENABLED = os.environ.get('LOCAL_TASK_QUEUE_ENABLED', 'false').lower() == 'true'
+
 # ✅ RQ (Redis Queue) - Simpler, no signature expiration, no S3 polling
 # Replaced Celery + SQS + S3 backend with RQ + Redis (100% free, open source)
 
@@ -39,9 +48,14 @@ try:
         monitor_health
     )
     from rq_config import get_queue, is_rq_available, redis_conn
+    from rq_events import listen_session_events
+    from rq_fair_scheduler import get_fair_scheduler, LANES
+    from rq_single_flight import claim_flight, release_flight, get_flight_stats
+    from rq_events import add_job_watcher
     from rq.job import Job
     from core.async_request_manager import get_async_request_manager
-    from config.model_config_enhanced import get_default_models
+    from core.document_batch_analyzer import DocumentBatchAnalyzer
+    from config.model_config_enhanced import get_default_models, get_primary_model
 
     # Check if Redis is actually running
     if is_rq_available():
@@ -149,11 +163,10 @@ if os.path.exists(env_file):
 try:
     document_analyzer = DocumentAnalyzer()
     ai_engine = AIFeedbackEngine()
-    stats_manager = StatisticsManager()
     doc_processor = DocumentProcessor()
-    pattern_analyzer = DocumentPatternAnalyzer()
+    pattern_analyzer = get_pattern_analyzer()
     audit_logger = AuditLogger()
-    learning_system = FeedbackLearningSystem()
+    learning_system = get_learning_system()
     s3_export_manager = S3ExportManager()
     
     print("AI-Prism components initialized successfully")
@@ -166,34 +179,65 @@ except Exception as e:
     import traceback
     traceback.print_exc()
 
-# Session storage with thread safety
+# Session storage (in-memory, Redis or SQLite - see core/session_store.py)
 import threading
-sessions = {}
-sessions_lock = threading.Lock()  # Protect concurrent access to sessions dictionary
 
 # Thread-safe session access helpers
 def get_session(session_id):
-    """Thread-safe session retrieval"""
-    with sessions_lock:
-        return sessions.get(session_id)
+    """
+    Thread-safe session retrieval
+
+    Sessions fetched during a request are saved when the request ends
+    (save_touched_sessions), so route handlers can keep mutating them in place.
+    """
+    review_session = session_store.get(session_id)
+    if review_session is not None and has_request_context():
+        g.setdefault('touched_sessions', {})[session_id] = review_session
+    return review_session
 
 def set_session(session_id, review_session):
     """Thread-safe session storage"""
-    with sessions_lock:
-        sessions[session_id] = review_session
+    review_session.session_id = session_id
+    session_store.save(review_session)
+    if has_request_context():
+        # Later changes in the same request are saved at teardown
+        g.setdefault('touched_sessions', {})[session_id] = review_session
+
+def save_session(review_session):
+    """Write a session through to the store (for changes made outside a request)"""
+    try:
+        session_store.save(review_session)
+    except Exception as e:
+        print(f"⚠️ Could not save session {review_session.session_id}: {e}", flush=True)
 
 def delete_session(session_id):
     """Thread-safe session deletion"""
-    with sessions_lock:
-        if session_id in sessions:
-            del sessions[session_id]
+    session_store.delete(session_id)
 
 def session_exists(session_id):
     """Thread-safe session existence check"""
-    with sessions_lock:
-        return session_id in sessions
+    return session_store.exists(session_id)
+
+@app.teardown_request
+def save_touched_sessions(exc=None):
+    """Write through every session this request fetched (no-op if unchanged)"""
+    for review_session in g.pop('touched_sessions', {}).values():
+        save_session(review_session)
 
 class ReviewSession:
+    # Fields persisted by the session store (plus the logged entries, see
+    # to_dict); analyzers are per-process
+    DATA_FIELDS = (
+        'session_id', 'document_name', 'document_path', 'guidelines_name', 'guidelines_path',
+        'guidelines_preference', 'sections', 'paragraph_indices', 'current_section',
+        'feedback_data', 'accepted_feedback', 'rejected_feedback', 'user_feedback',
+        'chat_history', 'activity_log', 'patterns_data', 'learning_data',
+        'speculative_jobs', 'speculative_results', 'document_jobs', 'output_filename'
+    )
+    # /analyze_document status snapshots kept per session
+    MAX_DOCUMENT_JOBS = 10
+    DEFAULTDICT_FIELDS = ('accepted_feedback', 'rejected_feedback', 'user_feedback')
+
     def __init__(self):
         self.session_id = str(uuid.uuid4())
         self.document_name = ""
@@ -202,7 +246,6 @@ class ReviewSession:
         self.guidelines_path = ""
         self.guidelines_preference = "both"
         self.sections = {}
-        self.section_paragraphs = {}
         self.paragraph_indices = {}
         self.current_section = 0
         self.feedback_data = {}
@@ -213,10 +256,63 @@ class ReviewSession:
         self.activity_log = []
         self.patterns_data = {}
         self.learning_data = {}
-        self.audit_logger = AuditLogger()
-        self.pattern_analyzer = DocumentPatternAnalyzer()
-        self.learning_system = FeedbackLearningSystem()
+        self._audit_logger = None
         self.activity_logger = ActivityLogger(self.session_id)
+        self.statistics = SessionStatistics(self)
+        # Background pre-analysis: RQ job ids / in-process results per section
+        self.speculative_jobs = {}
+        self.speculative_results = {}
+        # /analyze_document job id -> status snapshot (for polls on other workers)
+        self.document_jobs = {}
+        # Reviewed .docx written by /complete_review
+        self.output_filename = ""
+
+    @property
+    def audit_logger(self):
+        """Per-session audit log view, created on first use"""
+        if self._audit_logger is None:
+            self._audit_logger = AuditLogger(session_id=self.session_id[:8])
+        return self._audit_logger
+
+    @property
+    def pattern_analyzer(self):
+        """Process-wide pattern analyzer (loads its data on first use)"""
+        return pattern_analyzer
+
+    @property
+    def learning_system(self):
+        """Process-wide learning system (loads its data on first use)"""
+        return learning_system
+
+    def to_dict(self):
+        """Data fields only, for the session store"""
+        data = {field: getattr(self, field) for field in self.DATA_FIELDS}
+        # Logged entries travel with the session so the activity report and
+        # exports include what other workers recorded
+        data['activities'] = self.activity_logger.activities
+        data['audit_logs'] = self._audit_logger.session_logs if self._audit_logger is not None else []
+        return data
+
+    def load_dict(self, data):
+        """Replace the data fields with ones loaded from the session store"""
+        for field in self.DATA_FIELDS:
+            if field not in data:
+                continue
+            value = data[field]
+            if field in self.DEFAULTDICT_FIELDS:
+                value = defaultdict(list, value)
+            setattr(self, field, value)
+
+        if self.activity_logger.session_id != self.session_id:
+            self.activity_logger = ActivityLogger(self.session_id)
+            self._audit_logger = None
+        if 'activities' in data:
+            self.activity_logger.activities = data['activities']
+        if data.get('audit_logs'):
+            self.audit_logger.restore_session_logs(data['audit_logs'])
+        self.statistics.rebuild()
+
+session_store = create_session_store(ReviewSession)
 
 @app.route('/')
 def index():
@@ -272,11 +368,11 @@ def upload_document():
                 review_session.guidelines_name = guidelines_filename
                 guidelines_uploaded = True
         
-        # Extract sections using document analyzer
-        sections, section_paragraphs, paragraph_indices = document_analyzer.extract_sections_from_docx(file_path)
+        # Extract sections using document analyzer (paragraph objects are not
+        # kept - they pin the whole python-docx tree in memory)
+        sections, _, paragraph_indices = document_analyzer.extract_sections_from_docx(file_path)
         
         review_session.sections = sections
-        review_session.section_paragraphs = section_paragraphs
         review_session.paragraph_indices = paragraph_indices
 
         # Store session (thread-safe)
@@ -324,6 +420,9 @@ def upload_document():
         except Exception as db_error:
             print(f"⚠️ Database save error: {db_error}")
 
+        # Opt-in: start analysing the first sections before the reviewer opens them
+        speculative_sections = schedule_speculative_analysis(review_session)
+
         return jsonify({
             'success': True,
             'session_id': session_id,
@@ -331,7 +430,8 @@ def upload_document():
             'sections': list(sections.keys()),
             'total_sections': len(sections),
             'guidelines_uploaded': guidelines_uploaded,
-            'guidelines_preference': guidelines_preference
+            'guidelines_preference': guidelines_preference,
+            'speculative_sections': speculative_sections
         })
         
     except Exception as e:
@@ -371,6 +471,115 @@ def get_section_content():
         print(f"ERROR getting section content: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def store_section_feedback(review_session, section_name, section_content, analysis_result):
+    """
+    Validate an analysis result and store it in the session and statistics
+
+    Shared by /analyze_section and /analyze_document so both paths produce
+    identical feedback_data, statistics and activity log entries.
+
+    Returns:
+        List of validated feedback items stored for the section
+    """
+    # Ensure we have a valid result structure
+    if not isinstance(analysis_result, dict):
+        print(f"Invalid analysis result type: {type(analysis_result)}")
+        analysis_result = {'feedback_items': [], 'error': 'Invalid result format'}
+
+    feedback_items = analysis_result.get('feedback_items', [])
+    if not isinstance(feedback_items, list):
+        print(f"Invalid feedback_items type: {type(feedback_items)}")
+        feedback_items = []
+
+    # If no feedback items and analysis failed, create a basic feedback item
+    if not feedback_items and analysis_result.get('error'):
+        print(f"Creating fallback feedback for failed analysis")
+        feedback_items = [{
+            'id': f"{section_name}_fallback_{datetime.now().strftime('%H%M%S')}",
+            'type': 'suggestion',
+            'category': 'Analysis Status',
+            'description': f'AI analysis temporarily unavailable for this section. Content appears to be {len(section_content)} characters long.',
+            'suggestion': 'Manual review recommended. Check AWS credentials and Bedrock access if real AI analysis is needed.',
+            'example': '',
+            'questions': ['Is the content complete and accurate?', 'Are there any obvious gaps or issues?'],
+            'hawkeye_refs': [13],
+            'risk_level': 'Low',
+            'confidence': 0.5
+        }]
+
+    # Validate feedback items structure
+    if not isinstance(feedback_items, list):
+        print(f"Invalid feedback_items type: {type(feedback_items)}")
+        feedback_items = []
+
+    # Ensure each feedback item has required fields
+    validated_feedback = []
+    for i, item in enumerate(feedback_items):
+        if isinstance(item, dict):
+            # Ensure required fields exist
+            validated_item = {
+                'id': item.get('id', f"{section_name}_{i}_{datetime.now().strftime('%H%M%S')}"),
+                'type': item.get('type', 'suggestion'),
+                'category': item.get('category', 'General'),
+                'description': item.get('description', 'No description provided'),
+                'suggestion': item.get('suggestion', ''),
+                'example': item.get('example', ''),
+                'questions': item.get('questions', []) if isinstance(item.get('questions'), list) else [],
+                'hawkeye_refs': item.get('hawkeye_refs', []) if isinstance(item.get('hawkeye_refs'), list) else [],
+                'risk_level': item.get('risk_level', 'Low'),
+                'confidence': float(item.get('confidence', 0.8)) if isinstance(item.get('confidence'), (int, float)) else 0.8
+            }
+            validated_feedback.append(validated_item)
+        else:
+            print(f"Skipping invalid feedback item {i}: {type(item)}")
+
+    feedback_items = validated_feedback
+
+    # Log final result
+    print(f"Section analysis completed: {section_name} - {len(feedback_items)} validated feedback items")
+
+    # Store feedback data
+    review_session.feedback_data[section_name] = feedback_items
+
+    # Update statistics immediately
+    try:
+        review_session.statistics.update_feedback_data(section_name, feedback_items)
+    except Exception as stats_error:
+        print(f"WARNING Statistics update failed: {stats_error}")
+
+    # Log activity
+    try:
+        review_session.activity_log.append({
+            'timestamp': datetime.now().isoformat(),
+            'action': 'SECTION_ANALYZED',
+            'details': f'Section {section_name} analyzed - {len(feedback_items)} feedback items generated'
+        })
+
+        # Log with audit logger
+        review_session.audit_logger.log('SECTION_ANALYZED', f'Section {section_name} analyzed - {len(feedback_items)} feedback items generated')
+    except Exception as log_error:
+        print(f"WARNING Logging failed: {log_error}")
+
+    return feedback_items
+
+def analysis_flight_key(section_name, content, doc_type="Full Write-up"):
+    """Single-flight key for a section analysis on the model that will serve it"""
+    if ENHANCED_MODE and RQ_ENABLED:
+        model_id = get_primary_model().id
+    else:
+        model_id = model_config.get_model_config()['model_id']
+    return make_flight_key(section_name, content, doc_type, model_id)
+
+def analyze_section_coalesced(section_name, content, doc_type="Full Write-up", session_id=None):
+    """analyze_section_sync behind single-flight (local task queue tasks)"""
+    result, shared = get_single_flight().do(
+        analysis_flight_key(section_name, content, doc_type),
+        lambda: analyze_section_sync(section_name, content, doc_type, session_id)
+    )
+    if shared:
+        print(f"🔗 Reused result of an identical in-flight analysis", flush=True)
+    return result
+
 @app.route('/analyze_section', methods=['POST'])
 def analyze_section():
     try:
@@ -420,28 +629,58 @@ def analyze_section():
         print("=" * 80, flush=True)
         sys.stdout.flush()
 
+        # Pre-analyzed in the background? Serve it instantly, then keep looking ahead
+        analysis_result = take_speculative_result(review_session, section_name)
+        schedule_speculative_analysis(review_session, after_section=section_name)
+
+        if analysis_result is not None:
+            print(f"🔮 Serving pre-analyzed result for '{section_name}'", flush=True)
+
         # ✅ Check if Enhanced Mode is available (NEW - RQ with multi-model fallback)
-        if ENHANCED_MODE and RQ_ENABLED:
+        elif ENHANCED_MODE and RQ_ENABLED:
             # Use RQ async processing (simpler than Celery, no signature expiration!)
             print(f"✨ Submitting to RQ task queue (NO signature expiration!)", flush=True)
 
-            # Submit task to RQ queue
-            queue = get_queue('analysis')
-            job = queue.enqueue(
-                analyze_section_task,
-                args=(section_name, section_content, "Full Write-up", session_id),
-                job_timeout=300  # 5 minutes timeout
-            )
+            # Submit through the fair scheduler: priority lane + round-robin across sessions
+            lane = data.get('priority', 'interactive')
+            if lane not in LANES:
+                return jsonify({'success': False, 'error': f'Unknown priority "{lane}"'}), 400
+
+            # Identical analysis already in flight? Attach to its job instead of paying twice
+            flight_key = analysis_flight_key(section_name, section_content)
+            job_id, is_leader = claim_flight(flight_key)
+
+            if is_leader:
+                try:
+                    get_fair_scheduler().submit(
+                        analyze_section_task,
+                        args=(section_name, section_content, "Full Write-up", session_id),
+                        session_id=session_id,
+                        lane=lane,
+                        job_timeout=300,  # 5 minutes timeout
+                        meta={'task_type': 'analysis', 'section': section_name, 'flight_key': flight_key},
+                        job_id=job_id
+                    )
+                except Exception:
+                    release_flight(flight_key, job_id)
+                    raise
+            else:
+                add_job_watcher(job_id, session_id)
+                print(f"🔗 Attached to in-flight analysis job {job_id}", flush=True)
+                # A still-waiting speculative/normal job now has someone waiting on it
+                get_fair_scheduler().promote(job_id, lane)
 
             # Return job ID for async polling + section content for immediate display
             return jsonify({
                 'success': True,
-                'task_id': job.id,
+                'task_id': job_id,
+                'coalesced': not is_leader,
                 'status': 'queued',
                 'message': 'Analysis started with RQ (NO AWS signature expiration!)',
                 'async': True,
                 'enhanced': True,
                 'section_content': section_content,  # ✅ Include section content for frontend display
+                'events_url': f'/events/{session_id}',  # Push completion (SSE) instead of polling
                 'features': {
                     'rq_queue': True,
                     'multi_model_fallback': True,
@@ -451,29 +690,30 @@ def analyze_section():
                 }
             })
 
-        # Check if standard Celery is available
-        elif RQ_ENABLED:
-            # Submit task to standard Celery queue
-            print(f"📤 Submitting analysis task to standard Celery queue", flush=True)
-            task_id, is_async = submit_analysis_task(
-                section_name=section_name,
-                content=section_content,
-                doc_type="Full Write-up",
-                session_id=session_id
-            )
-
-            if is_async:
-                # Return task ID for async polling
+        # No Redis: same async contract on the bounded in-process task manager
+        elif LOCAL_TASK_QUEUE_ENABLED:
+            print(f"📤 Submitting analysis task to local task queue", flush=True)
+            try:
+                # Duplicate clicks share one Bedrock call
+                task_id = get_task_manager().submit_task(
+                    analyze_section_coalesced, section_name, section_content, "Full Write-up", session_id
+                )
+            except TaskQueueFull as e:
+                print(f"⏸️ {e}", flush=True)
                 return jsonify({
-                    'success': True,
-                    'task_id': task_id,
-                    'status': 'processing',
-                    'message': 'Analysis task submitted to queue',
-                    'async': True
-                })
-            else:
-                # Celery not available, got result directly
-                analysis_result = task_id  # task_id is actually the result in sync mode
+                    'success': False,
+                    'error': 'Server busy - please retry shortly',
+                    'retry_after': 5
+                }), 503
+
+            return jsonify({
+                'success': True,
+                'task_id': task_id,
+                'status': 'queued',
+                'message': 'Analysis task submitted to local task queue',
+                'async': True,
+                'section_content': section_content
+            })
         else:
             # Analyze with AI engine with timing (synchronous fallback)
             analysis_start_time = datetime.now()
@@ -486,7 +726,12 @@ def analyze_section():
                     'content_length': len(section_content)
                 })
 
-                analysis_result = ai_engine.analyze_section(section_name, section_content)
+                analysis_result, shared = get_single_flight().do(
+                    analysis_flight_key(section_name, section_content),
+                    lambda: ai_engine.analyze_section(section_name, section_content)
+                )
+                if shared:
+                    print(f"🔗 Reused result of an identical in-flight analysis", flush=True)
 
                 analysis_duration = (datetime.now() - analysis_start_time).total_seconds()
                 feedback_count = len(analysis_result.get('feedback_items', []))
@@ -517,84 +762,7 @@ def analyze_section():
                     'fallback': True
                 }
         
-        # Ensure we have a valid result structure
-        if not isinstance(analysis_result, dict):
-            print(f"Invalid analysis result type: {type(analysis_result)}")
-            analysis_result = {'feedback_items': [], 'error': 'Invalid result format'}
-        
-        feedback_items = analysis_result.get('feedback_items', [])
-        if not isinstance(feedback_items, list):
-            print(f"Invalid feedback_items type: {type(feedback_items)}")
-            feedback_items = []
-        
-        # If no feedback items and analysis failed, create a basic feedback item
-        if not feedback_items and analysis_result.get('error'):
-            print(f"Creating fallback feedback for failed analysis")
-            feedback_items = [{
-                'id': f"{section_name}_fallback_{datetime.now().strftime('%H%M%S')}",
-                'type': 'suggestion',
-                'category': 'Analysis Status',
-                'description': f'AI analysis temporarily unavailable for this section. Content appears to be {len(section_content)} characters long.',
-                'suggestion': 'Manual review recommended. Check AWS credentials and Bedrock access if real AI analysis is needed.',
-                'example': '',
-                'questions': ['Is the content complete and accurate?', 'Are there any obvious gaps or issues?'],
-                'hawkeye_refs': [13],
-                'risk_level': 'Low',
-                'confidence': 0.5
-            }]
-        
-        # Validate feedback items structure
-        if not isinstance(feedback_items, list):
-            print(f"Invalid feedback_items type: {type(feedback_items)}")
-            feedback_items = []
-        
-        # Ensure each feedback item has required fields
-        validated_feedback = []
-        for i, item in enumerate(feedback_items):
-            if isinstance(item, dict):
-                # Ensure required fields exist
-                validated_item = {
-                    'id': item.get('id', f"{section_name}_{i}_{datetime.now().strftime('%H%M%S')}"),
-                    'type': item.get('type', 'suggestion'),
-                    'category': item.get('category', 'General'),
-                    'description': item.get('description', 'No description provided'),
-                    'suggestion': item.get('suggestion', ''),
-                    'example': item.get('example', ''),
-                    'questions': item.get('questions', []) if isinstance(item.get('questions'), list) else [],
-                    'hawkeye_refs': item.get('hawkeye_refs', []) if isinstance(item.get('hawkeye_refs'), list) else [],
-                    'risk_level': item.get('risk_level', 'Low'),
-                    'confidence': float(item.get('confidence', 0.8)) if isinstance(item.get('confidence'), (int, float)) else 0.8
-                }
-                validated_feedback.append(validated_item)
-            else:
-                print(f"Skipping invalid feedback item {i}: {type(item)}")
-        
-        feedback_items = validated_feedback
-        
-        # Log final result
-        print(f"Section analysis completed: {section_name} - {len(feedback_items)} validated feedback items")
-        
-        # Store feedback data
-        review_session.feedback_data[section_name] = feedback_items
-        
-        # Update statistics immediately
-        try:
-            stats_manager.update_feedback_data(section_name, feedback_items)
-        except Exception as stats_error:
-            print(f"WARNING Statistics update failed: {stats_error}")
-        
-        # Log activity
-        try:
-            review_session.activity_log.append({
-                'timestamp': datetime.now().isoformat(),
-                'action': 'SECTION_ANALYZED',
-                'details': f'Section {section_name} analyzed - {len(feedback_items)} feedback items generated'
-            })
-            
-            # Log with audit logger
-            review_session.audit_logger.log('SECTION_ANALYZED', f'Section {section_name} analyzed - {len(feedback_items)} feedback items generated')
-        except Exception as log_error:
-            print(f"WARNING Logging failed: {log_error}")
+        feedback_items = store_section_feedback(review_session, section_name, section_content, analysis_result)
         
         print(f"SUCCESS Section analysis completed: {section_name} - {len(feedback_items)} feedback items")
         
@@ -623,6 +791,197 @@ def analyze_section():
             'timestamp': datetime.now().isoformat()
         }), 500
 
+def analyze_section_for_document(section_name, content):
+    """Analyze one section for /analyze_document using the same engine as /analyze_section"""
+    def analyze():
+        if ENHANCED_MODE and RQ_ENABLED:
+            # Same prompts/model as the RQ task, executed on the batch analyzer's pool
+            return analyze_section_task(section_name, content, "Full Write-up")
+        return ai_engine.analyze_section(section_name, content)
+
+    result, _ = get_single_flight().do(analysis_flight_key(section_name, content), analyze)
+    return result
+
+document_batch_analyzer = DocumentBatchAnalyzer(analyze_section_for_document)
+speculative_analyzer = SpeculativeAnalyzer(analyze_section_for_document)
+
+def schedule_speculative_analysis(review_session, after_section=None):
+    """
+    Pre-analyze the next sections in reading order at low priority
+
+    With RQ the jobs go to the speculative lane under the same single-flight
+    keys as interactive requests, so opening a section that is still being
+    pre-analyzed attaches to that job. Without RQ they run on a small
+    in-process pool. Returns the section names scheduled.
+    """
+    if not SpeculativeConfig.ENABLED:
+        return []
+
+    try:
+        skip = set(review_session.feedback_data) | set(review_session.speculative_jobs) | set(review_session.speculative_results)
+        if after_section:
+            skip.add(after_section)
+        planned = plan_speculative_sections(review_session.sections, after_section, skip)
+        planned = speculative_analyzer.budget(review_session.sections, planned)
+
+        for section_name in planned:
+            content = review_session.sections[section_name]
+
+            if ENHANCED_MODE and RQ_ENABLED:
+                flight_key = analysis_flight_key(section_name, content)
+                job_id, is_leader = claim_flight(flight_key)
+                if is_leader:
+                    try:
+                        get_fair_scheduler().submit(
+                            analyze_section_task,
+                            args=(section_name, content, "Full Write-up", review_session.session_id),
+                            session_id=review_session.session_id,
+                            lane='speculative',
+                            job_timeout=300,
+                            meta={'task_type': 'analysis', 'section': section_name,
+                                  'flight_key': flight_key, 'speculative': True},
+                            job_id=job_id
+                        )
+                    except Exception:
+                        release_flight(flight_key, job_id)
+                        raise
+                    speculative_analyzer.record_scheduled()
+                review_session.speculative_jobs[section_name] = job_id
+            else:
+                speculative_analyzer.submit(review_session.speculative_results, section_name, content,
+                                            on_complete=lambda: save_session(review_session))
+
+        if planned:
+            print(f"🔮 Speculatively analysing {len(planned)} section(s): {planned}", flush=True)
+        return planned
+
+    except Exception as e:
+        print(f"⚠️ Could not schedule speculative analysis: {e}", flush=True)
+        return []
+
+def take_speculative_result(review_session, section_name):
+    """Finished speculative result for a section, or None (consumed on use)"""
+    result = review_session.speculative_results.pop(section_name, None)
+
+    job_id = review_session.speculative_jobs.get(section_name)
+    if result is None and job_id and RQ_ENABLED:
+        try:
+            job = Job.fetch(job_id, connection=redis_conn)
+            if job.get_status(refresh=False) == 'finished' and isinstance(job.result, dict) and job.result.get('success'):
+                result = job.result
+        except Exception as e:
+            print(f"⚠️ Speculative job {job_id} unavailable: {e}", flush=True)
+
+    if result is None:
+        return None
+
+    review_session.speculative_jobs.pop(section_name, None)
+    speculative_analyzer.record_served()
+    return result
+
+
+@app.route('/analyze_document', methods=['POST'])
+def analyze_document():
+    """Analyze every section of the session's document in parallel under one job id"""
+    try:
+        data = request.get_json(silent=True) or {}
+        session_id = data.get('session_id') or session.get('session_id')
+        requested_sections = data.get('sections')
+
+        if not session_id or not session_exists(session_id):
+            return jsonify({'success': False, 'error': 'Invalid or expired session'}), 400
+
+        review_session = get_session(session_id)
+
+        # Keep document order; skip empty sections just like /analyze_section
+        sections = {}
+        skipped = []
+        for section_name, content in review_session.sections.items():
+            if requested_sections and section_name not in requested_sections:
+                continue
+            if not content or content.strip() == '':
+                skipped.append(section_name)
+                continue
+            sections[section_name] = content
+
+        if not sections:
+            return jsonify({'success': False, 'error': 'No sections with content to analyze'}), 400
+
+        def on_section_complete(section_name, content, analysis_result):
+            feedback_items = store_section_feedback(review_session, section_name, content, analysis_result)
+            review_session.activity_logger.log_ai_analysis(
+                section_name,
+                len(feedback_items),
+                success=not analysis_result.get('error'),
+                error=analysis_result.get('error')
+            )
+            return feedback_items
+
+        def on_job_update(job):
+            # Runs on the batch pool, outside the request - persist the status
+            # so any web worker can answer /analyze_document/<job_id>
+            review_session.document_jobs[job.job_id] = job.to_dict(include_results=False)
+            while len(review_session.document_jobs) > ReviewSession.MAX_DOCUMENT_JOBS:
+                review_session.document_jobs.pop(next(iter(review_session.document_jobs)))
+            save_session(review_session)
+
+        job = document_batch_analyzer.submit(session_id, sections, on_section_complete, on_job_update)
+
+        review_session.activity_log.append({
+            'timestamp': datetime.now().isoformat(),
+            'action': 'DOCUMENT_ANALYSIS_STARTED',
+            'details': f'Parallel analysis of {len(sections)} sections started (job {job.job_id[:8]})'
+        })
+
+        return jsonify({
+            'success': True,
+            'job_id': job.job_id,
+            'task_id': job.job_id,
+            'status': 'queued',
+            'async': True,
+            'total_sections': len(sections),
+            'sections': list(sections.keys()),
+            'skipped_sections': skipped,
+            'max_concurrent': document_batch_analyzer.max_concurrent
+        })
+
+    except Exception as e:
+        print(f"ERROR Document analysis error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': f'Document analysis failed: {str(e)}'}), 500
+
+@app.route('/analyze_document/<job_id>', methods=['GET'])
+def analyze_document_status(job_id):
+    """
+    Per-section progress (and finished results) of a /analyze_document job
+
+    Answered from the running job when it lives in this process, otherwise
+    from the snapshot persisted in the review session.
+    """
+    include_results = request.args.get('include_results', 'true').lower() != 'false'
+
+    job = document_batch_analyzer.get_job(job_id)
+    if job:
+        status = job.to_dict(include_results=include_results)
+    else:
+        session_id = request.args.get('session_id') or session.get('session_id')
+        review_session = get_session(session_id) if session_id else None
+        snapshot = review_session.document_jobs.get(job_id) if review_session else None
+        if not snapshot:
+            return jsonify({'success': False, 'error': f'Job {job_id} not found', 'state': 'NOT_FOUND'}), 404
+
+        status = dict(snapshot)
+        if include_results:
+            status['results'] = {
+                name: review_session.feedback_data.get(name, [])
+                for name, section_status in snapshot['sections'].items()
+                if section_status['status'] in ('completed', 'failed')
+            }
+
+    status['success'] = True
+    return jsonify(status)
+
 @app.route('/accept_feedback', methods=['POST'])
 def accept_feedback():
     try:
@@ -657,7 +1016,7 @@ def accept_feedback():
         review_session.accepted_feedback[section_name].append(feedback_item)
         
         # Update statistics
-        stats_manager.record_acceptance(section_name, feedback_item)
+        review_session.statistics.record_acceptance(section_name, feedback_item)
         
         # Log activity with comprehensive tracking - ENHANCED with more details
         review_session.activity_logger.log_feedback_action(
@@ -730,7 +1089,7 @@ def reject_feedback():
         review_session.rejected_feedback[section_name].append(feedback_item)
         
         # Update statistics
-        stats_manager.record_rejection(section_name, feedback_item)
+        review_session.statistics.record_rejection(section_name, feedback_item)
         
         # Log activity with comprehensive tracking - ENHANCED with more details
         review_session.activity_logger.log_feedback_action(
@@ -784,18 +1143,27 @@ def revert_feedback():
         review_session = get_session(session_id)
 
         # Remove from accepted feedback if present
+        accepted_removed = 0
         if section_name in review_session.accepted_feedback:
+            before = len(review_session.accepted_feedback[section_name])
             review_session.accepted_feedback[section_name] = [
                 item for item in review_session.accepted_feedback[section_name]
                 if item.get('id') != feedback_id
             ]
+            accepted_removed = before - len(review_session.accepted_feedback[section_name])
 
         # Remove from rejected feedback if present
+        rejected_removed = 0
         if section_name in review_session.rejected_feedback:
+            before = len(review_session.rejected_feedback[section_name])
             review_session.rejected_feedback[section_name] = [
                 item for item in review_session.rejected_feedback[section_name]
                 if item.get('id') != feedback_id
             ]
+            rejected_removed = before - len(review_session.rejected_feedback[section_name])
+
+        # Update statistics
+        review_session.statistics.record_revert(section_name, accepted_removed, rejected_removed)
 
         # Log activity
         review_session.activity_logger.log_feedback_action(
@@ -851,8 +1219,8 @@ def add_custom_feedback():
         review_session.accepted_feedback[section_name].append(custom_feedback)
         
         # Update statistics
-        stats_manager.add_user_feedback(section_name, custom_feedback)
-        stats_manager.record_acceptance(section_name, custom_feedback)
+        review_session.statistics.add_user_feedback(section_name, custom_feedback)
+        review_session.statistics.record_acceptance(section_name, custom_feedback)
         
         # Log activity
         activity_detail = f'Added custom {feedback_type} feedback in {section_name}: {description[:50]}...'
@@ -921,16 +1289,18 @@ def chat():
             job = queue.enqueue(
                 process_chat_task,
                 args=(message, context),
-                job_timeout=120  # 2 minutes timeout
+                job_timeout=120,  # 2 minutes timeout
+                meta={'session_id': session_id, 'task_type': 'chat'}
             )
 
-            # Return job ID for async polling
+            # Return job ID for async polling (or push via the events stream)
             return jsonify({
                 'success': True,
                 'task_id': job.id,
                 'status': 'queued',
                 'message': 'Chat task submitted to RQ queue',
-                'async': True
+                'async': True,
+                'events_url': f'/events/{session_id}'
             })
         else:
             # Track chat response time (synchronous fallback)
@@ -1000,6 +1370,132 @@ def chat():
             'details': str(e) if app.debug else None
         }), 500
 
+def sse_event(event, data):
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/chat/stream', methods=['GET', 'POST'])
+def chat_stream():
+    """
+    Stream a chat answer to the browser over Server-Sent Events
+
+    Events:
+        token - {"text": "..."} for every fragment received from Bedrock
+        done  - {"response": formatted_html, "model_used": ..., "streamed": bool}
+        error - {"error": "..."} if the answer could not be produced
+    """
+    data = request.get_json(silent=True) or request.args
+    session_id = data.get('session_id') or session.get('session_id')
+    message = data.get('message')
+    current_section = data.get('current_section')
+    ai_model = data.get('ai_model', 'claude-3-sonnet')
+
+    if not session_id or not session_exists(session_id):
+        return jsonify({'error': 'Invalid session'}), 400
+
+    if not message:
+        return jsonify({'error': 'No message provided'}), 400
+
+    review_session = get_session(session_id)
+
+    review_session.chat_history.append({
+        'role': 'user',
+        'content': message,
+        'timestamp': datetime.now().isoformat(),
+        'ai_model': ai_model
+    })
+
+    context = {
+        'current_section': current_section,
+        'document_name': review_session.document_name,
+        'total_sections': len(review_session.sections),
+        'current_feedback': review_session.feedback_data.get(current_section, []),
+        'ai_model': ai_model,
+        'guidelines_preference': getattr(review_session, 'guidelines_preference', 'both'),
+        'accepted_count': len(review_session.accepted_feedback.get(current_section, [])),
+        'rejected_count': len(review_session.rejected_feedback.get(current_section, []))
+    }
+
+    try:
+        from config.model_config import model_config as mc
+        actual_model = mc.get_model_config()['model_name']
+    except (ImportError, ModuleNotFoundError, KeyError):
+        actual_model = os.environ.get('BEDROCK_MODEL_ID', 'claude-3-5-sonnet')
+
+    def generate():
+        chat_start_time = datetime.now()
+        first_token_time = None
+        fragments = []
+        streamed = True
+        stream_error = None
+
+        try:
+            for fragment in ai_engine.stream_chat_query(message, context):
+                if first_token_time is None:
+                    first_token_time = (datetime.now() - chat_start_time).total_seconds()
+                    print(f"⚡ [CHAT_STREAM] First token after {first_token_time:.2f}s", flush=True)
+                fragments.append(fragment)
+                yield sse_event('token', {'text': fragment})
+        except Exception as e:
+            stream_error = str(e)
+            print(f"⚠️ [CHAT_STREAM] Streaming failed: {stream_error}", flush=True)
+
+        if stream_error and not fragments:
+            # Nothing reached the browser yet - fall back to the non-streaming path
+            print("🔄 [CHAT_STREAM] Falling back to process_chat_query", flush=True)
+            streamed = False
+            try:
+                response = ai_engine.process_chat_query(message, context)
+            except Exception as e:
+                yield sse_event('error', {'error': f'Chat failed: {str(e)}'})
+                return
+        else:
+            response = ai_engine._format_chat_response(''.join(fragments))
+
+        response_time = (datetime.now() - chat_start_time).total_seconds()
+
+        review_session.chat_history.append({
+            'role': 'assistant',
+            'content': response,
+            'timestamp': datetime.now().isoformat(),
+            'ai_model': actual_model
+        })
+
+        review_session.activity_logger.log_chat_interaction(
+            'user_query',
+            len(message),
+            response_time
+        )
+
+        review_session.activity_log.append({
+            'timestamp': datetime.now().isoformat(),
+            'action': 'CHAT_INTERACTION',
+            'details': f'User query with {ai_model} (streamed): {message[:50]}...'
+        })
+
+        done = {
+            'success': True,
+            'response': response,
+            'model_used': actual_model,
+            'streamed': streamed,
+            'time_to_first_token': first_token_time,
+            'response_time': round(response_time, 2)
+        }
+        if stream_error and fragments:
+            done['partial'] = True
+            done['error'] = stream_error
+
+        yield sse_event('done', done)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
 @app.route('/delete_document', methods=['POST'])
 def delete_document():
     try:
@@ -1025,12 +1521,12 @@ def delete_document():
         review_session.document_name = ""
         review_session.document_path = ""
         review_session.sections = {}
-        review_session.section_paragraphs = {}
         review_session.paragraph_indices = {}
         review_session.feedback_data = {}
         review_session.accepted_feedback = defaultdict(list)
         review_session.rejected_feedback = defaultdict(list)
         review_session.user_feedback = defaultdict(list)
+        review_session.statistics.rebuild()
         
         # Restore guidelines if keeping them
         if keep_guidelines:
@@ -1087,27 +1583,8 @@ def get_statistics():
         
         review_session = get_session(session_id)
         
-        # Reset and rebuild statistics from current session
-        global stats_manager
-        stats_manager = StatisticsManager()
-        
-        # Update statistics manager with current session data
-        for section_name, feedback_items in review_session.feedback_data.items():
-            stats_manager.update_feedback_data(section_name, feedback_items)
-        
-        for section_name, accepted_items in review_session.accepted_feedback.items():
-            for item in accepted_items:
-                stats_manager.record_acceptance(section_name, item)
-        
-        for section_name, rejected_items in review_session.rejected_feedback.items():
-            for item in rejected_items:
-                stats_manager.record_rejection(section_name, item)
-        
-        for section_name, user_items in review_session.user_feedback.items():
-            for item in user_items:
-                stats_manager.add_user_feedback(section_name, item)
-        
-        statistics = stats_manager.get_statistics()
+        # Kept up to date incrementally by the feedback routes
+        statistics = review_session.statistics.get_statistics()
         
         return jsonify({'success': True, 'statistics': statistics})
         
@@ -1125,28 +1602,9 @@ def get_statistics_breakdown():
         
         review_session = get_session(session_id)
         
-        # Reset and rebuild statistics from current session
-        global stats_manager
-        stats_manager = StatisticsManager()
-        
-        # Update statistics manager with current session data
-        for section_name, feedback_items in review_session.feedback_data.items():
-            stats_manager.update_feedback_data(section_name, feedback_items)
-        
-        for section_name, accepted_items in review_session.accepted_feedback.items():
-            for item in accepted_items:
-                stats_manager.record_acceptance(section_name, item)
-        
-        for section_name, rejected_items in review_session.rejected_feedback.items():
-            for item in rejected_items:
-                stats_manager.record_rejection(section_name, item)
-        
-        for section_name, user_items in review_session.user_feedback.items():
-            for item in user_items:
-                stats_manager.add_user_feedback(section_name, item)
-        
-        breakdown = stats_manager.get_detailed_breakdown(stat_type)
-        breakdown_html = stats_manager.generate_breakdown_html(breakdown, stat_type)
+        # Built on first request and cached until the session changes
+        breakdown = review_session.statistics.get_detailed_breakdown(stat_type)
+        breakdown_html = review_session.statistics.generate_breakdown_html(breakdown, stat_type)
         
         return jsonify({'success': True, 'breakdown_html': breakdown_html})
         
@@ -1781,7 +2239,7 @@ def complete_review():
 
             # ✅ NEW: Save completion to database
             try:
-                stats = stats_manager.get_statistics()
+                stats = review_session.statistics.get_statistics()
                 s3_loc = export_result.get('location') if export_to_s3 and export_result.get('success') else None
 
                 db_manager.complete_review(
@@ -1870,7 +2328,7 @@ def get_latest_document():
 
         # Look for the most recent reviewed document
         # Check if finalDocumentData or similar exists
-        if hasattr(review_session, 'output_filename') and review_session.output_filename:
+        if review_session.output_filename:
             return jsonify({
                 'success': True,
                 'filename': review_session.output_filename
@@ -1910,10 +2368,6 @@ def reset_session():
         # Clear session
         session.clear()
         
-        # Reset statistics manager
-        global stats_manager
-        stats_manager = StatisticsManager()
-        
         return jsonify({'success': True})
         
     except Exception as e:
@@ -1935,8 +2389,7 @@ def revert_all_feedback():
         review_session.rejected_feedback = defaultdict(list)
         
         # Reset statistics
-        global stats_manager
-        stats_manager = StatisticsManager()
+        review_session.statistics.reset_decisions()
         
         # Log activity
         review_session.activity_log.append({
@@ -2090,6 +2543,7 @@ def update_user_feedback():
                         if accepted.get('id') == feedback_id:
                             review_session.accepted_feedback[section_name][j].update(updated_data)
                             break
+                    review_session.statistics.mark_changed()
                     
                     # Log activity
                     review_session.activity_log.append({
@@ -2132,10 +2586,13 @@ def delete_user_feedback():
                     deleted = True
                     
                     # Also remove from accepted feedback if it exists there
+                    accepted_removed = 0
                     for j, accepted in enumerate(review_session.accepted_feedback[section_name]):
                         if accepted.get('id') == feedback_id:
                             review_session.accepted_feedback[section_name].pop(j)
+                            accepted_removed = 1
                             break
+                    review_session.statistics.remove_user_feedback(section_name, accepted_removed)
                     
                     # Log activity
                     review_session.activity_log.append({
@@ -2257,7 +2714,7 @@ def download_statistics():
         review_session = get_session(session_id)
         
         # Get comprehensive statistics
-        stats = stats_manager.get_statistics()
+        stats = review_session.statistics.get_statistics()
         
         # Add session-specific data
         stats_data = {
@@ -2615,6 +3072,7 @@ def clear_all_user_feedback():
                 item for item in review_session.accepted_feedback[section_name]
                 if not item.get('user_created', False)
             ]
+        review_session.statistics.rebuild()
         
         # Log activity
         review_session.activity_log.append({
@@ -2705,6 +3163,9 @@ def export_activity_logs():
 def model_stats():
     """Get statistics about available models and their health status"""
     try:
+        # Circuit state (closed / open / half_open) shared by all processes
+        circuit_breakers = get_circuit_breaker().get_stats()
+
         # Try V2 first (per-request isolation)
         try:
             from core.model_manager_v2 import model_manager_v2 as model_manager
@@ -2718,12 +3179,14 @@ def model_stats():
         return jsonify({
             'success': True,
             'stats': stats,
+            'circuit_breakers': circuit_breakers,
             'multi_model_enabled': True,
             'version': version
         })
     except ImportError:
         return jsonify({
             'success': False,
+            'circuit_breakers': circuit_breakers,
             'multi_model_enabled': False,
             'message': 'Multi-model fallback not configured'
         })
@@ -2736,25 +3199,31 @@ def model_stats():
 
 @app.route('/reset_model_cooldowns', methods=['POST'])
 def reset_model_cooldowns():
-    """Emergency endpoint to reset all model cooldowns"""
+    """Emergency endpoint to reset all model cooldowns (optionally one model_id)"""
     try:
+        data = request.get_json(silent=True) or {}
+        model_id = data.get('model_id')
+
+        # Closes the shared circuits, so every app process and RQ worker sees it
+        get_circuit_breaker().reset(model_id)
+
         # Try V2 first (per-request isolation)
         try:
             from core.model_manager_v2 import model_manager_v2 as model_manager
         except ImportError:
-            # Fallback to V1
-            from core.model_manager import model_manager
+            try:
+                # Fallback to V1
+                from core.model_manager import model_manager
+            except ImportError:
+                model_manager = None
+
+        if model_manager is not None:
+            model_manager.reset_all_cooldowns()
 
-        model_manager.reset_all_cooldowns()
         return jsonify({
             'success': True,
-            'message': 'All model cooldowns have been reset'
+            'message': f"Circuit breaker reset for {model_id}" if model_id else 'All model cooldowns have been reset'
         })
-    except ImportError:
-        return jsonify({
-            'success': False,
-            'error': 'Multi-model fallback not configured'
-        }), 503
     except Exception as e:
         return jsonify({
             'success': False,
@@ -2775,74 +3244,145 @@ def get_task_status(task_id):
 
     Returns dict with task state and result (if completed)
     """
+    # Tasks run by the local task manager use the same status schema; the
+    # manager (and its worker threads) only exists when the local queue is on
+    if LOCAL_TASK_QUEUE_ENABLED and (not RQ_ENABLED or get_task_manager().has_task(task_id)):
+        return get_task_manager().get_task_status(task_id)
+
+    if not RQ_ENABLED:
+        return {
+            'task_id': task_id,
+            'state': 'PENDING',
+            'status': 'Task not found',
+            'progress': 0,
+            'ready': False
+        }
+
     print(f"📊 [CHECKPOINT] Fetching RQ task status for: {task_id}", flush=True)
 
     try:
         # Fetch job from RQ (simple!)
         job = Job.fetch(task_id, connection=redis_conn)
+        return build_job_status(task_id, job)
 
-        # Get job status - RQ has clear states
-        job_status = job.get_status()  # queued, started, finished, failed, deferred, scheduled, stopped, canceled
+    except Exception as e:
+        # Job not found or error accessing Redis
+        print(f"⚠️ Error fetching RQ job {task_id}: {e}", flush=True)
 
-        # Build response
+        # Return pending state if job not found
         response = {
             'task_id': task_id,
-            'state': job_status.upper(),  # Convert to uppercase like Celery states
-            'ready': job.is_finished or job.is_failed
+            'state': 'PENDING',
+            'status': 'Task not found or Redis connection error',
+            'progress': 0,
+            'ready': False,
+            'error': str(e)
         }
+        return response
+
 
+def build_job_status(task_id, job, verbose=True):
+    """
+    Build the task status response for an already-fetched RQ job
+
+    Args:
+        task_id: RQ job id
+        job: RQ Job instance
+        verbose: Print per-job checkpoint logs (disabled for batch polling)
+    """
+    # Status already loaded by Job.fetch / Job.fetch_many - no extra round-trip
+    job_status = job.get_status(refresh=False)  # queued, started, finished, failed, deferred, scheduled, stopped, canceled
+
+    # Build response
+    response = {
+        'task_id': task_id,
+        'state': job_status.upper(),  # Convert to uppercase like Celery states
+        'ready': job_status in ('finished', 'failed')
+    }
+
+    if verbose:
         print(f"   RQ Job state: {job_status}, Ready: {response['ready']}", flush=True)
 
-        # Handle different states
-        if job.is_finished:
-            # Job completed successfully
-            response['state'] = 'SUCCESS'
-            response['status'] = 'Task completed successfully'
-            response['progress'] = 100
-            response['result'] = job.result
+    # Handle different states
+    if job_status == 'finished':
+        # Job completed successfully
+        response['state'] = 'SUCCESS'
+        response['status'] = 'Task completed successfully'
+        response['progress'] = 100
+        response['result'] = job.result
+        if verbose:
             print(f"✅ [RQ] Task SUCCESS, result keys: {response['result'].keys() if isinstance(response['result'], dict) else 'not a dict'}", flush=True)
 
-        elif job.is_failed:
-            # Job failed
-            response['state'] = 'FAILURE'
-            response['status'] = 'Task failed'
-            response['progress'] = 0
-            response['error'] = job.exc_info if job.exc_info else 'Unknown error'
+    elif job_status == 'failed':
+        # Job failed
+        response['state'] = 'FAILURE'
+        response['status'] = 'Task failed'
+        response['progress'] = 0
+        response['error'] = job.exc_info if job.exc_info else 'Unknown error'
+        if verbose:
             print(f"❌ [RQ] Task FAILURE: {response['error']}", flush=True)
 
-        elif job.is_started:
-            # Job is currently running
-            response['state'] = 'PROGRESS'
-            response['status'] = 'Task is running'
-            response['progress'] = job.meta.get('progress', 50) if hasattr(job, 'meta') else 50
+    elif job_status == 'started':
+        # Job is currently running
+        response['state'] = 'PROGRESS'
+        response['status'] = 'Task is running'
+        response['progress'] = job.meta.get('progress', 50) if hasattr(job, 'meta') else 50
+        # Feedback items already parsed from the streaming response
+        partial_items = job.meta.get('partial_feedback_items') if hasattr(job, 'meta') else None
+        if partial_items:
+            response['partial_feedback_items'] = partial_items
+        if verbose:
             print(f"⏳ [RQ] Task PROGRESS: {response['progress']}%", flush=True)
 
-        elif job.is_queued or job.is_deferred:
-            # Job is waiting in queue
-            response['state'] = 'PENDING'
-            response['status'] = 'Task is queued'
-            response['progress'] = 0
+    elif job_status in ('queued', 'deferred', 'scheduled'):
+        # Job is waiting in queue
+        response['state'] = 'PENDING'
+        response['status'] = 'Task is queued'
+        response['progress'] = 0
+        if verbose:
             print(f"⏸️  [RQ] Task PENDING (queued)", flush=True)
 
-        return response
+    return response
 
-    except Exception as e:
-        # Job not found or error accessing Redis
-        print(f"⚠️ Error fetching RQ job {task_id}: {e}", flush=True)
 
-        # Return pending state if job not found
-        response = {
-            'task_id': task_id,
-            'state': 'PENDING',
-            'status': 'Task not found or Redis connection error',
-            'progress': 0,
-            'ready': False,
-            'error': str(e)
-        }
-        return response
+def get_task_statuses(task_ids):
+    """
+    Get the status of many RQ jobs in one Redis round-trip
 
-    # Should never reach here due to early returns in try/except
-    return response
+    Job.fetch_many loads every job hash through a single pipeline. Unknown ids
+    are reported as PENDING, like get_task_status. Local task manager ids are
+    answered from memory.
+
+    Returns:
+        Dict of task_id -> status dict
+    """
+    statuses = {}
+    if LOCAL_TASK_QUEUE_ENABLED:
+        task_manager = get_task_manager()
+        if not RQ_ENABLED:
+            return task_manager.get_task_statuses(task_ids)
+
+        local_ids = [task_id for task_id in task_ids if task_manager.has_task(task_id)]
+        statuses = task_manager.get_task_statuses(local_ids)
+        task_ids = [task_id for task_id in task_ids if task_id not in statuses]
+    elif not RQ_ENABLED:
+        return {task_id: get_task_status(task_id) for task_id in task_ids}
+
+    jobs = Job.fetch_many(task_ids, connection=redis_conn) if task_ids else []
+
+    for task_id, job in zip(task_ids, jobs):
+        if job is None:
+            statuses[task_id] = {
+                'task_id': task_id,
+                'state': 'PENDING',
+                'status': 'Task not found',
+                'progress': 0,
+                'ready': False
+            }
+        else:
+            statuses[task_id] = build_job_status(task_id, job, verbose=False)
+
+    return statuses
 
 
 def get_queue_stats():
@@ -2894,11 +3434,36 @@ def get_queue_stats():
 # CELERY TASK MANAGEMENT ENDPOINTS
 # ============================================================================
 
+def store_task_result(session_id, task_id, result):
+    """Store feedback_items from a finished analysis task in the backend session"""
+    # Check if result contains feedback items from analysis task
+    if not (isinstance(result, dict) and 'feedback_items' in result and 'section' in result):
+        return
+
+    section_name = result.get('section')
+    feedback_items = result.get('feedback_items', [])
+
+    if session_id and session_exists(session_id):
+        review_session = get_session(session_id)
+
+        # Store feedback in backend session (THIS WAS MISSING!)
+        review_session.feedback_data[section_name] = feedback_items
+        review_session.statistics.update_feedback_data(section_name, feedback_items)
+        # Also called from the long-lived /events stream - don't wait for its teardown
+        save_session(review_session)
+
+        print(f"✅ [TASK_STATUS] Stored {len(feedback_items)} feedback items for section '{section_name}' in backend session")
+        print(f"   Task ID: {task_id}")
+        print(f"   Session ID: {session_id}")
+    else:
+        print(f"⚠️ [TASK_STATUS] Could not store feedback - session not found: {session_id}")
+
+
 @app.route('/task_status/<task_id>', methods=['GET'])
 def task_status(task_id):
     """Get status of a Celery task"""
     try:
-        if not RQ_ENABLED:
+        if not RQ_ENABLED and not LOCAL_TASK_QUEUE_ENABLED:
             return jsonify({
                 'error': 'Celery not available',
                 'task_id': task_id,
@@ -2910,42 +3475,184 @@ def task_status(task_id):
         # ✅ CRITICAL FIX: Store feedback_items in backend session when task completes
         # This fixes the "Feedback item not found" error when accepting/rejecting feedback
         if status.get('state') == 'SUCCESS' and status.get('result'):
-            result = status.get('result')
+            # Get session_id from request parameter
+            session_id = request.args.get('session_id') or session.get('session_id')
+            store_task_result(session_id, task_id, status.get('result'))
 
-            # Check if result contains feedback items from analysis task
-            if isinstance(result, dict) and 'feedback_items' in result and 'section' in result:
-                section_name = result.get('section')
-                feedback_items = result.get('feedback_items', [])
+        return jsonify(status)
 
-                # Get session_id from request parameter
-                session_id = request.args.get('session_id') or session.get('session_id')
+    except Exception as e:
+        print(f"❌ [TASK_STATUS] Error: {e}")
+        import traceback
+        traceback.print_exc()
 
-                if session_id and session_exists(session_id):
-                    review_session = get_session(session_id)
+        return jsonify({
+            'error': str(e),
+            'task_id': task_id,
+            'state': 'ERROR'
+        }), 500
 
-                    # Store feedback in backend session (THIS WAS MISSING!)
-                    review_session.feedback_data[section_name] = feedback_items
 
-                    print(f"✅ [TASK_STATUS] Stored {len(feedback_items)} feedback items for section '{section_name}' in backend session")
-                    print(f"   Task ID: {task_id}")
-                    print(f"   Session ID: {session_id}")
-                else:
-                    print(f"⚠️ [TASK_STATUS] Could not store feedback - session not found: {session_id}")
+@app.route('/task_status/batch', methods=['POST'])
+def task_status_batch():
+    """
+    Get the status of many tasks in one request (one pipelined Redis read,
+    or the local task manager when RQ is unavailable)
 
-        return jsonify(status)
+    Request JSON:
+        task_ids   - job ids to check
+        seen       - job ids whose results the client already has (results omitted)
+        session_id - session to store finished analysis feedback in
+
+    Returns:
+        {"statuses": {task_id: {"state", "progress", "ready", "result"?, "error"?}},
+         "pending": count of tasks not yet ready}
+    """
+    try:
+        if not RQ_ENABLED and not LOCAL_TASK_QUEUE_ENABLED:
+            return jsonify({'error': 'RQ not available', 'state': 'UNAVAILABLE'}), 503
+
+        data = request.get_json(silent=True) or {}
+        task_ids = [t for t in data.get('task_ids', []) if isinstance(t, str) and t]
+        seen = set(data.get('seen', []))
+        session_id = data.get('session_id') or session.get('session_id')
+
+        if not task_ids:
+            return jsonify({'error': 'No task_ids provided'}), 400
+
+        if len(task_ids) > 200:
+            return jsonify({'error': 'Too many task_ids (max 200)'}), 400
+
+        statuses = get_task_statuses(list(dict.fromkeys(task_ids)))
+
+        compact = {}
+        for task_id, status in statuses.items():
+            entry = {
+                'state': status['state'],
+                'progress': status.get('progress', 0),
+                'ready': status['ready']
+            }
+
+            if status['state'] == 'SUCCESS' and task_id not in seen:
+                entry['result'] = status.get('result')
+                store_task_result(session_id, task_id, status.get('result'))
+            elif status['state'] == 'FAILURE':
+                entry['error'] = status.get('error')
+
+            compact[task_id] = entry
+
+        pending = sum(1 for entry in compact.values() if not entry['ready'])
+        print(f"📊 [TASK_STATUS_BATCH] {len(compact)} tasks, {pending} pending", flush=True)
+
+        return jsonify({'statuses': compact, 'pending': pending})
 
     except Exception as e:
-        print(f"❌ [TASK_STATUS] Error: {e}")
+        print(f"❌ [TASK_STATUS_BATCH] Error: {e}")
         import traceback
         traceback.print_exc()
 
         return jsonify({
             'error': str(e),
-            'task_id': task_id,
             'state': 'ERROR'
         }), 500
 
 
+@app.route('/events/<session_id>', methods=['GET'])
+def task_events(session_id):
+    """
+    Stream task lifecycle events for a session over Server-Sent Events
+
+    RQ jobs publish to Redis pub/sub; this endpoint relays them so the browser
+    does not need to poll /task_status. Pass ?task_ids=a,b to also receive
+    'finished'/'failed' for tasks that completed before the stream connected.
+    Jobs publish 'finished' just before RQ stores their result, so listed
+    tasks still pending are re-checked on every keep-alive until they are
+    reported.
+
+    Events:
+        ready    - stream is subscribed
+        started  - {"task_id", "task_type", "section"?}
+        progress - {"task_id", "progress", "status"}
+        partial  - {"task_id", "section", "items", "total"} feedback items parsed
+                   so far from the streaming response (preview of the result)
+        finished - {"task_id", "task_type", "result"}
+        failed   - {"task_id", "task_type", "result"}
+    """
+    if not RQ_ENABLED:
+        return jsonify({'error': 'RQ not available', 'state': 'UNAVAILABLE'}), 503
+
+    if not session_exists(session_id):
+        return jsonify({'error': 'Invalid session'}), 400
+
+    task_ids = [t for t in request.args.get('task_ids', '').split(',') if t]
+
+    # Listed tasks are re-checked on keep-alives - send them more often
+    heartbeat_seconds = 5.0 if task_ids else 15.0
+
+    def check_tasks(pending, snapshot):
+        """SSE messages for listed tasks that are already done; removes them from pending"""
+        messages = []
+        for task_id in list(pending):
+            status = get_task_status(task_id)
+            if status.get('ready'):
+                pending.discard(task_id)
+                event = 'finished' if status['state'] == 'SUCCESS' else 'failed'
+                if event == 'finished':
+                    store_task_result(session_id, task_id, status.get('result'))
+                messages.append(sse_event(event, {
+                    'task_id': task_id,
+                    'result': status.get('result') if event == 'finished' else {'success': False, 'error': status.get('error')}
+                }))
+            elif snapshot and status.get('partial_feedback_items'):
+                # Items streamed before this connection - later 'partial' events only carry new ones
+                messages.append(sse_event('partial', {
+                    'task_id': task_id,
+                    'items': status['partial_feedback_items'],
+                    'total': len(status['partial_feedback_items']),
+                    'snapshot': True
+                }))
+        return messages
+
+    def generate():
+        events = listen_session_events(session_id, heartbeat_seconds=heartbeat_seconds)
+        pending = set(task_ids)
+        try:
+            # Subscribe before checking known tasks so no completion is missed
+            next(events)
+            yield sse_event('ready', {'session_id': session_id})
+
+            for message in check_tasks(pending, snapshot=True):
+                yield message
+
+            for event in events:
+                if event is None:
+                    # Catch completions published before we subscribed but
+                    # stored after the first check
+                    for message in check_tasks(pending, snapshot=False):
+                        yield message
+                    # Keep-alive comment (also detects closed connections)
+                    yield ": keepalive\n\n"
+                    continue
+
+                if event.get('event') in ('finished', 'failed'):
+                    pending.discard(event.get('task_id'))
+                if event.get('event') == 'finished':
+                    store_task_result(session_id, event.get('task_id'), event.get('result'))
+
+                yield sse_event(event.get('event', 'message'), event)
+        finally:
+            events.close()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
 @app.route('/queue_stats', methods=['GET'])
 def queue_stats():
     """Get Celery queue statistics"""
@@ -2960,10 +3667,88 @@ def queue_stats():
         }), 500
 
 
+@app.route('/scheduler_stats', methods=['GET'])
+def scheduler_stats():
+    """Per-lane backlog depth and wait times of the analysis fair scheduler"""
+    if not RQ_ENABLED:
+        return jsonify({'available': False, 'error': 'RQ not enabled'}), 503
+
+    try:
+        scheduler = get_fair_scheduler()
+        # Also refills lanes in case a worker died before releasing its slot
+        scheduler.dispatch()
+        stats = scheduler.get_stats()
+        stats['single_flight'] = get_flight_stats()
+        stats['speculative'] = speculative_analyzer.get_stats()
+        stats['available'] = True
+        return jsonify(stats)
+
+    except Exception as e:
+        return jsonify({
+            'available': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/local_task_stats', methods=['GET'])
+def local_task_stats():
+    """Queue depth, result store usage and per-function latency of the local task manager"""
+    if not LOCAL_TASK_QUEUE_ENABLED:
+        return jsonify({'enabled': False})
+
+    try:
+        stats = get_task_manager().get_stats()
+        stats['enabled'] = LOCAL_TASK_QUEUE_ENABLED
+        return jsonify(stats)
+
+    except Exception as e:
+        return jsonify({'enabled': LOCAL_TASK_QUEUE_ENABLED, 'error': str(e)}), 500
+
+
+@app.route('/session_store_stats', methods=['GET'])
+def session_store_stats():
+    """Backend, local cache size and cache hit/reload/write counts of the session store"""
+    try:
+        return jsonify(session_store.get_stats())
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/session_memory_stats', methods=['GET', 'POST'])
+def session_memory_stats():
+    """
+    Resident session count and bytes against the memory budget
+
+    GET reports; POST runs an eviction sweep first. ?top=N lists the N
+    largest resident sessions.
+    """
+    try:
+        top = min(int(request.args.get('top', 10)), 100)
+        result = {}
+        if request.method == 'POST':
+            result['evicted'] = session_store.evict()
+        result.update(session_store.get_memory_stats(top=top))
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/cancel_task/<task_id>', methods=['POST'])
 def cancel_task(task_id):
     """Cancel a running Celery task"""
     try:
+        # Local tasks can only be cancelled while still queued
+        if LOCAL_TASK_QUEUE_ENABLED and get_task_manager().has_task(task_id):
+            cancelled = get_task_manager().cancel_task(task_id)
+            return jsonify({
+                'success': cancelled,
+                'task_id': task_id,
+                'cancelled': cancelled,
+                'message': 'Task cancelled' if cancelled else 'Task already running or finished'
+            })
+
         if not RQ_ENABLED:
             return jsonify({
                 'error': 'Celery not available',
@@ -0,0 +1,434 @@
+"""
+Adaptive Concurrency Controller for AI-Prism
+AIMD (additive increase / multiplicative decrease) limits per model and region
+
+Instead of a guessed constant (RateLimitConfig.MAX_CONCURRENT_REQUESTS), each
+(model, region) pair gets its own concurrency limit that is discovered from
+Bedrock's responses: every successful call raises the limit by roughly one
+slot per window of calls, and a ThrottlingException cuts it by a constant
+factor. Throughput therefore settles just under the account's real quota
+and backs off quickly when other users or processes consume it.
+
+The limit and the in-flight slots live in Redis (one hash and one lease
+sorted set per model/region, updated by a Lua script), so every Flask
+process and RQ work-horse shares one cluster-wide limit. RQ's WarmWorker
+forks a work-horse per job; with per-process state each job would start
+from INITIAL_LIMIT and its adjustments would die with it. Slots are leases
+that expire after LEASE_SECONDS, so a killed process cannot leak them. When
+Redis is unreachable each process falls back to its own in-memory limiter
+until Redis is retried.
+"""
+
+import os
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+
+
+class AIMDConfig:
+    """
+    Controller tuning (overridable via environment variables)
+    """
+    ENABLED = os.environ.get('ADAPTIVE_CONCURRENCY_ENABLED', 'true').lower() == 'true'
+    INITIAL_LIMIT = float(os.environ.get('ADAPTIVE_CONCURRENCY_INITIAL', '5'))
+    MIN_LIMIT = float(os.environ.get('ADAPTIVE_CONCURRENCY_MIN', '1'))
+    MAX_LIMIT = float(os.environ.get('ADAPTIVE_CONCURRENCY_MAX', '32'))
+
+    # Slots added per window of successful calls (one window = current limit calls)
+    ADDITIVE_INCREASE = float(os.environ.get('ADAPTIVE_CONCURRENCY_INCREASE', '1'))
+    # Fraction of the limit kept after a throttle
+    DECREASE_FACTOR = float(os.environ.get('ADAPTIVE_CONCURRENCY_DECREASE', '0.5'))
+    # A burst of throttles from calls already in flight only counts as one decrease
+    DECREASE_COOLDOWN_SECONDS = float(os.environ.get('ADAPTIVE_CONCURRENCY_COOLDOWN', '2'))
+
+    # Maximum time a caller waits for a free slot
+    ACQUIRE_TIMEOUT_SECONDS = float(os.environ.get('ADAPTIVE_CONCURRENCY_ACQUIRE_TIMEOUT', '120'))
+
+    # Shared limit in Redis
+    REDIS_ENABLED = os.environ.get('ADAPTIVE_CONCURRENCY_REDIS_ENABLED', 'true').lower() == 'true'
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    KEY_PREFIX = os.environ.get('ADAPTIVE_CONCURRENCY_PREFIX', 'aiprism:aimd:')
+    # Slot lease - longer than any Bedrock call (including a streamed answer)
+    LEASE_SECONDS = float(os.environ.get('ADAPTIVE_CONCURRENCY_LEASE_SECONDS', '600'))
+    # How often a waiter re-checks the shared slots
+    POLL_SECONDS = float(os.environ.get('ADAPTIVE_CONCURRENCY_POLL_SECONDS', '0.1'))
+    # Seconds to stay on in-memory limits after a Redis error
+    RETRY_SECONDS = float(os.environ.get('ADAPTIVE_CONCURRENCY_RETRY_SECONDS', '30'))
+    SOCKET_TIMEOUT = float(os.environ.get('ADAPTIVE_CONCURRENCY_SOCKET_TIMEOUT', '0.5'))
+
+
+STATE_KEY_TTL_SECONDS = 86400
+
+# KEYS[1] = limit hash, KEYS[2] = slot lease sorted set (token -> expiry)
+# ARGV = op ('acquire', 'release', 'success', 'throttle', 'peek'), lease token,
+#        initial, min, max, additive increase, decrease factor, cooldown,
+#        lease seconds, key ttl
+# Returns {acquired / released / changed, limit, slots in flight}
+AIMD_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+
+local op = ARGV[1]
+local initial = tonumber(ARGV[3])
+local min_limit = tonumber(ARGV[4])
+local max_limit = tonumber(ARGV[5])
+local increase = tonumber(ARGV[6])
+local factor = tonumber(ARGV[7])
+local cooldown = tonumber(ARGV[8])
+local lease = tonumber(ARGV[9])
+
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+-- Leases of crashed holders expire
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+
+local h = redis.call('HMGET', KEYS[1], 'limit', 'last_decrease')
+local limit = tonumber(h[1]) or initial
+local last_decrease = tonumber(h[2]) or 0
+local in_flight = redis.call('ZCARD', KEYS[2])
+local slots = math.max(1, math.floor(limit))
+local result = 0
+
+if op == 'acquire' then
+    if in_flight < slots then
+        redis.call('ZADD', KEYS[2], now + lease, ARGV[2])
+        in_flight = in_flight + 1
+        result = 1
+    end
+elseif op == 'release' then
+    result = redis.call('ZREM', KEYS[2], ARGV[2])
+    in_flight = in_flight - result
+elseif op == 'success' then
+    -- Only grow when the limit is actually being used
+    if in_flight * 2 >= slots then
+        limit = math.min(max_limit, limit + increase / limit)
+        result = 1
+    end
+elseif op == 'throttle' then
+    if now - last_decrease >= cooldown then
+        limit = math.max(min_limit, limit * factor)
+        last_decrease = now
+        result = 1
+    end
+end
+
+if op ~= 'peek' then
+    redis.call('HSET', KEYS[1], 'limit', tostring(limit), 'last_decrease', tostring(last_decrease))
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[10]))
+    redis.call('EXPIRE', KEYS[2], tonumber(ARGV[10]))
+end
+
+return {result, tostring(limit), in_flight}
+"""
+
+
+THROTTLING_ERROR_CODES = {
+    'ThrottlingException',
+    'TooManyRequestsException',
+    'ServiceQuotaExceededException'
+}
+
+
+class SlotTimeoutError(TimeoutError):
+    """No local concurrency slot became free in time (the model was never called)"""
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Check whether an exception is a Bedrock throttling response"""
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict):
+        error_code = response.get('Error', {}).get('Code')
+        if error_code in THROTTLING_ERROR_CODES:
+            return True
+
+    error_str = str(error).lower()
+    return 'throttling' in error_str or 'too many requests' in error_str
+
+
+class SharedLimitStore:
+    """
+    Runs AIMD_SCRIPT against Redis; None results mean "use in-memory state"
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url or AIMDConfig.REDIS_URL
+        self.lock = threading.Lock()
+        self._script = None
+        self._down_until = 0.0
+        self.redis_errors = 0
+
+    def is_available(self) -> bool:
+        return time.time() >= self._down_until
+
+    def run(self, op: str, model_id: str, region: str,
+            token: str = '') -> Optional[Tuple[bool, float, int]]:
+        """Apply one operation; returns (result, limit, in_flight) or None while Redis is down"""
+        if not self.is_available():
+            return None
+
+        try:
+            with self.lock:
+                if self._script is None:
+                    from redis import Redis
+
+                    client = Redis.from_url(
+                        self.redis_url,
+                        socket_timeout=AIMDConfig.SOCKET_TIMEOUT,
+                        socket_connect_timeout=AIMDConfig.SOCKET_TIMEOUT
+                    )
+                    self._script = client.register_script(AIMD_SCRIPT)
+                script = self._script
+
+            key = f"{AIMDConfig.KEY_PREFIX}{model_id}@{region}"
+            result, limit, in_flight = script(
+                keys=[key, f"{key}:leases"],
+                args=[op, token, AIMDConfig.INITIAL_LIMIT, AIMDConfig.MIN_LIMIT, AIMDConfig.MAX_LIMIT,
+                      AIMDConfig.ADDITIVE_INCREASE, AIMDConfig.DECREASE_FACTOR,
+                      AIMDConfig.DECREASE_COOLDOWN_SECONDS, AIMDConfig.LEASE_SECONDS, STATE_KEY_TTL_SECONDS]
+            )
+            return bool(int(result)), float(limit), int(in_flight)
+
+        except Exception as e:
+            with self.lock:
+                self.redis_errors += 1
+                self._down_until = time.time() + AIMDConfig.RETRY_SECONDS
+            print(f"⚠️ Shared concurrency limits unavailable, using in-memory limits "
+                  f"for {AIMDConfig.RETRY_SECONDS:.0f}s: {e}")
+            return None
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit for a single (model, region) pair
+
+    With a SharedLimitStore the limit and slots are cluster-wide; self.limit
+    mirrors the last shared value and the in-memory fields are the fallback.
+    """
+
+    def __init__(self, model_id: str, region: str, shared: Optional[SharedLimitStore] = None):
+        self.model_id = model_id
+        self.region = region
+        self.shared = shared
+        self.limit = max(AIMDConfig.MIN_LIMIT, min(AIMDConfig.MAX_LIMIT, AIMDConfig.INITIAL_LIMIT))
+        self.in_flight = 0
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+
+        self.stats = {
+            'successes': 0,
+            'throttles': 0,
+            'decreases': 0,
+            'acquire_timeouts': 0,
+            'peak_limit': self.limit,
+            'min_limit_seen': self.limit
+        }
+
+    def _slots(self) -> int:
+        return max(1, int(self.limit))
+
+    def _run_shared(self, op: str, token: str = '') -> Optional[Tuple[bool, float, int]]:
+        if self.shared is None:
+            return None
+        result = self.shared.run(op, self.model_id, self.region, token)
+        if result is not None:
+            with self.condition:
+                self.limit = result[1]
+                self.stats['peak_limit'] = max(self.stats['peak_limit'], self.limit)
+                self.stats['min_limit_seen'] = min(self.stats['min_limit_seen'], self.limit)
+        return result
+
+    def _timeout_error(self, timeout: float) -> SlotTimeoutError:
+        with self.condition:
+            self.stats['acquire_timeouts'] += 1
+        return SlotTimeoutError(
+            f"No Bedrock concurrency slot for {self.model_id} ({self.region}) "
+            f"after {timeout:.0f}s (limit {self._slots()})"
+        )
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Block until a slot is free (raises SlotTimeoutError after timeout)
+
+        Returns:
+            The shared lease token, or None for an in-memory slot
+        """
+        timeout = AIMDConfig.ACQUIRE_TIMEOUT_SECONDS if timeout is None else timeout
+        deadline = time.time() + timeout
+        token = uuid.uuid4().hex
+
+        while True:
+            shared = self._run_shared('acquire', token)
+            if shared is None:
+                break
+            if shared[0]:
+                return token
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise self._timeout_error(timeout)
+            time.sleep(min(AIMDConfig.POLL_SECONDS, remaining))
+
+        with self.condition:
+            remaining = max(0.0, deadline - time.time())
+            if not self.condition.wait_for(lambda: self.in_flight < self._slots(), remaining):
+                raise self._timeout_error(timeout)
+            self.in_flight += 1
+        return None
+
+    def release(self, token: Optional[str] = None):
+        if token is not None:
+            # An unreachable Redis lets the lease expire instead
+            self._run_shared('release', token)
+            return
+
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def on_success(self, token: Optional[str] = None):
+        """Additive increase: about +ADDITIVE_INCREASE per window of successful calls"""
+        with self.condition:
+            self.stats['successes'] += 1
+
+        if token is not None and self._run_shared('success') is not None:
+            return
+
+        with self.condition:
+            # Only grow when the limit is actually being used, otherwise a
+            # long run of serial calls would inflate it far past the quota
+            if self.in_flight * 2 < self._slots():
+                return
+            self.limit = min(AIMDConfig.MAX_LIMIT, self.limit + AIMDConfig.ADDITIVE_INCREASE / self.limit)
+            self.stats['peak_limit'] = max(self.stats['peak_limit'], self.limit)
+            self.condition.notify_all()
+
+    def on_throttle(self, token: Optional[str] = None):
+        """Multiplicative decrease, at most once per cooldown window"""
+        with self.condition:
+            self.stats['throttles'] += 1
+            old_limit = self.limit
+
+        shared = self._run_shared('throttle') if token is not None else None
+        if shared is not None:
+            decreased = shared[0]
+        else:
+            with self.condition:
+                now = time.time()
+                decreased = now - self.last_decrease >= AIMDConfig.DECREASE_COOLDOWN_SECONDS
+                if decreased:
+                    self.limit = max(AIMDConfig.MIN_LIMIT, self.limit * AIMDConfig.DECREASE_FACTOR)
+                    self.last_decrease = now
+                    self.stats['min_limit_seen'] = min(self.stats['min_limit_seen'], self.limit)
+
+        if not decreased:
+            return
+
+        with self.condition:
+            self.stats['decreases'] += 1
+        print(f"📉 Bedrock throttled {self.model_id} ({self.region}): "
+              f"concurrency {old_limit:.1f} → {self.limit:.1f}", flush=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        shared = self._run_shared('peek')
+        with self.condition:
+            stats = self.stats.copy()
+            stats['limit'] = round(self.limit, 2)
+            stats['in_flight'] = shared[2] if shared is not None else self.in_flight
+        stats['shared'] = shared is not None
+        stats['peak_limit'] = round(stats['peak_limit'], 2)
+        stats['min_limit_seen'] = round(stats['min_limit_seen'], 2)
+        return stats
+
+
+class AdaptiveConcurrencyController:
+    """
+    Registry of AIMDLimiters keyed by (model_id, region)
+
+    Usage:
+        with controller.slot(model_id, region):
+            response = runtime.invoke_model(...)
+
+    A successful block raises the limit. A throttling exception lowers it and
+    is re-raised, so the caller's existing retry/fallback logic still runs.
+    """
+
+    def __init__(self, shared: Optional[SharedLimitStore] = None):
+        self.limiters: Dict[Tuple[str, str], AIMDLimiter] = {}
+        self.lock = threading.Lock()
+        self.shared = shared
+
+    def get_limiter(self, model_id: str, region: Optional[str] = None) -> AIMDLimiter:
+        key = (model_id, region or 'default')
+        with self.lock:
+            limiter = self.limiters.get(key)
+            if limiter is None:
+                limiter = AIMDLimiter(*key, shared=self.shared)
+                self.limiters[key] = limiter
+            return limiter
+
+    @contextmanager
+    def slot(self, model_id: str, region: Optional[str] = None, timeout: Optional[float] = None):
+        """Hold one concurrency slot for the duration of a Bedrock call"""
+        if not AIMDConfig.ENABLED:
+            yield None
+            return
+
+        limiter = self.get_limiter(model_id, region)
+        token = limiter.acquire(timeout)
+        try:
+            yield limiter
+        except Exception as e:
+            if is_throttling_error(e):
+                limiter.on_throttle(token)
+            raise
+        else:
+            limiter.on_success(token)
+        finally:
+            limiter.release(token)
+
+    def get_total_limit(self) -> int:
+        """Aggregate concurrency currently allowed across all models/regions"""
+        with self.lock:
+            limiters = list(self.limiters.values())
+
+        if not limiters:
+            return int(AIMDConfig.INITIAL_LIMIT)
+        return sum(limiter._slots() for limiter in limiters)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            limiters = list(self.limiters.values())
+
+        return {
+            'enabled': AIMDConfig.ENABLED,
+            'shared': self.shared is not None and self.shared.is_available(),
+            'total_limit': self.get_total_limit(),
+            'limiters': {
+                f"{limiter.model_id}@{limiter.region}": limiter.get_stats()
+                for limiter in limiters
+            }
+        }
+
+
+# Global instance
+_concurrency_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_concurrency_controller() -> AdaptiveConcurrencyController:
+    """Get or create the process-wide concurrency controller"""
+    global _concurrency_controller
+
+    with _controller_lock:
+        if _concurrency_controller is None:
+            shared = None
+            if AIMDConfig.REDIS_ENABLED:
+                try:
+                    import redis  # noqa: F401
+                    shared = SharedLimitStore()
+                except ImportError:
+                    print("⚠️ redis package not installed - concurrency limits stay per-process")
+            _concurrency_controller = AdaptiveConcurrencyController(shared)
+
+        return _concurrency_controller
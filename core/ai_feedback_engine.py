@@ -6,13 +6,44 @@ import sys
 import time
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 # Add current directory to Python path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.bedrock_client import get_bedrock_client
+from core.analysis_cache import get_analysis_cache, make_cache_key
+from core.prompt_caching import build_system_blocks, record_cache_usage
+from core.adaptive_concurrency import get_concurrency_controller
+from core.async_request_manager import get_async_request_manager
+from core.hedged_requests import HedgingConfig, HedgeCancelled, get_hedged_invoker, get_latency_tracker
+from core.bedrock_cassette import get_bedrock_cassette
+from core.circuit_breaker import CircuitOpenError, get_circuit_breaker
+
+# Long sections are split into chunks that fit this input budget (tokens) and
+# analyzed in parallel instead of being truncated
+SECTION_TOKEN_BUDGET = int(os.environ.get('SECTION_TOKEN_BUDGET', '2000'))
+SECTION_CHUNK_MAX_WORKERS = int(os.environ.get('SECTION_CHUNK_MAX_WORKERS', '4'))
+
+# Per-model overrides (matched on model id fragment)
+SECTION_TOKEN_BUDGETS = {
+    'haiku': int(os.environ.get('SECTION_TOKEN_BUDGET_HAIKU', '1500'))
+}
+
 # Request manager removed - using async_request_manager instead
 REQUEST_MANAGER_ENABLED = False
 
+
+def admitted_call(model_id, body):
+    """
+    Rate-limit admission for one Bedrock call
+
+    Charges the request/token budgets shared by every process (see
+    AsyncRequestManager.admitted); body is the serialized request.
+    """
+    request_manager = get_async_request_manager()
+    return request_manager.admitted(model_id, request_manager.token_counter.estimate_tokens(body))
+
 # Multi-model fallback handled by celery_tasks_enhanced
 # This fallback engine only used when enhanced mode unavailable
 MODEL_FALLBACK_ENABLED = False
@@ -66,13 +97,15 @@ class FallbackModelConfig:
             "anthropic_version": config['anthropic_version'],
             "max_tokens": config['max_tokens'],
             "temperature": config['temperature'],
-            "system": system_prompt,
+            # Static system prompt marked cacheable (Bedrock prompt caching)
+            "system": build_system_blocks(system_prompt, config['model_id']),
             "messages": [{"role": "user", "content": user_prompt}]
         }
         return json.dumps(body)
 
     def extract_response_content(self, response_body):
         try:
+            record_cache_usage(response_body.get('usage', {}), self.get_model_config()['model_id'])
             content = response_body.get('content', [])
             if content and len(content) > 0:
                 return content[0].get('text', '')
@@ -100,6 +133,39 @@ class FallbackModelConfig:
         }
         return model_map.get(base_name, model_map['claude-3-5-sonnet'])
 
+    def get_models_for_request(self):
+        """Primary model followed by fallback models, in priority order"""
+        config = self.get_model_config()
+
+        models = [{
+            'name': config['model_name'],
+            'id': config['model_id'],
+            'priority': 1,
+            'max_tokens': config['max_tokens'],
+            'temperature': config['temperature']
+        }]
+
+        # Fallback models from environment, then configured defaults
+        fallback_env = os.environ.get('BEDROCK_FALLBACK_MODELS', '')
+        fallback_ids = [m.strip() for m in fallback_env.split(',') if m.strip()]
+        fallback_ids += [self.get_fallback_model_id(base_name) for base_name in config['fallback_models']]
+
+        for fallback_id in fallback_ids:
+            # Avoid duplicates
+            if any(m['id'] == fallback_id for m in models):
+                continue
+            base_name = self._extract_base_model(fallback_id)
+            model_info = self.SUPPORTED_MODELS.get(base_name, {})
+            models.append({
+                'name': model_info.get('name', base_name),
+                'id': fallback_id,
+                'priority': len(models) + 1,
+                'max_tokens': config['max_tokens'],
+                'temperature': config['temperature']
+            })
+
+        return models
+
 # Always create an instance (will be used if imports fail or for fallback)
 model_config = FallbackModelConfig()
 
@@ -141,7 +207,7 @@ class AIFeedbackEngine:
             20: "New Service Launch Considerations"
         }
         
-        self.feedback_cache = {}
+        self.feedback_cache = get_analysis_cache()
         self.hawkeye_checklist = self._load_hawkeye_checklist()
 
     def _load_hawkeye_checklist(self):
@@ -175,25 +241,140 @@ class AIFeedbackEngine:
             return ""
 
     def analyze_section(self, section_name, content, doc_type="Full Write-up"):
-        """Analyze section with enhanced Hawkeye framework - focused and actionable"""
-        cache_key = f"{section_name}_{hash(content)}"
-        if cache_key in self.feedback_cache:
-            return self.feedback_cache[cache_key]
+        """Analyze section with enhanced Hawkeye framework - focused and actionable
+
+        Sections larger than the model's token budget are split on paragraph
+        boundaries, the chunks are analyzed in parallel and the results merged.
+        """
+        model_id = model_config.get_model_config()['model_id']
+        chunks = self._chunk_section(content, self._get_chunk_token_budget(model_id))
+
+        if len(chunks) <= 1:
+            return self._analyze_single(section_name, content, doc_type)
+
+        print(f"✂️ Section '{section_name}' split into {len(chunks)} chunks for parallel analysis")
+
+        def analyze_chunk(idx):
+            chunk_name = f"{section_name} (part {idx + 1} of {len(chunks)})"
+            return self._analyze_single(section_name, chunks[idx], doc_type, prompt_section_name=chunk_name)
+
+        workers = max(1, min(SECTION_CHUNK_MAX_WORKERS, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='section_chunk') as executor:
+            chunk_results = list(executor.map(analyze_chunk, range(len(chunks))))
+
+        return self._merge_chunk_results(section_name, chunks, chunk_results)
+
+    def _get_chunk_token_budget(self, model_id):
+        """Get the per-chunk input token budget for a model"""
+        model_id = (model_id or '').lower()
+        for fragment, budget in SECTION_TOKEN_BUDGETS.items():
+            if fragment in model_id:
+                return budget
+        return SECTION_TOKEN_BUDGET
+
+    def _chunk_section(self, content, token_budget):
+        """Split content on paragraph boundaries into chunks within the token budget
+
+        Uses the same ~4 characters per token estimate as TokenCounter. A
+        paragraph that alone exceeds the budget is split on sentences, and
+        hard-cut only as a last resort.
+        """
+        max_chars = max(token_budget * 4, 500)
+        if not content or len(content) <= max_chars:
+            return [content]
+
+        pieces = []
+        for paragraph in re.split(r'\n\s*\n', content):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if len(paragraph) <= max_chars:
+                pieces.append(paragraph)
+                continue
+
+            for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+                while len(sentence) > max_chars:
+                    pieces.append(sentence[:max_chars])
+                    sentence = sentence[max_chars:]
+                if sentence:
+                    pieces.append(sentence)
+
+        chunks = []
+        current = ''
+        for piece in pieces:
+            candidate = f"{current}\n\n{piece}" if current else piece
+            if len(candidate) > max_chars and current:
+                chunks.append(current)
+                current = piece
+            else:
+                current = candidate
+        if current:
+            chunks.append(current)
+
+        return chunks
+
+    def _merge_chunk_results(self, section_name, chunks, chunk_results):
+        """Merge per-chunk analysis results into one section result"""
+        merged_items = []
+        chunk_info = []
+        failed_chunks = 0
+
+        for idx, chunk_result in enumerate(chunk_results):
+            chunk_result = chunk_result or {}
+            items = chunk_result.get('feedback_items', [])
+            failed = bool(chunk_result.get('error') or chunk_result.get('fallback'))
+            if failed:
+                failed_chunks += 1
+
+            for item in items:
+                item = dict(item)
+                item['id'] = f"{item.get('id', section_name)}_c{idx + 1}"
+                item['chunk_index'] = idx + 1
+                item['chunk_count'] = len(chunks)
+                merged_items.append(item)
+
+            chunk_info.append({
+                'index': idx + 1,
+                'chars': len(chunks[idx]),
+                'feedback_count': len(items),
+                'failed': failed
+            })
+
+        unique_items = self._remove_duplicate_feedback(merged_items)
+        unique_items.sort(key=lambda x: x['confidence'], reverse=True)
+
+        result = {
+            'feedback_items': unique_items,
+            'chunked': True,
+            'chunk_count': len(chunks),
+            'chunks': chunk_info
+        }
+
+        # Only flag the section as failed when no chunk produced a real analysis
+        if failed_chunks == len(chunks):
+            result['fallback'] = True
+            result['error'] = next((r.get('error') for r in chunk_results if r and r.get('error')), None) or 'All chunks fell back'
+
+        print(f"🔗 Merged {len(chunks)} chunks for '{section_name}': {len(merged_items)} items → {len(unique_items)} unique")
+        return result
+
+    def _analyze_single(self, section_name, content, doc_type="Full Write-up", prompt_section_name=None):
+        """Analyze one section (or one chunk of a section) in a single model call"""
+        prompt_section_name = prompt_section_name or section_name
 
         # Use prompts from config/ai_prompts.py if available
-        # ✅ FIX: Increased content limit from 2500 to 8000 for complete detailed analysis (Issue #5)
         if ai_prompts:
-            prompt = ai_prompts.build_section_analysis_prompt(section_name, content[:8000], doc_type)
+            prompt = ai_prompts.build_section_analysis_prompt(prompt_section_name, content, doc_type)
             system_prompt = ai_prompts.build_enhanced_system_prompt(self.hawkeye_checklist) + "\n\n" + ai_prompts.SECTION_ANALYSIS_SYSTEM_PROMPT
         else:
             # Fallback to comprehensive prompts when config not available
             section_guidance = self._get_section_guidance(section_name)
 
             # Build detailed analysis prompt
-            prompt = f"""Analyze the '{section_name}' section of this investigation document.
+            prompt = f"""Analyze the '{prompt_section_name}' section of this investigation document.
 
 CONTENT TO ANALYZE:
-{content[:8000]}
+{content}
 
 ANALYSIS REQUIREMENTS:
 1. Identify gaps, weaknesses, or areas needing improvement
@@ -243,6 +424,20 @@ OUTPUT FORMAT:
 You MUST respond with valid JSON only. No markdown code blocks, no explanatory text, just the JSON object.
 The JSON must have a "feedback_items" array containing your analysis."""
 
+        # Content-addressed cache shared by all processes (keyed on prompts + model + params)
+        cache_key = None
+        if self.feedback_cache:
+            config = model_config.get_model_config()
+            cache_key = make_cache_key(system_prompt, prompt, config['model_id'], {
+                'max_tokens': config['max_tokens'],
+                'temperature': config['temperature'],
+                'min_confidence': FEEDBACK_MIN_CONFIDENCE
+            })
+            cached = self.feedback_cache.get(cache_key)
+            if cached is not None:
+                print(f"💾 Cache hit for section: {section_name}")
+                return cached
+
         response = self._invoke_bedrock(system_prompt, prompt)
         
         # Always ensure we have a valid result structure
@@ -361,8 +556,8 @@ The JSON must have a "feedback_items" array containing your analysis."""
 
         # Only cache successful results (not errors or fallbacks)
         # This prevents caching mock/fallback responses that would persist after fixes
-        if not result.get('error') and not result.get('fallback'):
-            self.feedback_cache[cache_key] = result
+        if cache_key and not result.get('error') and not result.get('fallback'):
+            self.feedback_cache.set(cache_key, result)
             print(f"💾 Result cached for future requests")
         else:
             print(f"⚠️ Skipping cache for fallback/error response")
@@ -441,6 +636,25 @@ The JSON must have a "feedback_items" array containing your analysis."""
         return "Low"
 
     def _invoke_bedrock(self, system_prompt, user_prompt, max_retries_per_model=3):
+        """
+        Invoke AWS Bedrock, through the record/replay cassette when
+        BEDROCK_CASSETTE_MODE is set
+        """
+        cassette = get_bedrock_cassette()
+        if cassette is None:
+            return self._invoke_bedrock_live(system_prompt, user_prompt, max_retries_per_model)
+
+        return cassette.call(
+            'ai_feedback_engine',
+            system_prompt,
+            user_prompt,
+            model_config.get_model_config()['model_id'],
+            lambda: self._invoke_bedrock_live(system_prompt, user_prompt, max_retries_per_model),
+            # Never record mock/fallback responses
+            should_record=lambda response: not response.startswith('{"error"') and '"fallback": true' not in response
+        )
+
+    def _invoke_bedrock_live(self, system_prompt, user_prompt, max_retries_per_model=3):
         """
         Invoke AWS Bedrock with multi-model fallback on throttling
         Tries models in priority order, automatically switching on throttle
@@ -490,19 +704,13 @@ The JSON must have a "feedback_items" array containing your analysis."""
 
             config = model_config.get_model_config()
 
-            # Create Bedrock client using default credentials (works with both env vars and IAM roles)
-            # Add timeout configuration with sufficient time for AI analysis
-            from botocore.config import Config
-            boto_config = Config(
+            # Shared pooled Bedrock client (works with both env vars and IAM roles)
+            # Timeouts give AI analysis sufficient time to respond
+            runtime = get_bedrock_client(
+                config['region'],
                 connect_timeout=10,   # 10 seconds to establish connection
                 read_timeout=180,     # 180 seconds (3 minutes) to read response - AI needs time
-                retries={'max_attempts': 2, 'mode': 'standard'}  # 2 retries for reliability
-            )
-
-            runtime = boto3.client(
-                'bedrock-runtime',
-                region_name=config['region'],
-                config=boto_config
+                max_attempts=2        # 2 retries for reliability
             )
 
             # Check credential source for logging
@@ -511,6 +719,10 @@ The JSON must have a "feedback_items" array containing your analysis."""
             else:
                 print(f"🔑 Using AWS credentials from IAM role (App Runner)", flush=True)
 
+            # Hedge slow primary calls onto the next healthy model if enabled
+            if HedgingConfig.ENABLED:
+                return self._invoke_with_hedging(runtime, config, system_prompt, user_prompt, max_retries_per_model)
+
             # Try multi-model fallback if enabled
             if MODEL_FALLBACK_ENABLED:
                 return self._invoke_with_model_fallback(runtime, system_prompt, user_prompt, max_retries_per_model)
@@ -529,7 +741,9 @@ The JSON must have a "feedback_items" array containing your analysis."""
 
             # Provide specific error guidance
             error_str = str(e).lower()
-            if 'timeout' in error_str:
+            if isinstance(e, CircuitOpenError):
+                print("💡 Model circuit is open after repeated failures - retry shortly or POST /reset_model_cooldowns", flush=True)
+            elif 'timeout' in error_str:
                 print("💡 Timeout occurred - falling back to mock response", flush=True)
                 return self._generate_mock_response('analysis',user_prompt)
             elif 'credentials' in error_str or 'access' in error_str:
@@ -602,7 +816,68 @@ The JSON must have a "feedback_items" array containing your analysis."""
         print(f"❌ Request {request_id} exhausted all models. Tried: {', '.join(models_tried)}", flush=True)
         raise Exception(f"All {len(models_tried)} Claude models throttled for this request")
 
-    def _try_model(self, runtime, model, system_prompt, user_prompt, max_retries):
+    def _invoke_with_hedging(self, runtime, config, system_prompt, user_prompt, max_retries):
+        """
+        Invoke the primary model, hedging onto the next healthy fallback model
+        when it is slower than its recent latency percentile
+        """
+        models = model_config.get_models_for_request()
+        if len(models) < 2:
+            return self._invoke_single_model(runtime, config, system_prompt, user_prompt, max_retries)
+
+        # Start from the first model whose circuit admits the request
+        models = self._skip_open_circuits(models)
+        if len(models) < 2:
+            return self._try_model(runtime, models[0], system_prompt, user_prompt, max_retries)
+
+        invoker = get_hedged_invoker()
+        estimated_tokens = invoker.request_manager.token_counter.estimate_tokens(system_prompt + user_prompt)
+
+        def call_model(model, cancel_event):
+            return self._try_model(runtime, model, system_prompt, user_prompt, max_retries, cancel_event)
+
+        print(f"🤖 Invoking {models[0]['name']} with hedging across {len(models)} models", flush=True)
+        return invoker.invoke(models, call_model, estimated_tokens)
+
+    def _skip_open_circuits(self, models):
+        """
+        Drop leading models whose circuit breaker refuses requests
+
+        Returns the remaining models, starting with one that was admitted
+        (and so holds the probe slot if its circuit is half-open)
+        """
+        breaker = get_circuit_breaker()
+        for index, model in enumerate(models):
+            allowed, reason = breaker.allow(model['id'])
+            if allowed:
+                return models[index:]
+            print(f"⚡ Skipping {model['name']}: {reason}", flush=True)
+
+        raise CircuitOpenError(f"All {len(models)} models have open circuits")
+
+    def _try_model(self, runtime, model, system_prompt, user_prompt, max_retries, cancel_event=None):
+        """
+        Try a specific model, recording the outcome in its circuit breaker
+
+        The caller has already been admitted by the breaker
+        (_skip_open_circuits / is_model_available). A call cancelled by the
+        hedge winner records no outcome but hands back a half-open probe lease.
+        """
+        breaker = get_circuit_breaker()
+        try:
+            result = self._try_model_with_retries(runtime, model, system_prompt, user_prompt,
+                                                  max_retries, cancel_event)
+        except HedgeCancelled:
+            breaker.release(model['id'])
+            raise
+        except Exception as e:
+            breaker.record_failure(model['id'], e)
+            raise
+
+        breaker.record_success(model['id'])
+        return result
+
+    def _try_model_with_retries(self, runtime, model, system_prompt, user_prompt, max_retries, cancel_event=None):
         """Try a specific model with exponential backoff retry"""
         model_id = model['id']
 
@@ -611,7 +886,8 @@ The JSON must have a "feedback_items" array containing your analysis."""
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": model['max_tokens'],
             "temperature": model['temperature'],
-            "system": system_prompt,
+            # Static system prompt marked cacheable (Bedrock prompt caching)
+            "system": build_system_blocks(system_prompt, model_id),
             "messages": [{"role": "user", "content": user_prompt}]
         }
         body = json.dumps(body_dict)
@@ -620,15 +896,26 @@ The JSON must have a "feedback_items" array containing your analysis."""
 
         # Retry loop with exponential backoff
         for attempt in range(max_retries):
+            # A hedged request already won - don't send (or retry) this one
+            if cancel_event is not None and cancel_event.is_set():
+                raise HedgeCancelled(f"{model_id} cancelled by hedge winner")
+
             try:
-                response = runtime.invoke_model(
-                    body=body,
-                    modelId=model_id,
-                    accept="application/json",
-                    contentType="application/json"
-                )
+                start_time = time.time()
+
+                # Shared rate limits, then the AIMD concurrency limit per model/region
+                with admitted_call(model_id, body), \
+                        get_concurrency_controller().slot(model_id, runtime.meta.region_name):
+                    response = runtime.invoke_model(
+                        body=body,
+                        modelId=model_id,
+                        accept="application/json",
+                        contentType="application/json"
+                    )
 
                 response_body = json.loads(response.get('body').read())
+                get_latency_tracker().record(model_id, time.time() - start_time)
+                record_cache_usage(response_body.get('usage', {}), model_id)
 
                 # Extract response content
                 content = response_body.get('content', [])
@@ -666,17 +953,28 @@ The JSON must have a "feedback_items" array containing your analysis."""
 
         print(f"🤖 Invoking {config['model_name']} for analysis (ID: {config['model_id']})", flush=True)
 
+        # Fails fast with CircuitOpenError while the model is known to be down
+        with get_circuit_breaker().guard(config['model_id']):
+            return self._invoke_single_model_with_retries(runtime, config, body, max_retries)
+
+    def _invoke_single_model_with_retries(self, runtime, config, body, max_retries):
         last_exception = None
         for attempt in range(max_retries):
             try:
-                response = runtime.invoke_model(
-                    body=body,
-                    modelId=config['model_id'],
-                    accept="application/json",
-                    contentType="application/json"
-                )
+                start_time = time.time()
+
+                # Shared rate limits, then the AIMD concurrency limit per model/region
+                with admitted_call(config['model_id'], body), \
+                        get_concurrency_controller().slot(config['model_id'], config['region']):
+                    response = runtime.invoke_model(
+                        body=body,
+                        modelId=config['model_id'],
+                        accept="application/json",
+                        contentType="application/json"
+                    )
 
                 response_body = json.loads(response.get('body').read())
+                get_latency_tracker().record(config['model_id'], time.time() - start_time)
                 result = model_config.extract_response_content(response_body)
 
                 print(f"✅ Claude analysis response received ({len(result)} chars)", flush=True)
@@ -817,7 +1115,8 @@ The JSON must have a "feedback_items" array containing your analysis."""
                     "confidence": 0.85
                 }
 
-            return json.dumps({"feedback_items": [feedback_data]})
+            # Marked as fallback so mock output is never cached
+            return json.dumps({"feedback_items": [feedback_data], "fallback": True})
     
     def _format_chat_response(self, response):
         """Format chat response with proper HTML formatting - COMPLETE response, no truncation"""
@@ -902,6 +1201,18 @@ The JSON must have a "feedback_items" array containing your analysis."""
             print("⚠️ No AWS credentials - using mock chat response")
             return self._generate_mock_response('chat', query, context)
 
+        system_prompt, prompt = self._build_chat_prompts(query, context)
+
+        # Check if multi-model chat is enabled (default to false for stability)
+        enable_multi_model = os.environ.get('CHAT_ENABLE_MULTI_MODEL', 'false').lower() == 'true'
+
+        if enable_multi_model:
+            return self._process_chat_with_fallback(system_prompt, prompt, query, context)
+        else:
+            return self._process_chat_single_model(system_prompt, prompt, query, context)
+
+    def _build_chat_prompts(self, query, context):
+        """Build (system_prompt, prompt) for a chat query"""
         current_section = context.get('current_section', 'Current section')
         feedback_count = len(context.get('current_feedback', []))
 
@@ -919,26 +1230,66 @@ Document Type: Full Write-up"""
             prompt = f"Answer this query: {query}"
             system_prompt = "You are a helpful assistant."
 
-        # Check if multi-model chat is enabled (default to false for stability)
-        enable_multi_model = os.environ.get('CHAT_ENABLE_MULTI_MODEL', 'false').lower() == 'true'
+        return system_prompt, prompt
 
-        if enable_multi_model:
-            return self._process_chat_with_fallback(system_prompt, prompt, query, context)
-        else:
-            return self._process_chat_single_model(system_prompt, prompt, query, context)
+    def stream_chat_query(self, query, context):
+        """
+        Stream a chat answer token-by-token from the primary model
+
+        Uses invoke_model_with_response_stream and yields raw text deltas as
+        they arrive. Errors are raised to the caller, which decides whether to
+        fall back to process_chat_query.
+
+        Yields:
+            str: Text fragments in generation order
+        """
+        print(f"Streaming chat query: {query[:50]}...")
+
+        if not model_config.has_credentials():
+            print("⚠️ No AWS credentials - using mock chat response")
+            yield self._generate_mock_response('chat', query, context)
+            return
+
+        system_prompt, prompt = self._build_chat_prompts(query, context)
+        config = model_config.get_model_config()
+        runtime = get_bedrock_client(config['region'])
+        body = model_config.get_bedrock_request_body(system_prompt, prompt)
+
+        print(f"🤖 Streaming chat from {config['model_name']}", flush=True)
+
+        # The rate-limit admission and concurrency slot are held until the
+        # stream is fully consumed
+        with admitted_call(config['model_id'], body), \
+                get_concurrency_controller().slot(config['model_id'], config['region']), \
+                get_circuit_breaker().guard(config['model_id']):
+            response = runtime.invoke_model_with_response_stream(
+                body=body,
+                modelId=config['model_id'],
+                accept="application/json",
+                contentType="application/json"
+            )
+
+            for event in response.get('body'):
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
+
+                payload = json.loads(chunk.get('bytes').decode('utf-8'))
+                if payload.get('type') == 'message_start':
+                    record_cache_usage(payload.get('message', {}).get('usage', {}), config['model_id'])
+                elif payload.get('type') == 'content_block_delta':
+                    delta = payload.get('delta', {})
+                    if delta.get('type') == 'text_delta' and delta.get('text'):
+                        yield delta['text']
 
     def _process_chat_single_model(self, system_prompt, prompt, query, context, max_retries=5):
         """Process chat with single primary model with exponential backoff retry"""
         try:
             # Use real Bedrock for chat
-            import boto3
             config = model_config.get_model_config()
 
-            # Create Bedrock client using default credentials (works with both env vars and IAM roles)
-            runtime = boto3.client(
-                'bedrock-runtime',
-                region_name=config['region']
-            )
+            # Shared pooled Bedrock client (works with both env vars and IAM roles)
+            runtime = get_bedrock_client(config['region'])
 
             # Check credential source for logging
             if os.environ.get('AWS_ACCESS_KEY_ID'):
@@ -950,10 +1301,26 @@ Document Type: Full Write-up"""
 
             print(f"🤖 Chat query to {config['model_name']}", flush=True)
 
-            # Retry loop with exponential backoff
-            last_exception = None
-            for attempt in range(max_retries):
-                try:
+            # Fails fast with CircuitOpenError while the model is known to be down
+            with get_circuit_breaker().guard(config['model_id']):
+                result = self._chat_with_retries(runtime, config, body, max_retries)
+
+            print(f"✅ Claude chat response received", flush=True)
+            return self._format_chat_response(result)
+
+        except Exception as e:
+            print(f"❌ Chat processing error: {str(e)}", flush=True)
+            print("🎭 Falling back to mock chat response", flush=True)
+            return self._generate_mock_response('chat', query, context)
+
+    def _chat_with_retries(self, runtime, config, body, max_retries):
+        """Send one chat request with exponential backoff on throttling"""
+        last_exception = None
+        for attempt in range(max_retries):
+            try:
+                # Shared rate limits, then the AIMD concurrency limit per model/region
+                with admitted_call(config['model_id'], body), \
+                        get_concurrency_controller().slot(config['model_id'], config['region']):
                     response = runtime.invoke_model(
                         body=body,
                         modelId=config['model_id'],
@@ -961,36 +1328,28 @@ Document Type: Full Write-up"""
                         contentType="application/json"
                     )
 
-                    response_body = json.loads(response.get('body').read())
-                    result = model_config.extract_response_content(response_body)
-
-                    print(f"✅ Claude chat response received", flush=True)
-                    return self._format_chat_response(result)
+                response_body = json.loads(response.get('body').read())
+                return model_config.extract_response_content(response_body)
 
-                except Exception as retry_error:
-                    last_exception = retry_error
-                    error_str = str(retry_error).lower()
+            except Exception as retry_error:
+                last_exception = retry_error
+                error_str = str(retry_error).lower()
 
-                    # Check if it's a throttling error
-                    if 'throttling' in error_str or 'too many requests' in error_str or 'rate' in error_str:
-                        wait_time = (2 ** attempt) + (time.time() % 1)  # Exponential backoff with jitter
+                # Check if it's a throttling error
+                if 'throttling' in error_str or 'too many requests' in error_str or 'rate' in error_str:
+                    wait_time = (2 ** attempt) + (time.time() % 1)  # Exponential backoff with jitter
 
-                        if attempt < max_retries - 1:
-                            print(f"⏳ Chat rate limited - waiting {wait_time:.1f}s before retry {attempt + 1}/{max_retries}...", flush=True)
-                            time.sleep(wait_time)
-                        else:
-                            print(f"❌ Chat rate limit exceeded after {max_retries} attempts", flush=True)
+                    if attempt < max_retries - 1:
+                        print(f"⏳ Chat rate limited - waiting {wait_time:.1f}s before retry {attempt + 1}/{max_retries}...", flush=True)
+                        time.sleep(wait_time)
                     else:
-                        # Non-throttling error, don't retry
-                        raise retry_error
-
-            # If we get here, all retries failed
-            raise last_exception
+                        print(f"❌ Chat rate limit exceeded after {max_retries} attempts", flush=True)
+                else:
+                    # Non-throttling error, don't retry
+                    raise retry_error
 
-        except Exception as e:
-            print(f"❌ Chat processing error: {str(e)}", flush=True)
-            print("🎭 Falling back to mock chat response", flush=True)
-            return self._generate_mock_response('chat', query, context)
+        # If we get here, all retries failed
+        raise last_exception
 
     def _process_chat_with_fallback(self, system_prompt, prompt, query, context):
         """Process chat with automatic model fallback"""
@@ -999,45 +1358,13 @@ Document Type: Full Write-up"""
 
         config = model_config.get_model_config()
 
-        # Build list of models to try
-        models_to_try = []
-
-        # Add primary model
-        models_to_try.append({
-            'name': config['model_name'],
-            'id': config['model_id'],
-            'priority': 1
-        })
-
-        # Add fallback models from environment
-        fallback_env = os.environ.get('BEDROCK_FALLBACK_MODELS', '')
-        if fallback_env:
-            fallback_ids = [m.strip() for m in fallback_env.split(',')]
-            for idx, fallback_id in enumerate(fallback_ids):
-                base_name = model_config._extract_base_model(fallback_id)
-                model_info = model_config.SUPPORTED_MODELS.get(base_name, {})
-                models_to_try.append({
-                    'name': model_info.get('name', base_name),
-                    'id': fallback_id,
-                    'priority': idx + 2
-                })
-
-        # Add default fallback models
-        for idx, base_name in enumerate(config['fallback_models']):
-            fallback_id = model_config.get_fallback_model_id(base_name)
-            # Avoid duplicates
-            if not any(m['id'] == fallback_id for m in models_to_try):
-                model_info = model_config.SUPPORTED_MODELS.get(base_name, {})
-                models_to_try.append({
-                    'name': model_info.get('name', base_name),
-                    'id': fallback_id,
-                    'priority': len(models_to_try) + 1
-                })
+        # Primary model followed by fallback models
+        models_to_try = model_config.get_models_for_request()
 
         print(f"🔄 Multi-model chat enabled - {len(models_to_try)} models available")
 
-        # Create Bedrock runtime client using default credentials (works with both env vars and IAM roles)
-        runtime = boto3.client('bedrock-runtime', region_name=config['region'])
+        # Shared pooled Bedrock client (works with both env vars and IAM roles)
+        runtime = get_bedrock_client(config['region'])
 
         # Check credential source for logging
         if os.environ.get('AWS_ACCESS_KEY_ID'):
@@ -1055,18 +1382,22 @@ Document Type: Full Write-up"""
                     "anthropic_version": "bedrock-2023-05-31",
                     "max_tokens": config.get('max_tokens', 8192),
                     "temperature": config.get('temperature', 0.7),
-                    "system": system_prompt,
+                    "system": build_system_blocks(system_prompt, model['id']),
                     "messages": [{"role": "user", "content": prompt}]
                 })
 
-                response = runtime.invoke_model(
-                    body=body,
-                    modelId=model['id'],
-                    accept="application/json",
-                    contentType="application/json"
-                )
+                # Models with an open circuit raise CircuitOpenError and are skipped
+                with admitted_call(model['id'], body), \
+                        get_concurrency_controller().slot(model['id'], config['region']):
+                    with get_circuit_breaker().guard(model['id']):
+                        response = runtime.invoke_model(
+                            body=body,
+                            modelId=model['id'],
+                            accept="application/json",
+                            contentType="application/json"
+                        )
 
-                response_body = json.loads(response.get('body').read())
+                    response_body = json.loads(response.get('body').read())
                 result = model_config.extract_response_content(response_body)
 
                 print(f"✅ Chat successful with {model['name']}")
@@ -1117,11 +1448,8 @@ Document Type: Full Write-up"""
 
             config = model_config.get_model_config()
 
-            # Create Bedrock client using default credentials (works with both env vars and IAM roles)
-            runtime = boto3.client(
-                'bedrock-runtime',
-                region_name=config['region']
-            )
+            # Shared pooled Bedrock client (works with both env vars and IAM roles)
+            runtime = get_bedrock_client(config['region'])
 
             # Check credential source for logging
             if os.environ.get('AWS_ACCESS_KEY_ID'):
@@ -1141,12 +1469,13 @@ Document Type: Full Write-up"""
             last_exception = None
             for attempt in range(max_retries):
                 try:
-                    response = runtime.invoke_model(
-                        body=body,
-                        modelId=config['model_id'],
-                        accept="application/json",
-                        contentType="application/json"
-                    )
+                    with admitted_call(config['model_id'], body):
+                        response = runtime.invoke_model(
+                            body=body,
+                            modelId=config['model_id'],
+                            accept="application/json",
+                            contentType="application/json"
+                        )
 
                     response_body = json.loads(response.get('body').read())
                     result = model_config.extract_response_content(response_body)
@@ -0,0 +1,277 @@
+"""
+Persistent Analysis Cache for AI-Prism
+Content-addressed cache of section analysis results, shared across processes
+
+Entries are keyed by the SHA-256 of everything that determines the model
+output (system prompt, user prompt, model id and generation parameters), so
+the key is identical in the Flask process, every RQ worker and after a
+restart - unlike Python's salted hash(). Results are stored in SQLite with
+TTL expiry and LRU eviction bounded by entry count and total bytes.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+
+
+class AnalysisCacheConfig:
+    """
+    Cache limits (overridable via environment variables)
+    """
+    ENABLED = os.environ.get('ANALYSIS_CACHE_ENABLED', 'true').lower() == 'true'
+    DB_PATH = os.environ.get('ANALYSIS_CACHE_PATH', 'data/analysis_cache.db')
+    TTL_SECONDS = int(os.environ.get('ANALYSIS_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))  # 7 days
+    MAX_ENTRIES = int(os.environ.get('ANALYSIS_CACHE_MAX_ENTRIES', '5000'))
+    MAX_BYTES = int(os.environ.get('ANALYSIS_CACHE_MAX_BYTES', str(100 * 1024 * 1024)))  # 100MB
+
+
+def make_cache_key(system_prompt: str, user_prompt: str, model_id: str,
+                   params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a stable content-addressed cache key
+
+    Args:
+        system_prompt: System prompt sent to the model
+        user_prompt: User prompt sent to the model
+        model_id: Bedrock model id
+        params: Generation parameters (max_tokens, temperature, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    material = json.dumps({
+        'system': system_prompt,
+        'prompt': user_prompt,
+        'model_id': model_id,
+        'params': params or {}
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    """
+    SQLite-backed LRU cache with TTL expiry
+
+    A new SQLite connection is opened per operation (same pattern as
+    DatabaseManager), and the database runs in WAL mode so the Flask process
+    and RQ workers can read and write concurrently.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: Optional[int] = None,
+                 max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.db_path = db_path or AnalysisCacheConfig.DB_PATH
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else AnalysisCacheConfig.TTL_SECONDS
+        self.max_entries = max_entries or AnalysisCacheConfig.MAX_ENTRIES
+        self.max_bytes = max_bytes or AnalysisCacheConfig.MAX_BYTES
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'errors': 0
+        }
+        self.stats_lock = threading.Lock()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._init_database()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _init_database(self):
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hit_count INTEGER DEFAULT 0
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_analysis_cache_access ON analysis_cache(last_access)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _count(self, stat: str, amount: int = 1):
+        with self.stats_lock:
+            self.stats[stat] += amount
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result
+
+        Returns:
+            Cached result dict, or None on miss/expiry
+        """
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    'SELECT value, created_at FROM analysis_cache WHERE cache_key = ?',
+                    (cache_key,)
+                ).fetchone()
+
+                if row is None:
+                    self._count('misses')
+                    return None
+
+                value, created_at = row
+                now = time.time()
+
+                if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                    conn.execute('DELETE FROM analysis_cache WHERE cache_key = ?', (cache_key,))
+                    conn.commit()
+                    self._count('expirations')
+                    self._count('misses')
+                    return None
+
+                conn.execute(
+                    'UPDATE analysis_cache SET last_access = ?, hit_count = hit_count + 1 WHERE cache_key = ?',
+                    (now, cache_key)
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+            self._count('hits')
+            return json.loads(value)
+
+        except Exception as e:
+            print(f"⚠️ Analysis cache read error: {e}")
+            self._count('errors')
+            return None
+
+    def set(self, cache_key: str, result: Dict[str, Any]):
+        """Store a result and evict expired / least recently used entries"""
+        try:
+            value = json.dumps(result, ensure_ascii=False)
+            now = time.time()
+
+            conn = self._connect()
+            try:
+                conn.execute('''
+                    INSERT OR REPLACE INTO analysis_cache
+                        (cache_key, value, size_bytes, created_at, last_access, hit_count)
+                    VALUES (?, ?, ?, ?, ?, 0)
+                ''', (cache_key, value, len(value.encode('utf-8')), now, now))
+
+                self._evict(conn, now)
+                conn.commit()
+            finally:
+                conn.close()
+
+            self._count('writes')
+
+        except Exception as e:
+            print(f"⚠️ Analysis cache write error: {e}")
+            self._count('errors')
+
+    def _evict(self, conn, now: float):
+        """Drop expired entries, then LRU entries until within count/size limits"""
+        if self.ttl_seconds:
+            expired = conn.execute(
+                'DELETE FROM analysis_cache WHERE created_at < ?',
+                (now - self.ttl_seconds,)
+            ).rowcount
+            if expired:
+                self._count('expirations', expired)
+
+        entries, total_bytes = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM analysis_cache'
+        ).fetchone()
+
+        if entries <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        evicted = 0
+        rows = conn.execute(
+            'SELECT cache_key, size_bytes FROM analysis_cache ORDER BY last_access ASC'
+        ).fetchall()
+
+        for cache_key, size_bytes in rows:
+            if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            conn.execute('DELETE FROM analysis_cache WHERE cache_key = ?', (cache_key,))
+            entries -= 1
+            total_bytes -= size_bytes
+            evicted += 1
+
+        if evicted:
+            self._count('evictions', evicted)
+            print(f"🧹 Analysis cache evicted {evicted} LRU entries")
+
+    def clear(self):
+        """Remove every cached entry"""
+        conn = self._connect()
+        try:
+            conn.execute('DELETE FROM analysis_cache')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss metrics and current size"""
+        with self.stats_lock:
+            stats = self.stats.copy()
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+
+        try:
+            conn = self._connect()
+            try:
+                entries, total_bytes = conn.execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM analysis_cache'
+                ).fetchone()
+            finally:
+                conn.close()
+            stats['entries'] = entries
+            stats['size_bytes'] = total_bytes
+        except Exception as e:
+            stats['entries'] = None
+            stats['size_bytes'] = None
+            stats['error'] = str(e)
+
+        stats['max_entries'] = self.max_entries
+        stats['max_bytes'] = self.max_bytes
+        stats['ttl_seconds'] = self.ttl_seconds
+        return stats
+
+
+# Global instance
+_analysis_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """
+    Get or create the global analysis cache
+
+    Returns:
+        AnalysisCache, or None when disabled via ANALYSIS_CACHE_ENABLED=false
+    """
+    global _analysis_cache
+
+    if not AnalysisCacheConfig.ENABLED:
+        return None
+
+    with _cache_lock:
+        if _analysis_cache is None:
+            _analysis_cache = AnalysisCache()
+
+        return _analysis_cache
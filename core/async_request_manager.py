@@ -19,9 +19,15 @@ from collections import defaultdict, deque
 from typing import Dict, List, Optional, Tuple, Any
 import threading
 import json
+from contextlib import contextmanager
 
-# Note: Redis removed - using in-memory rate limiting instead
-# Rate limiting state is per-process, which works fine for our use case
+from core.adaptive_concurrency import AIMDConfig, get_concurrency_controller
+from core.distributed_rate_limiter import get_distributed_rate_limiter
+from core.circuit_breaker import get_circuit_breaker
+
+# Request and token budgets are shared through Redis token buckets (see
+# core/distributed_rate_limiter.py); the in-memory windows below are the
+# fallback when Redis is unavailable and still feed the per-process stats
 
 # Rate Limiting Configuration
 class RateLimitConfig:
@@ -35,6 +41,10 @@ class RateLimitConfig:
     We use conservative limits (60-70% of max) to ensure stability
     """
     # Request rate limits
+    # When adaptive concurrency is enabled the AIMD controller's limit
+    # (see core/adaptive_concurrency.py) replaces MAX_CONCURRENT_REQUESTS; the
+    # requests-per-minute limit (shared bucket, or the in-memory window
+    # without Redis) always applies
     MAX_REQUESTS_PER_MINUTE = 30  # Conservative: 30% of AWS limit
     MAX_CONCURRENT_REQUESTS = 5    # Max concurrent API calls
 
@@ -42,8 +52,7 @@ class RateLimitConfig:
     MAX_TOKENS_PER_MINUTE = 120000  # 60% of AWS limit
     MAX_TOKENS_PER_REQUEST = 8192    # Claude 3.5 Sonnet default
 
-    # Cooldown periods
-    THROTTLE_COOLDOWN_SECONDS = 60   # Wait 60s after throttling
+    # Cooldown periods (circuit breaker timing: see core/circuit_breaker.py)
     MODEL_SWITCH_DELAY_SECONDS = 5   # Delay before trying next model
 
     # Retry configuration
@@ -51,9 +60,6 @@ class RateLimitConfig:
     INITIAL_BACKOFF_SECONDS = 2      # Initial exponential backoff
     MAX_BACKOFF_SECONDS = 120        # Maximum backoff time
 
-    # Monitoring
-    ERROR_THRESHOLD_FOR_CIRCUIT_BREAKER = 5  # Open circuit after 5 consecutive errors
-
 
 class TokenCounter:
     """
@@ -61,9 +67,17 @@ class TokenCounter:
     Uses approximate token counts to prevent exceeding AWS token limits
     """
 
-    def __init__(self):
+    def __init__(self, distributed=None):
         self.tokens_per_minute = deque()
         self.lock = threading.Lock()
+        # Shared Redis token bucket (None = per-process only)
+        self.distributed = distributed
+
+    def _bucket(self, cost: float, mode: str):
+        if self.distributed is None:
+            return None
+        return self.distributed.call('tokens', RateLimitConfig.MAX_TOKENS_PER_MINUTE,
+                                     RateLimitConfig.MAX_TOKENS_PER_MINUTE, cost, mode)
 
     def estimate_tokens(self, text: str) -> int:
         """
@@ -76,9 +90,12 @@ class TokenCounter:
 
     def add_request(self, prompt_tokens: int, completion_tokens: int = 0):
         """Record token usage for a request"""
+        total_tokens = prompt_tokens + completion_tokens
+        # Usage is known after the call, so it is always charged (may go negative)
+        self._bucket(total_tokens, 'force')
+
         with self.lock:
             now = datetime.now()
-            total_tokens = prompt_tokens + completion_tokens
             self.tokens_per_minute.append((now, total_tokens))
 
             # Clean up old entries (older than 1 minute)
@@ -86,8 +103,15 @@ class TokenCounter:
             while self.tokens_per_minute and self.tokens_per_minute[0][0] < cutoff_time:
                 self.tokens_per_minute.popleft()
 
+    def get_remaining_tokens(self) -> int:
+        """Tokens left in the current budget (shared bucket when available)"""
+        shared = self._bucket(0, 'peek')
+        if shared is not None:
+            return max(0, int(shared[1]))
+        return max(0, RateLimitConfig.MAX_TOKENS_PER_MINUTE - self.get_tokens_last_minute())
+
     def get_tokens_last_minute(self) -> int:
-        """Get total tokens used in the last minute"""
+        """Get total tokens used in the last minute by this process"""
         with self.lock:
             now = datetime.now()
             cutoff_time = now - timedelta(minutes=1)
@@ -106,6 +130,11 @@ class TokenCounter:
         Returns:
             (can_make_request, wait_seconds)
         """
+        shared = self._bucket(estimated_tokens, 'peek')
+        if shared is not None:
+            allowed, _, wait_seconds = shared
+            return (True, None) if allowed else (False, wait_seconds)
+
         current_usage = self.get_tokens_last_minute()
 
         if current_usage + estimated_tokens <= RateLimitConfig.MAX_TOKENS_PER_MINUTE:
@@ -129,32 +158,40 @@ class AsyncRequestManager:
     2. Celery task queue for async execution
     3. Multi-model fallback with health tracking
     4. Token-aware request scheduling
-    5. Circuit breaker pattern for error recovery
+    5. Shared per-model circuit breaker for error recovery
     """
 
     def __init__(self, redis_url: Optional[str] = None):
         """
         Initialize the async request manager
 
-        Note: Redis has been removed - using in-memory rate limiting
+        Request and token budgets use the shared Redis token buckets when
+        available, with in-memory rate limiting as the fallback
         """
-        # Redis removed - using in-memory rate limiting (works fine for single-region deployment)
-        self.redis_available = False
-        self.redis_client = None
-        print("✅ Using in-memory rate limiting (SQS-based deployment)")
+        self.distributed = get_distributed_rate_limiter()
+        self.redis_available = self.distributed is not None
+        if self.redis_available:
+            print("✅ Using Redis token-bucket rate limiting (shared by all processes)")
+        else:
+            print("✅ Using in-memory rate limiting (per process)")
 
         # Rate limiting state
         self.request_timestamps = deque()
-        self.token_counter = TokenCounter()
+        self.token_counter = TokenCounter(self.distributed)
         self.active_requests = 0
         self.lock = threading.Lock()
-
-        # Model health tracking
+        # Set by wait_for_rate_limit when it already took the request token;
+        # 'active' marks a thread running inside admitted() / preadmitted()
+        self._admission = threading.local()
+        # Serializes check-and-record in acquire() so two threads cannot
+        # both pass the same free slot
+        self.admission_lock = threading.Lock()
+
+        # Per-process request counters per model; circuit state (closed /
+        # open / half-open) is shared by all processes in the circuit breaker
+        self.circuit_breaker = get_circuit_breaker()
         self.model_health = defaultdict(lambda: {
-            'status': 'healthy',
-            'consecutive_errors': 0,
             'last_error_time': None,
-            'cooldown_until': None,
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0
@@ -168,7 +205,6 @@ class AsyncRequestManager:
             'throttled_requests': 0,
             'retried_requests': 0,
             'fallback_used': 0,
-            'circuit_breaker_trips': 0,
             'avg_response_time': 0.0
         }
         self.stats_lock = threading.Lock()
@@ -178,6 +214,13 @@ class AsyncRequestManager:
         print(f"   Max concurrent: {RateLimitConfig.MAX_CONCURRENT_REQUESTS}")
         print(f"   Max tokens/min: {RateLimitConfig.MAX_TOKENS_PER_MINUTE}")
 
+    def _request_bucket(self, mode: str):
+        """Shared requests-per-minute bucket operation (None = use in-memory)"""
+        if self.distributed is None:
+            return None
+        return self.distributed.call('requests', RateLimitConfig.MAX_REQUESTS_PER_MINUTE,
+                                     RateLimitConfig.MAX_REQUESTS_PER_MINUTE, 1, mode)
+
     def can_make_request(self) -> Tuple[bool, Optional[str]]:
         """
         Check if a new request can be made based on rate limits
@@ -185,12 +228,27 @@ class AsyncRequestManager:
         Returns:
             (can_make, reason)
         """
-        with self.lock:
-            now = datetime.now()
+        # Adaptive (AIMD) limit when enabled, static constant otherwise
+        if AIMDConfig.ENABLED:
+            max_concurrent = get_concurrency_controller().get_total_limit()
+        else:
+            max_concurrent = RateLimitConfig.MAX_CONCURRENT_REQUESTS
 
+        with self.lock:
             # Check concurrent request limit
-            if self.active_requests >= RateLimitConfig.MAX_CONCURRENT_REQUESTS:
-                return False, f"Max concurrent requests ({RateLimitConfig.MAX_CONCURRENT_REQUESTS}) reached"
+            if self.active_requests >= max_concurrent:
+                return False, f"Max concurrent requests ({max_concurrent}) reached"
+
+        shared = self._request_bucket('peek')
+        if shared is not None:
+            allowed, _, wait_time = shared
+            if allowed:
+                return True, None
+            return False, f"Rate limit reached, wait {wait_time:.1f}s"
+
+        # In-memory fallback while Redis is unavailable
+        with self.lock:
+            now = datetime.now()
 
             # Clean up old timestamps (> 1 minute old)
             cutoff_time = now - timedelta(minutes=1)
@@ -204,6 +262,53 @@ class AsyncRequestManager:
 
             return True, None
 
+    def try_acquire(self, estimated_tokens: int = 0) -> Tuple[bool, Optional[str], float]:
+        """
+        Non-blocking admission: check every limit and take the request token
+
+        On success the shared request token is already paid for, so the
+        caller must call record_request_start next on the same thread.
+
+        Args:
+            estimated_tokens: Estimated token count for the request
+
+        Returns:
+            (admitted, reason, retry_after_seconds)
+        """
+        # Check request rate limit
+        can_make, reason = self.can_make_request()
+        if not can_make:
+            return False, f"Rate limit: {reason}", 1.0
+
+        # Check token rate limit
+        if estimated_tokens > 0:
+            can_make_tokens, wait_seconds = self.token_counter.can_make_request(estimated_tokens)
+            if not can_make_tokens:
+                return False, f"Token limit: wait {wait_seconds:.1f}s", min(wait_seconds, 5)  # Sleep in chunks
+
+        # Take the request token atomically - another process may have
+        # taken the last one since the check above
+        shared = self._request_bucket('take')
+        if shared is not None:
+            allowed, _, wait_seconds = shared
+            if not allowed:
+                return False, f"Rate limit: wait {wait_seconds:.1f}s", min(max(wait_seconds, 0.1), 5)
+            self._admission.prepaid = True
+
+        return True, None, 0.0
+
+    def cancel_request(self):
+        """Undo record_request_start for a request that will not be sent"""
+        with self.lock:
+            self.active_requests -= 1
+            if self.request_timestamps:
+                self.request_timestamps.pop()
+
+        # Give the request token back
+        if self.distributed is not None:
+            self.distributed.call('requests', RateLimitConfig.MAX_REQUESTS_PER_MINUTE,
+                                  RateLimitConfig.MAX_REQUESTS_PER_MINUTE, -1, 'force')
+
     def wait_for_rate_limit(self, estimated_tokens: int = 0) -> float:
         """
         Wait until rate limits allow the request
@@ -217,25 +322,40 @@ class AsyncRequestManager:
         start_time = time.time()
 
         while True:
-            # Check request rate limit
-            can_make, reason = self.can_make_request()
+            admitted, reason, retry_after = self.try_acquire(estimated_tokens)
+            if admitted:
+                break
+
+            print(f"⏸️ {reason}")
+            time.sleep(retry_after)
 
-            if not can_make:
-                print(f"⏸️ Rate limit: {reason}")
-                time.sleep(1)
-                continue
+        wait_time = time.time() - start_time
+        if wait_time > 1:
+            print(f"⏳ Waited {wait_time:.1f}s for rate limit clearance")
+
+        return wait_time
 
-            # Check token rate limit
-            if estimated_tokens > 0:
-                can_make_tokens, wait_seconds = self.token_counter.can_make_request(estimated_tokens)
+    def acquire(self, estimated_tokens: int = 0) -> float:
+        """
+        Wait for rate-limit clearance and record the request start
+
+        The check and the record happen together under admission_lock; the
+        sleeps between attempts do not hold it.
+
+        Returns:
+            wait_seconds: Time waited (for logging)
+        """
+        start_time = time.time()
 
-                if not can_make_tokens:
-                    print(f"⏸️ Token limit: wait {wait_seconds:.1f}s")
-                    time.sleep(min(wait_seconds, 5))  # Sleep in chunks
-                    continue
+        while True:
+            with self.admission_lock:
+                admitted, reason, retry_after = self.try_acquire(estimated_tokens)
+                if admitted:
+                    self.record_request_start()
+                    break
 
-            # Both checks passed
-            break
+            print(f"⏸️ {reason}")
+            time.sleep(retry_after)
 
         wait_time = time.time() - start_time
         if wait_time > 1:
@@ -243,8 +363,103 @@ class AsyncRequestManager:
 
         return wait_time
 
+    @contextmanager
+    def admitted(self, model_id: str, estimated_tokens: int = 0):
+        """
+        Admit one Bedrock call through the rate limits and record its outcome
+
+        Every Bedrock invocation runs inside this, so all processes charge the
+        shared request and token buckets. Calls nested in an already admitted
+        call on the same thread (see preadmitted) are not charged again.
+
+            with request_manager.admitted(model_id, estimated_tokens) as call:
+                response = runtime.invoke_model(...)
+                call['tokens_used'] = input_tokens + output_tokens
+
+        Yields:
+            Dict whose 'tokens_used' (default: estimated_tokens) is recorded
+        """
+        call = {'tokens_used': estimated_tokens}
+        if getattr(self._admission, 'active', False):
+            yield call
+            return
+
+        self.acquire(estimated_tokens)
+        self._admission.active = True
+        start_time = time.time()
+        try:
+            yield call
+        except BaseException as e:
+            self.record_request_end(
+                success=False,
+                model_id=model_id,
+                duration=time.time() - start_time,
+                tokens_used=call['tokens_used'],
+                error=str(e) or type(e).__name__
+            )
+            raise
+        else:
+            self.record_request_end(
+                success=True,
+                model_id=model_id,
+                duration=time.time() - start_time,
+                tokens_used=call['tokens_used']
+            )
+        finally:
+            self._admission.active = False
+
+    @contextmanager
+    def preadmitted(self):
+        """Run work whose request was already admitted and recorded by the caller"""
+        previous = getattr(self._admission, 'active', False)
+        self._admission.active = True
+        try:
+            yield
+        finally:
+            self._admission.active = previous
+
+    def get_headroom(self) -> Dict[str, Optional[int]]:
+        """
+        Spare capacity under the current limits
+
+        Returns:
+            Dict with free 'concurrent' slots, remaining 'requests_per_minute'
+            and remaining 'tokens_per_minute'
+        """
+        if AIMDConfig.ENABLED:
+            max_concurrent = get_concurrency_controller().get_total_limit()
+        else:
+            max_concurrent = RateLimitConfig.MAX_CONCURRENT_REQUESTS
+
+        with self.lock:
+            now = datetime.now()
+            cutoff_time = now - timedelta(minutes=1)
+            while self.request_timestamps and self.request_timestamps[0] < cutoff_time:
+                self.request_timestamps.popleft()
+
+            concurrent = max(0, int(max_concurrent) - self.active_requests)
+            requests_per_minute = max(0, RateLimitConfig.MAX_REQUESTS_PER_MINUTE - len(self.request_timestamps))
+
+        shared = self._request_bucket('peek')
+        if shared is not None:
+            requests_per_minute = max(0, int(shared[1]))
+
+        tokens_per_minute = self.token_counter.get_remaining_tokens()
+
+        return {
+            'concurrent': concurrent,
+            'requests_per_minute': requests_per_minute,
+            'tokens_per_minute': tokens_per_minute
+        }
+
     def record_request_start(self):
         """Record that a request is starting"""
+        if getattr(self._admission, 'prepaid', False):
+            self._admission.prepaid = False
+        else:
+            # Admitted without try_acquire / wait_for_rate_limit - charge anyway
+            self._request_bucket('force')
+
         with self.lock:
             self.request_timestamps.append(datetime.now())
             self.active_requests += 1
@@ -260,6 +475,9 @@ class AsyncRequestManager:
             duration: Request duration in seconds
             tokens_used: Tokens consumed
             error: Error message if failed
+
+        Circuit breaker outcomes are recorded where Bedrock is actually
+        called, so they are not counted twice here.
         """
         with self.lock:
             self.active_requests -= 1
@@ -287,24 +505,10 @@ class AsyncRequestManager:
 
         if success:
             model_health['successful_requests'] += 1
-            model_health['consecutive_errors'] = 0
-            model_health['status'] = 'healthy'
         else:
             model_health['failed_requests'] += 1
-            model_health['consecutive_errors'] += 1
             model_health['last_error_time'] = datetime.now()
 
-            # Check if circuit breaker should trip
-            if model_health['consecutive_errors'] >= RateLimitConfig.ERROR_THRESHOLD_FOR_CIRCUIT_BREAKER:
-                model_health['status'] = 'circuit_open'
-                cooldown_seconds = RateLimitConfig.THROTTLE_COOLDOWN_SECONDS * model_health['consecutive_errors']
-                model_health['cooldown_until'] = datetime.now() + timedelta(seconds=cooldown_seconds)
-
-                with self.stats_lock:
-                    self.stats['circuit_breaker_trips'] += 1
-
-                print(f"🚫 Circuit breaker opened for {model_id}, cooldown: {cooldown_seconds}s")
-
         # Record token usage
         if tokens_used > 0:
             self.token_counter.add_request(tokens_used)
@@ -313,23 +517,18 @@ class AsyncRequestManager:
         """
         Check if a model is available for use
 
+        Consults the shared circuit breaker; when the circuit is half-open
+        a True answer is the single probe slot, so only call this right
+        before sending the request.
+
         Returns:
             (is_available, reason)
         """
-        health = self.model_health[model_id]
+        return self.circuit_breaker.allow(model_id)
 
-        # Check circuit breaker
-        if health['status'] == 'circuit_open':
-            if health['cooldown_until'] and datetime.now() < health['cooldown_until']:
-                remaining = (health['cooldown_until'] - datetime.now()).total_seconds()
-                return False, f"Circuit breaker open, cooldown: {remaining:.0f}s"
-            else:
-                # Cooldown expired, reset to half-open
-                health['status'] = 'half_open'
-                health['consecutive_errors'] = 0
-                print(f"✅ Circuit breaker half-open for {model_id}, trying again")
-
-        return True, None
+    def would_model_be_available(self, model_id: str) -> bool:
+        """is_model_available without taking the probe slot (for choosing models)"""
+        return self.circuit_breaker.would_allow(model_id)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get current statistics"""
@@ -341,8 +540,18 @@ class AsyncRequestManager:
         stats['tokens_last_minute'] = self.token_counter.get_tokens_last_minute()
         stats['model_health'] = {}
 
-        for model_id, health in self.model_health.items():
-            stats['model_health'][model_id] = health.copy()
+        circuits = self.circuit_breaker.get_states()
+        for model_id in set(self.model_health) | set(circuits):
+            health = self.model_health[model_id].copy()
+            health['circuit'] = circuits.get(model_id) or self.circuit_breaker.get_state(model_id)
+            stats['model_health'][model_id] = health
+
+        circuit_stats = self.circuit_breaker.get_stats()
+        stats['circuit_breaker_trips'] = circuit_stats['trips']
+        stats['circuit_breaker'] = {k: v for k, v in circuit_stats.items() if k != 'models'}
+
+        stats['adaptive_concurrency'] = get_concurrency_controller().get_stats()
+        stats['distributed_rate_limit'] = self.distributed.get_stats() if self.distributed else {'enabled': False}
 
         return stats
 
@@ -350,19 +559,15 @@ class AsyncRequestManager:
         """
         Reset model health tracking (emergency recovery)
 
+        Closes the shared circuit for every process and clears this
+        process's counters.
+
         Args:
             model_id: Specific model to reset, or None for all models
         """
+        self.circuit_breaker.reset(model_id)
         if model_id:
-            self.model_health[model_id] = {
-                'status': 'healthy',
-                'consecutive_errors': 0,
-                'last_error_time': None,
-                'cooldown_until': None,
-                'total_requests': 0,
-                'successful_requests': 0,
-                'failed_requests': 0
-            }
+            self.model_health.pop(model_id, None)
             print(f"🔄 Reset health for {model_id}")
         else:
             self.model_health.clear()
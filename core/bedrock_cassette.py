@@ -0,0 +1,232 @@
+"""
+Bedrock Record/Replay Cassettes for AI-Prism
+Deterministic, network-free benchmarking with production-shaped responses
+
+In record mode every real Bedrock call made through
+AIFeedbackEngine._invoke_bedrock or rq_tasks.invoke_bedrock_model is stored
+with its measured latency in a versioned JSON cassette. In replay mode the
+same calls are answered from the cassette, sleeping for the original latency
+multiplied by a time scale (0 = instant), so parsing, dedup, statistics and
+document generation can be benchmarked repeatably without network or cost.
+
+    BEDROCK_CASSETTE_MODE=record BEDROCK_CASSETTE_PATH=data/cassettes/run1.json
+    BEDROCK_CASSETTE_MODE=replay BEDROCK_CASSETTE_TIME_SCALE=0.5
+
+Interactions are matched on the same content-addressed key as the analysis
+cache (system prompt + user prompt + model id). Repeated identical requests
+replay their recordings in order, cycling when exhausted. Record from a single
+process; concurrent recorders would overwrite each other's file. Disable the
+analysis cache (ANALYSIS_CACHE_ENABLED=false) when benchmarking, otherwise
+cache hits never reach the cassette.
+"""
+
+import os
+import json
+import time
+import copy
+import threading
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional
+
+from core.analysis_cache import make_cache_key
+
+
+CASSETTE_FORMAT_VERSION = 1
+
+
+class CassetteConfig:
+    """
+    Cassette settings (overridable via environment variables)
+    """
+    MODE = os.environ.get('BEDROCK_CASSETTE_MODE', 'off').lower()  # off | record | replay
+    PATH = os.environ.get('BEDROCK_CASSETTE_PATH', 'data/cassettes/bedrock_cassette.json')
+    TIME_SCALE = float(os.environ.get('BEDROCK_CASSETTE_TIME_SCALE', '1.0'))
+    # On a replay miss: 'error' raises, 'live' calls real Bedrock
+    ON_MISS = os.environ.get('BEDROCK_CASSETTE_ON_MISS', 'error').lower()
+
+
+class CassetteMiss(Exception):
+    """No recorded interaction matches a replayed request"""
+
+
+class BedrockCassette:
+    """
+    Records or replays Bedrock interactions for one cassette file
+    """
+
+    def __init__(self, path: str, mode: str, time_scale: float = 1.0, on_miss: str = 'error'):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.time_scale = time_scale
+        self.on_miss = on_miss
+        self.lock = threading.Lock()
+
+        self.interactions: Dict[str, list] = {}
+        self.replay_positions: Dict[str, int] = {}
+        self.stats = {
+            'recorded': 0,
+            'replayed': 0,
+            'misses': 0,
+            'replayed_latency': 0.0
+        }
+
+        if os.path.exists(path):
+            self._load()
+        elif mode == 'replay':
+            raise FileNotFoundError(f"Cassette not found: {path}")
+
+        print(f"📼 Bedrock cassette ({mode}): {path} - {self.interaction_count()} interactions", flush=True)
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        version = data.get('version')
+        if version != CASSETTE_FORMAT_VERSION:
+            raise ValueError(f"Cassette {self.path} has format version {version}, "
+                             f"expected {CASSETTE_FORMAT_VERSION} - re-record it")
+
+        for interaction in data.get('interactions', []):
+            self.interactions.setdefault(interaction['key'], []).append(interaction)
+
+    def _save(self):
+        """Write the cassette atomically (caller holds the lock)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        interactions = [i for recordings in self.interactions.values() for i in recordings]
+        interactions.sort(key=lambda i: i['recorded_at'])
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': CASSETTE_FORMAT_VERSION,
+                'updated_at': datetime.now().isoformat(),
+                'interactions': interactions
+            }, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def interaction_count(self) -> int:
+        with self.lock:
+            return sum(len(recordings) for recordings in self.interactions.values())
+
+    def call(self, source: str, system_prompt: str, user_prompt: str, model_id: str,
+             invoke_fn: Callable[[], Any],
+             should_record: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Record or replay one Bedrock call
+
+        Args:
+            source: Call site label stored with the interaction
+            system_prompt: System prompt sent to the model
+            user_prompt: User prompt sent to the model
+            model_id: Bedrock model id
+            invoke_fn: Performs the real call (record mode / live misses)
+            should_record: Optional predicate rejecting fallback/error results
+
+        Returns:
+            The live or replayed result (must be JSON-serializable)
+        """
+        key = make_cache_key(system_prompt, user_prompt, model_id)
+
+        if self.mode == 'replay':
+            interaction = self._next_recording(key)
+            if interaction is not None:
+                delay = interaction['latency'] * self.time_scale
+                if delay > 0:
+                    time.sleep(delay)
+                with self.lock:
+                    self.stats['replayed'] += 1
+                    self.stats['replayed_latency'] += delay
+                return copy.deepcopy(interaction['response'])
+
+            with self.lock:
+                self.stats['misses'] += 1
+            if self.on_miss != 'live':
+                raise CassetteMiss(f"No recorded {source} interaction for model {model_id} (key {key[:12]})")
+            print(f"📼 Cassette miss for {source} - calling Bedrock live", flush=True)
+            return invoke_fn()
+
+        start_time = time.time()
+        result = invoke_fn()
+        latency = time.time() - start_time
+
+        if should_record is None or should_record(result):
+            self._record(key, source, system_prompt, user_prompt, model_id, result, latency)
+
+        return result
+
+    def _next_recording(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            recordings = self.interactions.get(key)
+            if not recordings:
+                return None
+            position = self.replay_positions.get(key, 0)
+            self.replay_positions[key] = position + 1
+            return recordings[position % len(recordings)]
+
+    def _record(self, key: str, source: str, system_prompt: str, user_prompt: str,
+                model_id: str, result: Any, latency: float):
+        interaction = {
+            'key': key,
+            'source': source,
+            'model_id': model_id,
+            'request': {
+                'system_prompt': system_prompt,
+                'user_prompt': user_prompt
+            },
+            'response': result,
+            'latency': round(latency, 4),
+            'recorded_at': datetime.now().isoformat()
+        }
+
+        with self.lock:
+            self.interactions.setdefault(key, []).append(interaction)
+            self.stats['recorded'] += 1
+            try:
+                self._save()
+            except Exception as e:
+                print(f"⚠️ Could not write cassette {self.path}: {e}", flush=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = self.stats.copy()
+        stats['mode'] = self.mode
+        stats['path'] = self.path
+        stats['time_scale'] = self.time_scale
+        stats['interactions'] = self.interaction_count()
+        stats['replayed_latency'] = round(stats['replayed_latency'], 3)
+        return stats
+
+
+# Global instance
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def get_bedrock_cassette() -> Optional[BedrockCassette]:
+    """
+    Get the process-wide cassette
+
+    Returns:
+        BedrockCassette, or None when BEDROCK_CASSETTE_MODE is 'off'
+    """
+    global _cassette
+
+    if CassetteConfig.MODE not in ('record', 'replay'):
+        return None
+
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = BedrockCassette(
+                CassetteConfig.PATH,
+                CassetteConfig.MODE,
+                time_scale=CassetteConfig.TIME_SCALE,
+                on_miss=CassetteConfig.ON_MISS
+            )
+
+        return _cassette
@@ -0,0 +1,207 @@
+"""
+Shared Bedrock Runtime Client Registry for AI-Prism
+Process-wide pool of boto3 'bedrock-runtime' clients
+
+Creating a boto3 client is expensive: credential resolution, endpoint
+resolution, loading the service model and a fresh TLS handshake on the first
+call. Clients are thread-safe, so one client per (region, config) is shared by
+every request in the process.
+
+Features:
+1. Clients keyed by region + timeout/retry/pool settings
+2. Tunable urllib3 pool size (BEDROCK_MAX_POOL_CONNECTIONS)
+3. Fork-safe: clients that have sent requests are discarded in forked
+   children (RQ work-horses); unused ones preloaded by a warm parent are kept
+4. Counters for client reuse and requests sent per client
+"""
+
+import os
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+
+class BedrockClientConfig:
+    """
+    Default client settings (overridable via environment variables)
+    """
+    DEFAULT_REGION = os.environ.get('BEDROCK_REGION') or os.environ.get('AWS_REGION')
+    MAX_POOL_CONNECTIONS = int(os.environ.get('BEDROCK_MAX_POOL_CONNECTIONS', '50'))
+    CONNECT_TIMEOUT = int(os.environ.get('BEDROCK_CONNECT_TIMEOUT', '10'))
+    READ_TIMEOUT = int(os.environ.get('BEDROCK_READ_TIMEOUT', '180'))
+    MAX_ATTEMPTS = int(os.environ.get('BEDROCK_RETRY_ATTEMPTS', '2'))
+    RETRY_MODE = os.environ.get('BEDROCK_RETRY_MODE', 'standard')
+    ENDPOINT_URL = os.environ.get('BEDROCK_ENDPOINT_URL') or None
+
+
+class BedrockClientRegistry:
+    """
+    Thread-safe registry of shared bedrock-runtime clients
+
+    One boto3 Session is kept per process (sessions are not thread-safe, so
+    client creation happens under the registry lock). After a fork the
+    registry notices the PID change and rebuilds every client that has sent a
+    request, so a child never reuses sockets opened by its parent. Clients
+    that never sent one hold no connections yet, so they and the session
+    (credentials, loaded service models) are kept - this is what lets a warm
+    RQ worker preload the client once for all its work-horses.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._pid = os.getpid()
+        self._session = None
+        self._clients: Dict[Tuple, Any] = {}
+        self._requests_per_client: Dict[Tuple, int] = {}
+
+        self.stats = {
+            'clients_created': 0,
+            'client_reuses': 0,
+            'requests_sent': 0,
+            'fork_resets': 0
+        }
+
+    def get_client(self, region: Optional[str] = None,
+                   connect_timeout: Optional[int] = None,
+                   read_timeout: Optional[int] = None,
+                   max_attempts: Optional[int] = None,
+                   retry_mode: Optional[str] = None,
+                   max_pool_connections: Optional[int] = None,
+                   endpoint_url: Optional[str] = None):
+        """
+        Get (or lazily create) the shared client for this configuration
+
+        Args:
+            region: AWS region (None = boto3 default resolution)
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for a response
+            max_attempts: botocore retry attempts
+            retry_mode: botocore retry mode ('standard', 'adaptive', 'legacy')
+            max_pool_connections: urllib3 connection pool size
+            endpoint_url: Override endpoint (e.g. a local Bedrock stand-in)
+
+        Returns:
+            boto3 bedrock-runtime client
+        """
+        key = (
+            region or BedrockClientConfig.DEFAULT_REGION,
+            connect_timeout or BedrockClientConfig.CONNECT_TIMEOUT,
+            read_timeout or BedrockClientConfig.READ_TIMEOUT,
+            max_attempts or BedrockClientConfig.MAX_ATTEMPTS,
+            retry_mode or BedrockClientConfig.RETRY_MODE,
+            max_pool_connections or BedrockClientConfig.MAX_POOL_CONNECTIONS,
+            endpoint_url or BedrockClientConfig.ENDPOINT_URL
+        )
+
+        with self.lock:
+            self._check_fork()
+
+            client = self._clients.get(key)
+            if client is not None:
+                self.stats['client_reuses'] += 1
+                return client
+
+            client = self._create_client(key)
+            self._clients[key] = client
+            self._requests_per_client[key] = 0
+            self.stats['clients_created'] += 1
+
+            print(f"🔌 Bedrock client created (region: {key[0] or 'default'}, pool: {key[5]})", flush=True)
+            return client
+
+    def _create_client(self, key: Tuple):
+        """Build a new client for a registry key (caller holds the lock)"""
+        region, connect_timeout, read_timeout, max_attempts, retry_mode, pool_size, endpoint_url = key
+
+        if self._session is None:
+            self._session = boto3.session.Session()
+
+        boto_config = Config(
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            retries={'max_attempts': max_attempts, 'mode': retry_mode},
+            max_pool_connections=pool_size,
+            tcp_keepalive=True
+        )
+
+        client_kwargs = {'config': boto_config}
+        if region:
+            client_kwargs['region_name'] = region
+        if endpoint_url:
+            client_kwargs['endpoint_url'] = endpoint_url
+
+        client = self._session.client('bedrock-runtime', **client_kwargs)
+
+        # Count every request sent through this client
+        def _count_request(**kwargs):
+            with self.lock:
+                self.stats['requests_sent'] += 1
+                if key in self._requests_per_client:
+                    self._requests_per_client[key] += 1
+
+        client.meta.events.register('before-send.bedrock-runtime', _count_request)
+        return client
+
+    def _check_fork(self):
+        """Drop inherited clients if we are running in a forked child (caller holds the lock)"""
+        if self._pid != os.getpid():
+            self._drop_used_clients_locked()
+            self.stats['fork_resets'] += 1
+
+    def _drop_used_clients_locked(self):
+        """Keep only clients that never sent a request (no sockets to share)"""
+        self._pid = os.getpid()
+        self._clients = {key: client for key, client in self._clients.items()
+                         if self._requests_per_client.get(key) == 0}
+        self._requests_per_client = {key: 0 for key in self._clients}
+
+    def reset_after_fork(self):
+        """Forget every client inherited from the parent that has open connections"""
+        # The lock may have been held by another thread at fork time
+        self.lock = threading.Lock()
+        self._drop_used_clients_locked()
+        self.stats['fork_resets'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get client reuse statistics"""
+        with self.lock:
+            stats = self.stats.copy()
+            stats['pid'] = self._pid
+            stats['active_clients'] = len(self._clients)
+            stats['clients'] = [
+                {
+                    'region': key[0] or 'default',
+                    'max_pool_connections': key[5],
+                    'endpoint_url': key[6],
+                    'requests_sent': count
+                }
+                for key, count in self._requests_per_client.items()
+            ]
+
+        lookups = stats['clients_created'] + stats['client_reuses']
+        stats['reuse_rate'] = round(stats['client_reuses'] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+# Global instance
+_client_registry = BedrockClientRegistry()
+
+
+def get_bedrock_client(region: Optional[str] = None, **kwargs):
+    """
+    Get the shared bedrock-runtime client for a region/config
+
+    Accepts the same keyword arguments as BedrockClientRegistry.get_client
+    """
+    return _client_registry.get_client(region=region, **kwargs)
+
+
+def get_client_registry() -> BedrockClientRegistry:
+    """Get the global client registry"""
+    return _client_registry
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_client_registry.reset_after_fork)
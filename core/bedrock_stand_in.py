@@ -0,0 +1,437 @@
+"""
+Local Bedrock Stand-in Server for AI-Prism
+Fake bedrock-runtime InvokeModel / InvokeModelWithResponseStream endpoint
+
+Lets the analysis pipeline, fallback logic and rate limiting be load-tested
+on a laptop without touching real Bedrock. The server speaks the same wire
+protocol as bedrock-runtime (REST-JSON errors, AWS event-stream framing for
+streaming), so boto3 clients only need a different endpoint URL:
+
+    python -m core.bedrock_stand_in --port 8089 --latency-median 2.5 --throttle-rate 0.05
+
+    BEDROCK_ENDPOINT_URL=http://127.0.0.1:8089
+    AWS_ACCESS_KEY_ID=test AWS_SECRET_ACCESS_KEY=test   # any value, requests are not verified
+
+Simulated behaviour (all configurable, see StandInConfig / --help):
+1. Latency: fixed, uniform or lognormal time-to-first-token plus output tokens/sec
+2. Throttling: random ThrottlingException rate and/or a hard concurrency quota
+3. Malformed JSON: a fraction of analysis responses are truncated mid-object
+4. Token usage: input/output counts (~4 chars per token) and prompt-cache reads/writes
+
+GET /stats returns request, throttle and token counters.
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import base64
+import random
+import struct
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Tuple
+
+
+class StandInConfig:
+    """
+    Simulation settings (overridable via environment variables or CLI flags)
+    """
+    HOST = os.environ.get('STANDIN_HOST', '127.0.0.1')
+    PORT = int(os.environ.get('STANDIN_PORT', '8089'))
+
+    # Time to first token: 'fixed', 'uniform' or 'lognormal'
+    LATENCY_DISTRIBUTION = os.environ.get('STANDIN_LATENCY_DIST', 'lognormal')
+    LATENCY_MEDIAN = float(os.environ.get('STANDIN_LATENCY_MEDIAN', '1.5'))
+    LATENCY_SIGMA = float(os.environ.get('STANDIN_LATENCY_SIGMA', '0.5'))  # lognormal shape
+    LATENCY_MIN = float(os.environ.get('STANDIN_LATENCY_MIN', '0.5'))      # uniform bounds
+    LATENCY_MAX = float(os.environ.get('STANDIN_LATENCY_MAX', '3.0'))
+    OUTPUT_TOKENS_PER_SECOND = float(os.environ.get('STANDIN_TOKENS_PER_SECOND', '80'))
+
+    # Failure injection
+    THROTTLE_RATE = float(os.environ.get('STANDIN_THROTTLE_RATE', '0.0'))
+    MAX_CONCURRENCY = int(os.environ.get('STANDIN_MAX_CONCURRENCY', '0'))  # 0 = unlimited
+    MALFORMED_JSON_RATE = float(os.environ.get('STANDIN_MALFORMED_RATE', '0.0'))
+
+    # Feedback items per analysis response
+    FEEDBACK_ITEMS_MIN = int(os.environ.get('STANDIN_FEEDBACK_MIN', '2'))
+    FEEDBACK_ITEMS_MAX = int(os.environ.get('STANDIN_FEEDBACK_MAX', '5'))
+
+    SEED = os.environ.get('STANDIN_SEED')
+
+
+def estimate_tokens(text: str) -> int:
+    """Same ~4 characters per token estimate as TokenCounter"""
+    return max(1, len(text or '') // 4)
+
+
+def _text_of(blocks) -> str:
+    """Flatten a system/content field (string or content-block list) to text"""
+    if isinstance(blocks, str):
+        return blocks
+    if isinstance(blocks, list):
+        return ''.join(block.get('text', '') for block in blocks if isinstance(block, dict))
+    return ''
+
+
+def encode_event(payload: Dict[str, Any], event_type: str = 'chunk') -> bytes:
+    """
+    Encode one AWS event-stream message carrying a Bedrock response chunk
+
+    Layout: total length, headers length, prelude CRC, headers, payload, message CRC
+    """
+    body = json.dumps({
+        'bytes': base64.b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+    }).encode('utf-8')
+
+    headers = b''
+    for name, value in ((':event-type', event_type),
+                        (':content-type', 'application/json'),
+                        (':message-type', 'event')):
+        name_bytes = name.encode('utf-8')
+        value_bytes = value.encode('utf-8')
+        headers += struct.pack('!B', len(name_bytes)) + name_bytes
+        headers += struct.pack('!BH', 7, len(value_bytes)) + value_bytes  # 7 = string
+
+    total_length = 12 + len(headers) + len(body) + 4
+    prelude = struct.pack('!II', total_length, len(headers))
+    prelude += struct.pack('!I', zlib.crc32(prelude) & 0xffffffff)
+    message = prelude + headers + body
+    return message + struct.pack('!I', zlib.crc32(message) & 0xffffffff)
+
+
+class BedrockSimulator:
+    """
+    Generates responses and injects latency/throttling/malformed output
+    """
+
+    def __init__(self, config=StandInConfig):
+        self.config = config
+        self.random = random.Random(int(config.SEED) if config.SEED else None)
+        self.random_lock = threading.Lock()
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.cached_prefixes = set()
+
+        self.stats = {
+            'requests': 0,
+            'streaming_requests': 0,
+            'throttled': 0,
+            'throttled_by_quota': 0,
+            'malformed': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'cache_read_input_tokens': 0,
+            'cache_creation_input_tokens': 0,
+            'peak_concurrency': 0
+        }
+
+    def _rand(self) -> float:
+        with self.random_lock:
+            return self.random.random()
+
+    def sample_latency(self) -> float:
+        """Time to first token in seconds"""
+        config = self.config
+        with self.random_lock:
+            if config.LATENCY_DISTRIBUTION == 'fixed':
+                return config.LATENCY_MEDIAN
+            if config.LATENCY_DISTRIBUTION == 'uniform':
+                return self.random.uniform(config.LATENCY_MIN, config.LATENCY_MAX)
+            return self.random.lognormvariate(0, config.LATENCY_SIGMA) * config.LATENCY_MEDIAN
+
+    def admit(self) -> Optional[str]:
+        """Reserve a concurrency slot, or return the throttle reason"""
+        with self.lock:
+            self.stats['requests'] += 1
+
+            if self.config.MAX_CONCURRENCY and self.in_flight >= self.config.MAX_CONCURRENCY:
+                self.stats['throttled'] += 1
+                self.stats['throttled_by_quota'] += 1
+                return 'quota'
+
+            if self.config.THROTTLE_RATE and self._rand() < self.config.THROTTLE_RATE:
+                self.stats['throttled'] += 1
+                return 'random'
+
+            self.in_flight += 1
+            self.stats['peak_concurrency'] = max(self.stats['peak_concurrency'], self.in_flight)
+            return None
+
+    def release(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def build_usage(self, request: Dict[str, Any], output_text: str) -> Dict[str, int]:
+        """Token usage including prompt-cache reads/writes for cacheable system blocks"""
+        system = request.get('system')
+        system_text = _text_of(system)
+        messages_text = ''.join(_text_of(m.get('content')) for m in request.get('messages', []))
+
+        usage = {
+            'input_tokens': estimate_tokens(messages_text),
+            'output_tokens': estimate_tokens(output_text),
+            'cache_read_input_tokens': 0,
+            'cache_creation_input_tokens': 0
+        }
+
+        cacheable = isinstance(system, list) and any(
+            isinstance(block, dict) and block.get('cache_control') for block in system
+        )
+        if cacheable:
+            prefix_hash = hashlib.sha256(system_text.encode('utf-8')).hexdigest()
+            with self.lock:
+                hit = prefix_hash in self.cached_prefixes
+                self.cached_prefixes.add(prefix_hash)
+            usage['cache_read_input_tokens' if hit else 'cache_creation_input_tokens'] = estimate_tokens(system_text)
+        else:
+            usage['input_tokens'] += estimate_tokens(system_text)
+
+        with self.lock:
+            for key, value in usage.items():
+                self.stats[key] += value
+
+        return usage
+
+    def generate_text(self, request: Dict[str, Any]) -> str:
+        """Analysis JSON for analysis prompts, plain text for chat"""
+        system_text = _text_of(request.get('system'))
+        prompt_text = ''.join(_text_of(m.get('content')) for m in request.get('messages', []))
+
+        if 'feedback_items' not in system_text + prompt_text:
+            return (
+                "Based on the Hawkeye framework, the document would benefit from a clearer "
+                "timeline, explicit customer impact figures and preventative actions that each "
+                "have an owner and a due date. Consider cross-checking the root cause against "
+                "the evidence collected during the investigation."
+            )
+
+        section = re.search(r"Analyze the '([^']+)' section", prompt_text)
+        section_name = section.group(1) if section else 'section'
+
+        with self.random_lock:
+            count = self.random.randint(self.config.FEEDBACK_ITEMS_MIN, self.config.FEEDBACK_ITEMS_MAX)
+            confidences = [round(self.random.uniform(0.75, 0.97), 2) for _ in range(count)]
+
+        categories = ['Investigation Process', 'Root Cause', 'Timeline', 'Documentation', 'Customer Impact']
+        items = [
+            {
+                'id': f"standin_{idx + 1}",
+                'type': ['critical', 'important', 'suggestion'][idx % 3],
+                'category': categories[idx % len(categories)],
+                'description': f"{section_name}: finding {idx + 1} lacks supporting evidence and measurable detail",
+                'suggestion': f"Add concrete data points and sources for finding {idx + 1}",
+                'example': 'e.g. "Impacted 1,250 orders between 09:10 and 11:45 UTC"',
+                'questions': ['What evidence supports this?', 'Who verified it?'],
+                'hawkeye_refs': [(idx % 20) + 1],
+                'risk_level': ['High', 'Medium', 'Low'][idx % 3],
+                'confidence': confidences[idx]
+            }
+            for idx in range(count)
+        ]
+        text = json.dumps({'feedback_items': items}, indent=2)
+
+        if self.config.MALFORMED_JSON_RATE and self._rand() < self.config.MALFORMED_JSON_RATE:
+            with self.lock:
+                self.stats['malformed'] += 1
+            text = text[:len(text) // 2]
+
+        return text
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = self.stats.copy()
+            stats['in_flight'] = self.in_flight
+        return stats
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """HTTP handler implementing the bedrock-runtime invoke routes"""
+
+    protocol_version = 'HTTP/1.1'
+    simulator: BedrockSimulator = None
+
+    ROUTE = re.compile(r'^/model/(?P<model_id>[^/]+)/(?P<action>invoke|invoke-with-response-stream)$')
+
+    def log_message(self, format, *args):
+        # Keep the console readable under load
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, error_type: str, message: str):
+        self._send_json(status, {'message': message}, {'x-amzn-ErrorType': f'{error_type}:http://internal.amazon.com/coral/com.amazon.bedrock/'})
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._send_json(200, self.simulator.get_stats())
+        elif self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_error(404, 'ResourceNotFoundException', f'Unknown path {self.path}')
+
+    def do_POST(self):
+        match = self.ROUTE.match(self.path.split('?')[0])
+        length = int(self.headers.get('Content-Length') or 0)
+        raw_body = self.rfile.read(length) if length else b''
+
+        if not match:
+            self._send_error(404, 'ResourceNotFoundException', f'Unknown path {self.path}')
+            return
+
+        try:
+            request = json.loads(raw_body or b'{}')
+        except ValueError:
+            self._send_error(400, 'ValidationException', 'Malformed input request, please reformat your input and try again.')
+            return
+
+        model_id = match.group('model_id')
+        streaming = match.group('action') == 'invoke-with-response-stream'
+
+        throttle_reason = self.simulator.admit()
+        if throttle_reason:
+            self._send_error(429, 'ThrottlingException', 'Too many requests, please wait before trying again.')
+            return
+
+        try:
+            if streaming:
+                self._invoke_stream(model_id, request)
+            else:
+                self._invoke(model_id, request)
+        finally:
+            self.simulator.release()
+
+    def _invoke(self, model_id: str, request: Dict[str, Any]):
+        text = self.simulator.generate_text(request)
+        usage = self.simulator.build_usage(request, text)
+
+        time.sleep(self.simulator.sample_latency() +
+                   usage['output_tokens'] / self.simulator.config.OUTPUT_TOKENS_PER_SECOND)
+
+        self._send_json(200, {
+            'id': f"msg_standin_{int(time.time() * 1000)}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': model_id,
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn',
+            'usage': usage
+        }, {
+            'x-amzn-bedrock-input-token-count': str(usage['input_tokens']),
+            'x-amzn-bedrock-output-token-count': str(usage['output_tokens'])
+        })
+
+    def _invoke_stream(self, model_id: str, request: Dict[str, Any]):
+        with self.simulator.lock:
+            self.simulator.stats['streaming_requests'] += 1
+
+        text = self.simulator.generate_text(request)
+        usage = self.simulator.build_usage(request, text)
+        input_usage = {k: v for k, v in usage.items() if k != 'output_tokens'}
+
+        time.sleep(self.simulator.sample_latency())
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/vnd.amazon.eventstream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        def write_event(payload):
+            data = encode_event(payload)
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+            self.wfile.flush()
+
+        write_event({'type': 'message_start', 'message': {
+            'id': f"msg_standin_{int(time.time() * 1000)}", 'type': 'message', 'role': 'assistant',
+            'model': model_id, 'content': [], 'usage': dict(input_usage, output_tokens=1)
+        }})
+        write_event({'type': 'content_block_start', 'index': 0, 'content_block': {'type': 'text', 'text': ''}})
+
+        # ~4 characters per token, paced at OUTPUT_TOKENS_PER_SECOND
+        delta_size = 16
+        delay = (delta_size / 4) / self.simulator.config.OUTPUT_TOKENS_PER_SECOND
+        for start in range(0, len(text), delta_size):
+            write_event({'type': 'content_block_delta', 'index': 0,
+                         'delta': {'type': 'text_delta', 'text': text[start:start + delta_size]}})
+            time.sleep(delay)
+
+        write_event({'type': 'content_block_stop', 'index': 0})
+        write_event({'type': 'message_delta', 'delta': {'stop_reason': 'end_turn'},
+                     'usage': {'output_tokens': usage['output_tokens']}})
+        write_event({'type': 'message_stop'})
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def create_server(host: Optional[str] = None, port: Optional[int] = None,
+                  config=StandInConfig) -> Tuple[ThreadingHTTPServer, BedrockSimulator]:
+    """
+    Build (but do not start) a stand-in server
+
+    Returns:
+        (server, simulator) - call server.serve_forever() to run it
+    """
+    simulator = BedrockSimulator(config)
+    handler = type('BoundStandInHandler', (StandInHandler,), {'simulator': simulator})
+    server = ThreadingHTTPServer((host or config.HOST, port if port is not None else config.PORT), handler)
+    server.daemon_threads = True
+    return server, simulator
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Bedrock stand-in server for load testing')
+    parser.add_argument('--host', default=StandInConfig.HOST)
+    parser.add_argument('--port', type=int, default=StandInConfig.PORT)
+    parser.add_argument('--latency-dist', choices=['fixed', 'uniform', 'lognormal'],
+                        default=StandInConfig.LATENCY_DISTRIBUTION)
+    parser.add_argument('--latency-median', type=float, default=StandInConfig.LATENCY_MEDIAN)
+    parser.add_argument('--latency-sigma', type=float, default=StandInConfig.LATENCY_SIGMA)
+    parser.add_argument('--latency-min', type=float, default=StandInConfig.LATENCY_MIN)
+    parser.add_argument('--latency-max', type=float, default=StandInConfig.LATENCY_MAX)
+    parser.add_argument('--tokens-per-second', type=float, default=StandInConfig.OUTPUT_TOKENS_PER_SECOND)
+    parser.add_argument('--throttle-rate', type=float, default=StandInConfig.THROTTLE_RATE)
+    parser.add_argument('--max-concurrency', type=int, default=StandInConfig.MAX_CONCURRENCY)
+    parser.add_argument('--malformed-rate', type=float, default=StandInConfig.MALFORMED_JSON_RATE)
+    parser.add_argument('--seed', default=StandInConfig.SEED)
+    args = parser.parse_args()
+
+    StandInConfig.LATENCY_DISTRIBUTION = args.latency_dist
+    StandInConfig.LATENCY_MEDIAN = args.latency_median
+    StandInConfig.LATENCY_SIGMA = args.latency_sigma
+    StandInConfig.LATENCY_MIN = args.latency_min
+    StandInConfig.LATENCY_MAX = args.latency_max
+    StandInConfig.OUTPUT_TOKENS_PER_SECOND = args.tokens_per_second
+    StandInConfig.THROTTLE_RATE = args.throttle_rate
+    StandInConfig.MAX_CONCURRENCY = args.max_concurrency
+    StandInConfig.MALFORMED_JSON_RATE = args.malformed_rate
+    StandInConfig.SEED = args.seed
+
+    server, _ = create_server(args.host, args.port)
+
+    print(f"🧪 Bedrock stand-in listening on http://{args.host}:{args.port}")
+    print(f"   Latency: {args.latency_dist} (median {args.latency_median}s), {args.tokens_per_second} tokens/s")
+    print(f"   Throttle rate: {args.throttle_rate:.0%}, max concurrency: {args.max_concurrency or 'unlimited'}")
+    print(f"   Malformed JSON rate: {args.malformed_rate:.0%}")
+    print(f"   Point the app at it with BEDROCK_ENDPOINT_URL=http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Stand-in stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
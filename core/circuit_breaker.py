@@ -0,0 +1,481 @@
+"""
+Shared Per-Model Circuit Breaker for AI-Prism
+Closed / open / half-open state per Bedrock model id, shared through Redis
+
+Every process used to keep its own consecutive-error count and cooldown in
+AsyncRequestManager.model_health, so during an outage each Flask process and
+RQ worker rediscovered it separately, each waiting out 180s+ timeouts, and
+/reset_model_cooldowns only reset the process that served it. The breaker
+state now lives in a Redis hash per model, updated by one Lua script:
+
+    closed    - requests flow; FAILURE_THRESHOLD consecutive failures open it
+    open      - requests are refused until OPEN_SECONDS have passed
+    half_open - exactly one probe request is admitted (leased for
+                PROBE_TIMEOUT_SECONDS); success closes the circuit, failure
+                re-opens it with the open period doubled (up to MAX_OPEN_SECONDS)
+
+allow() both checks and, in half-open, takes the probe lease, so callers must
+only call it right before they send the request; would_allow() answers the
+same question without taking anything. A caller that was admitted but never
+sends (or abandons) the request hands the lease back with release(). When
+Redis is unreachable the same state machine runs in process memory until
+Redis is retried.
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple, Union
+
+from core.adaptive_concurrency import SlotTimeoutError, is_throttling_error
+
+
+class CircuitBreakerConfig:
+    """
+    Circuit breaker settings (overridable via environment variables)
+    """
+    REDIS_ENABLED = os.environ.get('CIRCUIT_BREAKER_REDIS_ENABLED', 'true').lower() == 'true'
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    KEY_PREFIX = os.environ.get('CIRCUIT_BREAKER_PREFIX', 'aiprism:circuit:')
+    # Consecutive failures that open a closed circuit
+    FAILURE_THRESHOLD = int(os.environ.get('CIRCUIT_BREAKER_FAILURE_THRESHOLD', '5'))
+    # First open period; doubled after each failed probe
+    OPEN_SECONDS = float(os.environ.get('CIRCUIT_BREAKER_OPEN_SECONDS', '60'))
+    MAX_OPEN_SECONDS = float(os.environ.get('CIRCUIT_BREAKER_MAX_OPEN_SECONDS', '600'))
+    # Probe lease - longer than a Bedrock call with retries, so a slow probe
+    # is not joined by a second one
+    PROBE_TIMEOUT_SECONDS = float(os.environ.get('CIRCUIT_BREAKER_PROBE_TIMEOUT_SECONDS', '300'))
+    # Seconds to stay on in-memory state after a Redis error
+    RETRY_SECONDS = float(os.environ.get('CIRCUIT_BREAKER_RETRY_SECONDS', '30'))
+    SOCKET_TIMEOUT = float(os.environ.get('CIRCUIT_BREAKER_SOCKET_TIMEOUT', '0.5'))
+
+
+STATE_KEY_TTL_SECONDS = 86400
+
+# Errors caused by the request itself - the model answered, so they count as success
+REQUEST_ERROR_MARKERS = ('validationexception', 'malformed', 'input is too long')
+
+
+class CircuitOpenError(Exception):
+    """Raised when a model is skipped because its circuit is open"""
+
+
+# KEYS[1] = model state hash, KEYS[2] = set of known model ids
+# ARGV = op ('allow', 'success', 'failure', 'release', 'peek'), model id, failure
+#        threshold, open seconds, max open seconds, probe timeout, key ttl
+# Returns {allowed, state, consecutive failures, seconds until retry, trips, tripped}
+CIRCUIT_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+
+local op = ARGV[1]
+local threshold = tonumber(ARGV[3])
+local base_open = tonumber(ARGV[4])
+local max_open = tonumber(ARGV[5])
+local probe_timeout = tonumber(ARGV[6])
+
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local h = redis.call('HMGET', KEYS[1], 'state', 'failures', 'open_until', 'open_seconds', 'probe_until', 'trips')
+local state = h[1] or 'closed'
+local failures = tonumber(h[2]) or 0
+local open_until = tonumber(h[3]) or 0
+local open_seconds = tonumber(h[4]) or base_open
+local probe_until = tonumber(h[5]) or 0
+local trips = tonumber(h[6]) or 0
+local allowed = 1
+local tripped = 0
+
+-- 'peek' evaluates the same admission as 'allow' but is never written back
+if op == 'allow' or op == 'peek' then
+    if state == 'open' then
+        if now < open_until then
+            allowed = 0
+        else
+            state = 'half_open'
+            probe_until = now + probe_timeout
+        end
+    elseif state == 'half_open' then
+        if now < probe_until then
+            allowed = 0
+        else
+            probe_until = now + probe_timeout
+        end
+    end
+elseif op == 'success' then
+    state = 'closed'
+    failures = 0
+    open_seconds = base_open
+    probe_until = 0
+elseif op == 'release' then
+    if state == 'half_open' then
+        probe_until = 0
+    end
+elseif op == 'failure' then
+    failures = failures + 1
+    if state == 'half_open' then
+        open_seconds = math.min(max_open, open_seconds * 2)
+        state = 'open'
+        open_until = now + open_seconds
+        probe_until = 0
+        trips = trips + 1
+        tripped = 1
+    elseif state == 'closed' and failures >= threshold then
+        open_seconds = base_open
+        state = 'open'
+        open_until = now + open_seconds
+        trips = trips + 1
+        tripped = 1
+    end
+end
+
+if op ~= 'peek' then
+    redis.call('HSET', KEYS[1], 'state', state, 'failures', failures, 'open_until', tostring(open_until),
+               'open_seconds', tostring(open_seconds), 'probe_until', tostring(probe_until), 'trips', trips)
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[7]))
+    redis.call('SADD', KEYS[2], ARGV[2])
+end
+
+local retry_in = 0
+if state == 'open' then
+    retry_in = math.max(0, open_until - now)
+elseif state == 'half_open' and allowed == 0 then
+    retry_in = math.max(0, probe_until - now)
+end
+
+return {allowed, state, failures, tostring(retry_in), trips, tripped}
+"""
+
+
+def _new_record() -> Dict[str, Any]:
+    return {
+        'state': 'closed',
+        'failures': 0,
+        'open_until': 0.0,
+        'open_seconds': CircuitBreakerConfig.OPEN_SECONDS,
+        'probe_until': 0.0,
+        'trips': 0
+    }
+
+
+def _apply_local(record: Dict[str, Any], op: str, now: float) -> Tuple[bool, bool]:
+    """In-memory copy of CIRCUIT_SCRIPT's transitions; returns (allowed, tripped)"""
+    allowed = True
+    tripped = False
+
+    if op in ('allow', 'peek'):
+        if record['state'] == 'open':
+            if now < record['open_until']:
+                allowed = False
+            else:
+                record['state'] = 'half_open'
+                record['probe_until'] = now + CircuitBreakerConfig.PROBE_TIMEOUT_SECONDS
+        elif record['state'] == 'half_open':
+            if now < record['probe_until']:
+                allowed = False
+            else:
+                record['probe_until'] = now + CircuitBreakerConfig.PROBE_TIMEOUT_SECONDS
+
+    elif op == 'success':
+        record.update(state='closed', failures=0, probe_until=0.0,
+                      open_seconds=CircuitBreakerConfig.OPEN_SECONDS)
+
+    elif op == 'release':
+        if record['state'] == 'half_open':
+            record['probe_until'] = 0.0
+
+    elif op == 'failure':
+        record['failures'] += 1
+        if record['state'] == 'half_open':
+            record['open_seconds'] = min(CircuitBreakerConfig.MAX_OPEN_SECONDS, record['open_seconds'] * 2)
+            record.update(state='open', open_until=now + record['open_seconds'], probe_until=0.0)
+            record['trips'] += 1
+            tripped = True
+        elif record['state'] == 'closed' and record['failures'] >= CircuitBreakerConfig.FAILURE_THRESHOLD:
+            record.update(state='open', open_until=now + CircuitBreakerConfig.OPEN_SECONDS,
+                          open_seconds=CircuitBreakerConfig.OPEN_SECONDS)
+            record['trips'] += 1
+            tripped = True
+
+    return allowed, tripped
+
+
+def _retry_in(record: Dict[str, Any], allowed: bool, now: float) -> float:
+    if record['state'] == 'open':
+        return max(0.0, record['open_until'] - now)
+    if record['state'] == 'half_open' and not allowed:
+        return max(0.0, record['probe_until'] - now)
+    return 0.0
+
+
+def is_model_failure(error: Optional[str]) -> bool:
+    """False for errors caused by the request rather than the model"""
+    error = (error or '').lower()
+    return not any(marker in error for marker in REQUEST_ERROR_MARKERS)
+
+
+def is_capacity_error(error: Union[Exception, str, None]) -> bool:
+    """
+    True for throttling and local concurrency-slot timeouts
+
+    Neither says anything about the model's health: AIMD raises concurrency
+    until Bedrock throttles on purpose, and a slot timeout never reached it.
+    """
+    if error is None:
+        return False
+    return isinstance(error, SlotTimeoutError) or is_throttling_error(error)
+
+
+class CircuitBreaker:
+    """
+    Per-model circuit breakers shared through Redis, with in-memory fallback
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, shared: bool = True):
+        self.redis_url = redis_url or CircuitBreakerConfig.REDIS_URL
+        self.lock = threading.Lock()
+        self._client = None
+        self._script = None
+        # Never try Redis when not shared
+        self._down_until = 0.0 if shared else float('inf')
+
+        # Fallback state while Redis is unavailable
+        self.local_records = {}
+
+        self.stats = {
+            'allowed': 0,
+            'rejected': 0,
+            'probes': 0,
+            'trips': 0,
+            'redis_errors': 0
+        }
+
+    def _get_script(self):
+        """Lazily connect and register the Lua script (caller holds the lock)"""
+        if self._script is None:
+            from redis import Redis
+
+            self._client = Redis.from_url(
+                self.redis_url,
+                socket_timeout=CircuitBreakerConfig.SOCKET_TIMEOUT,
+                socket_connect_timeout=CircuitBreakerConfig.SOCKET_TIMEOUT
+            )
+            self._script = self._client.register_script(CIRCUIT_SCRIPT)
+        return self._script
+
+    def is_shared(self) -> bool:
+        """True while state is read from and written to Redis"""
+        return time.time() >= self._down_until
+
+    def _run(self, op: str, model_id: str) -> Tuple[bool, str, int, float, int, bool]:
+        """Apply one operation; returns (allowed, state, failures, retry_in, trips, tripped)"""
+        if self.is_shared():
+            try:
+                with self.lock:
+                    script = self._get_script()
+                allowed, state, failures, retry_in, trips, tripped = script(
+                    keys=[f"{CircuitBreakerConfig.KEY_PREFIX}{model_id}", f"{CircuitBreakerConfig.KEY_PREFIX}models"],
+                    args=[op, model_id, CircuitBreakerConfig.FAILURE_THRESHOLD, CircuitBreakerConfig.OPEN_SECONDS,
+                          CircuitBreakerConfig.MAX_OPEN_SECONDS, CircuitBreakerConfig.PROBE_TIMEOUT_SECONDS,
+                          STATE_KEY_TTL_SECONDS]
+                )
+                state = state.decode('utf-8') if isinstance(state, bytes) else state
+                return (bool(int(allowed)), state, int(failures), float(retry_in),
+                        int(trips), bool(int(tripped)))
+
+            except Exception as e:
+                with self.lock:
+                    self.stats['redis_errors'] += 1
+                    self._down_until = time.time() + CircuitBreakerConfig.RETRY_SECONDS
+                print(f"⚠️ Shared circuit breaker unavailable, using in-memory state "
+                      f"for {CircuitBreakerConfig.RETRY_SECONDS:.0f}s: {e}")
+
+        with self.lock:
+            now = time.time()
+            record = self.local_records.setdefault(model_id, _new_record())
+            if op == 'peek':
+                record = dict(record)
+            allowed, tripped = _apply_local(record, op, now)
+            return (allowed, record['state'], record['failures'], _retry_in(record, allowed, now),
+                    record['trips'], tripped)
+
+    def allow(self, model_id: str) -> Tuple[bool, Optional[str]]:
+        """
+        Admit a request to model_id
+
+        In half-open this takes the single probe lease, so only call it right
+        before sending the request.
+
+        Returns:
+            (allowed, reason)
+        """
+        allowed, state, _, retry_in, _, _ = self._run('allow', model_id)
+
+        with self.lock:
+            self.stats['allowed' if allowed else 'rejected'] += 1
+            if allowed and state == 'half_open':
+                self.stats['probes'] += 1
+
+        if allowed:
+            if state == 'half_open':
+                print(f"🩺 Circuit half-open for {model_id}, sending probe request")
+            return True, None
+        if state == 'half_open':
+            return False, f"Circuit half-open, probe in flight ({retry_in:.0f}s lease left)"
+        return False, f"Circuit breaker open, cooldown: {retry_in:.0f}s"
+
+    def would_allow(self, model_id: str) -> bool:
+        """True if allow() would admit a request right now (takes nothing)"""
+        return self._run('peek', model_id)[0]
+
+    def release(self, model_id: str):
+        """
+        Hand back the half-open probe lease without recording an outcome
+
+        For requests admitted by allow() that were then abandoned (e.g. the
+        losing side of a hedge), so the next request can probe immediately
+        instead of waiting out PROBE_TIMEOUT_SECONDS.
+        """
+        self._run('release', model_id)
+
+    def record_success(self, model_id: str):
+        """A request to model_id succeeded - closes the circuit"""
+        self._run('success', model_id)
+
+    def record_failure(self, model_id: str, error: Union[Exception, str, None] = None):
+        """
+        A request to model_id failed
+
+        Errors caused by the request itself (validation, oversized input)
+        prove the model is up and are recorded as success. Throttling and
+        slot timeouts are not recorded at all (a held probe lease is handed
+        back).
+        """
+        if is_capacity_error(error):
+            self.release(model_id)
+            return
+
+        if not is_model_failure(str(error) if error is not None else None):
+            self.record_success(model_id)
+            return
+
+        _, _, failures, retry_in, _, tripped = self._run('failure', model_id)
+        if tripped:
+            with self.lock:
+                self.stats['trips'] += 1
+            print(f"🚫 Circuit open for {model_id} after {failures} consecutive failures, "
+                  f"retry in {retry_in:.0f}s")
+
+    @contextmanager
+    def guard(self, model_id: str):
+        """
+        Admit one request to model_id and record its outcome
+
+        Raises:
+            CircuitOpenError: The circuit refuses requests right now
+        """
+        allowed, reason = self.allow(model_id)
+        if not allowed:
+            raise CircuitOpenError(f"{model_id} skipped: {reason}")
+
+        try:
+            yield
+        except Exception as e:
+            self.record_failure(model_id, e)
+            raise
+        except BaseException:
+            # Abandoned (e.g. GeneratorExit when a stream's client disconnects):
+            # no outcome, but don't keep a probe lease for PROBE_TIMEOUT_SECONDS
+            self.release(model_id)
+            raise
+        self.record_success(model_id)
+
+    def get_state(self, model_id: str) -> Dict[str, Any]:
+        """Current state of one model's circuit"""
+        _, state, failures, retry_in, trips, _ = self._run('peek', model_id)
+        return {
+            'state': state,
+            'consecutive_failures': failures,
+            'retry_in_seconds': round(retry_in, 1),
+            'trips': trips
+        }
+
+    def _shared_client(self):
+        """Redis client, or None while running on in-memory state"""
+        if not self.is_shared():
+            return None
+        with self.lock:
+            self._get_script()
+            return self._client
+
+    def _known_models(self):
+        with self.lock:
+            models = set(self.local_records.keys())
+
+        try:
+            client = self._shared_client()
+            if client is not None:
+                for model_id in client.smembers(f"{CircuitBreakerConfig.KEY_PREFIX}models"):
+                    models.add(model_id.decode('utf-8') if isinstance(model_id, bytes) else model_id)
+        except Exception as e:
+            print(f"⚠️ Could not list circuit breakers: {e}")
+        return sorted(models)
+
+    def get_states(self) -> Dict[str, Dict[str, Any]]:
+        """State of every model seen so far, keyed by model id"""
+        return {model_id: self.get_state(model_id) for model_id in self._known_models()}
+
+    def reset(self, model_id: Optional[str] = None):
+        """
+        Close circuits for every process (emergency recovery)
+
+        Args:
+            model_id: Specific model to reset, or None for all models
+        """
+        model_ids = [model_id] if model_id else self._known_models()
+
+        with self.lock:
+            for mid in model_ids:
+                self.local_records.pop(mid, None)
+
+        if model_ids:
+            try:
+                client = self._shared_client()
+                if client is not None:
+                    client.delete(*[f"{CircuitBreakerConfig.KEY_PREFIX}{mid}" for mid in model_ids])
+            except Exception as e:
+                print(f"⚠️ Could not reset shared circuit breakers: {e}")
+
+        print(f"🔄 Reset circuit breaker for {model_id or 'all models'}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = self.stats.copy()
+        stats['shared'] = self.is_shared()
+        stats['failure_threshold'] = CircuitBreakerConfig.FAILURE_THRESHOLD
+        stats['models'] = self.get_states()
+        return stats
+
+
+# Global instance
+_circuit_breaker = None
+_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get the process-wide circuit breaker"""
+    global _circuit_breaker
+
+    with _breaker_lock:
+        if _circuit_breaker is None:
+            shared = CircuitBreakerConfig.REDIS_ENABLED
+            if shared:
+                try:
+                    import redis  # noqa: F401
+                except ImportError:
+                    print("⚠️ redis package not installed - circuit breaker state stays per-process")
+                    shared = False
+            _circuit_breaker = CircuitBreaker(shared=shared)
+
+        return _circuit_breaker
@@ -0,0 +1,198 @@
+"""
+Distributed Token-Bucket Rate Limiter for AI-Prism
+Shares the Bedrock request and token budgets across every process
+
+The Flask app and each RQ worker used to track requests/tokens per minute in
+their own memory, so N processes together sent up to N times the quota and
+were throttled collectively. Here each budget is a token bucket stored in
+Redis and updated by a Lua script, so a check-and-consume is atomic across
+all processes:
+
+    requests bucket - capacity MAX_REQUESTS_PER_MINUTE, refills capacity/60 per second
+    tokens bucket   - capacity MAX_TOKENS_PER_MINUTE, refills capacity/60 per second
+
+Buckets may go negative when usage is recorded after the fact (actual tokens,
+hedged requests); the debt delays the next admissions. When Redis is
+unreachable every call returns None and AsyncRequestManager falls back to its
+in-memory limits, retrying Redis after RETRY_SECONDS.
+"""
+
+import os
+import time
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+
+class DistributedRateLimitConfig:
+    """
+    Distributed limiter settings (overridable via environment variables)
+    """
+    ENABLED = os.environ.get('DISTRIBUTED_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    KEY_PREFIX = os.environ.get('DISTRIBUTED_RATE_LIMIT_PREFIX', 'aiprism:ratelimit:')
+    # Seconds to stay on the in-memory fallback after a Redis error
+    RETRY_SECONDS = float(os.environ.get('DISTRIBUTED_RATE_LIMIT_RETRY_SECONDS', '30'))
+    SOCKET_TIMEOUT = float(os.environ.get('DISTRIBUTED_RATE_LIMIT_SOCKET_TIMEOUT', '0.5'))
+
+
+# KEYS[1] = bucket hash
+# ARGV = capacity, refill per second, cost, mode
+#   peek  - report only
+#   take  - consume if enough tokens
+#   force - always consume (may go negative)
+# Returns {allowed, tokens remaining, seconds until cost is available}
+TOKEN_BUCKET_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local mode = ARGV[4]
+
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = tokens >= cost
+
+if mode == 'force' or (mode == 'take' and allowed) then
+    tokens = tokens - cost
+end
+
+if mode ~= 'peek' then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) * 2 + 1)
+end
+
+local wait = 0
+if not allowed then
+    wait = (cost - tokens) / rate
+end
+
+return {allowed and 1 or 0, tostring(tokens), tostring(wait)}
+"""
+
+
+class DistributedRateLimiter:
+    """
+    Redis token buckets shared by all processes, with outage detection
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url or DistributedRateLimitConfig.REDIS_URL
+        self.lock = threading.Lock()
+        self._client = None
+        self._script = None
+        self._down_until = 0.0
+
+        self.stats = {
+            'calls': 0,
+            'denied': 0,
+            'errors': 0,
+            'fallback_calls': 0
+        }
+
+    def _get_script(self):
+        """Lazily connect and register the Lua script (caller holds the lock)"""
+        if self._script is None:
+            from redis import Redis
+
+            self._client = Redis.from_url(
+                self.redis_url,
+                socket_timeout=DistributedRateLimitConfig.SOCKET_TIMEOUT,
+                socket_connect_timeout=DistributedRateLimitConfig.SOCKET_TIMEOUT
+            )
+            self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+        return self._script
+
+    def is_available(self) -> bool:
+        """False while in the post-error fallback window"""
+        return time.time() >= self._down_until
+
+    def call(self, bucket: str, capacity: float, per_minute: float, cost: float,
+             mode: str) -> Optional[Tuple[bool, float, float]]:
+        """
+        Run one bucket operation
+
+        Args:
+            bucket: Bucket name ('requests', 'tokens')
+            capacity: Bucket size
+            per_minute: Refill per minute
+            cost: Tokens requested
+            mode: 'peek', 'take' or 'force'
+
+        Returns:
+            (allowed, remaining, wait_seconds), or None when Redis is
+            unavailable and the caller should use its in-memory limits
+        """
+        if not self.is_available():
+            with self.lock:
+                self.stats['fallback_calls'] += 1
+            return None
+
+        try:
+            with self.lock:
+                script = self._get_script()
+                self.stats['calls'] += 1
+
+            allowed, remaining, wait = script(
+                keys=[f"{DistributedRateLimitConfig.KEY_PREFIX}{bucket}"],
+                args=[capacity, per_minute / 60.0, cost, mode]
+            )
+            allowed = bool(int(allowed))
+            if not allowed:
+                with self.lock:
+                    self.stats['denied'] += 1
+            return allowed, float(remaining), float(wait)
+
+        except Exception as e:
+            with self.lock:
+                self.stats['errors'] += 1
+                self._down_until = time.time() + DistributedRateLimitConfig.RETRY_SECONDS
+            print(f"⚠️ Distributed rate limiter unavailable, using in-memory limits "
+                  f"for {DistributedRateLimitConfig.RETRY_SECONDS:.0f}s: {e}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = self.stats.copy()
+        stats['enabled'] = True
+        stats['available'] = self.is_available()
+        return stats
+
+
+# Global instance
+_distributed_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_distributed_rate_limiter() -> Optional[DistributedRateLimiter]:
+    """
+    Get the process-wide distributed limiter
+
+    Returns:
+        DistributedRateLimiter, or None when disabled or redis-py is missing
+    """
+    global _distributed_limiter
+
+    if not DistributedRateLimitConfig.ENABLED:
+        return None
+
+    with _limiter_lock:
+        if _distributed_limiter is None:
+            try:
+                import redis  # noqa: F401
+            except ImportError:
+                print("⚠️ redis package not installed - rate limiting stays per-process")
+                return None
+            _distributed_limiter = DistributedRateLimiter()
+
+        return _distributed_limiter
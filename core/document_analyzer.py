@@ -5,6 +5,9 @@ from datetime import datetime
 from collections import defaultdict
 try:
     import boto3
+    from core.bedrock_client import get_bedrock_client
+    from core.adaptive_concurrency import get_concurrency_controller
+    from core.async_request_manager import get_async_request_manager
 except ImportError:
     boto3 = None
 try:
@@ -297,7 +300,7 @@ MANDATORY COMPLIANCE REQUIREMENTS:
             if boto3 is None:
                 raise ImportError("boto3 not available")
                 
-            runtime = boto3.client('bedrock-runtime')
+            runtime = get_bedrock_client()
             
             body = json.dumps({
                 "anthropic_version": "bedrock-2023-05-31",
@@ -306,12 +309,16 @@ MANDATORY COMPLIANCE REQUIREMENTS:
                 "messages": [{"role": "user", "content": user_prompt}]
             })
             
-            response = runtime.invoke_model(
-                body=body,
-                modelId='anthropic.claude-3-sonnet-20240229-v1:0',
-                accept="application/json",
-                contentType="application/json"
-            )
+            model_id = 'anthropic.claude-3-sonnet-20240229-v1:0'
+            request_manager = get_async_request_manager()
+            with request_manager.admitted(model_id, request_manager.token_counter.estimate_tokens(body)), \
+                    get_concurrency_controller().slot(model_id, runtime.meta.region_name):
+                response = runtime.invoke_model(
+                    body=body,
+                    modelId=model_id,
+                    accept="application/json",
+                    contentType="application/json"
+                )
             
             response_body = json.loads(response.get('body').read())
             return response_body['content'][0]['text']
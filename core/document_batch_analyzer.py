@@ -0,0 +1,257 @@
+"""
+Whole-Document Batch Analyzer for AI-Prism
+Fans out every section of a document in parallel under one aggregate job
+
+Instead of the browser calling /analyze_section once per section (N sequential
+Bedrock round-trips), all sections are submitted together and run on a
+bounded thread pool. Every section call goes through the AsyncRequestManager,
+so concurrency never exceeds the current (adaptive) concurrency limit and the
+per-minute token budget is respected.
+
+Jobs run on threads of the process that accepted them. An on_update callback
+receives the job after every section and at the end, so the caller can
+persist status snapshots (app.py keeps them in the review session) for
+status polls that land on another web worker.
+"""
+
+import time
+import uuid
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Optional
+
+from core.async_request_manager import RateLimitConfig, get_async_request_manager
+from core.adaptive_concurrency import AIMDConfig
+
+
+class DocumentAnalysisJob:
+    """
+    Aggregate job tracking per-section progress for one document
+    """
+
+    def __init__(self, session_id: str, sections: Dict[str, str]):
+        self.job_id = str(uuid.uuid4())
+        self.session_id = session_id
+        self.section_order = list(sections.keys())
+        self.created = time.time()
+        self.completed = None
+        self.lock = threading.Lock()
+        # Serializes the caller's callbacks: they update (and save) the same
+        # review session from several pool threads
+        self.callback_lock = threading.Lock()
+
+        self.sections = {
+            name: {
+                'status': 'pending',
+                'feedback_count': 0,
+                'duration': None,
+                'error': None
+            }
+            for name in self.section_order
+        }
+        self.results: Dict[str, List[Dict[str, Any]]] = {}
+
+    def mark_running(self, section_name: str):
+        with self.lock:
+            self.sections[section_name]['status'] = 'running'
+
+    def mark_done(self, section_name: str, feedback_items: List[Dict[str, Any]],
+                  duration: float, error: Optional[str] = None):
+        with self.lock:
+            section = self.sections[section_name]
+            section['status'] = 'failed' if error else 'completed'
+            section['feedback_count'] = len(feedback_items)
+            section['duration'] = round(duration, 2)
+            section['error'] = error
+            self.results[section_name] = feedback_items
+
+    def mark_finished(self):
+        with self.lock:
+            self.completed = time.time()
+
+    def is_finished(self) -> bool:
+        return self.completed is not None
+
+    def to_dict(self, include_results: bool = True) -> Dict[str, Any]:
+        """Status snapshot for the polling endpoint"""
+        with self.lock:
+            total = len(self.section_order)
+            done = sum(1 for s in self.sections.values() if s['status'] in ('completed', 'failed'))
+            failed = sum(1 for s in self.sections.values() if s['status'] == 'failed')
+
+            if self.completed is not None:
+                state = 'SUCCESS' if failed < total or total == 0 else 'FAILURE'
+            elif done or any(s['status'] == 'running' for s in self.sections.values()):
+                state = 'PROGRESS'
+            else:
+                state = 'PENDING'
+
+            elapsed = (self.completed or time.time()) - self.created
+
+            status = {
+                'job_id': self.job_id,
+                'session_id': self.session_id,
+                'state': state,
+                'ready': self.completed is not None,
+                'progress': round(done / total * 100) if total else 100,
+                'total_sections': total,
+                'completed_sections': done - failed,
+                'failed_sections': failed,
+                'elapsed': round(elapsed, 2),
+                'sections': {name: dict(self.sections[name]) for name in self.section_order}
+            }
+
+            if include_results:
+                status['results'] = dict(self.results)
+
+            return status
+
+
+class DocumentBatchAnalyzer:
+    """
+    Runs DocumentAnalysisJobs on a bounded pool, rate-limited per section call
+
+    Args:
+        analyze_fn: Callable(section_name, content) -> analysis result dict
+        max_concurrent: Pool size (defaults to the adaptive concurrency ceiling)
+        model_id: Model id recorded against the request manager's health stats
+    """
+
+    JOB_RETENTION_SECONDS = 3600
+
+    def __init__(self, analyze_fn: Callable, max_concurrent: Optional[int] = None,
+                 model_id: str = 'document_analysis'):
+        self.analyze_fn = analyze_fn
+        if max_concurrent is None:
+            # With adaptive concurrency the AIMD controller gates the actual
+            # Bedrock calls, so the pool only needs to be able to reach its ceiling
+            max_concurrent = int(AIMDConfig.MAX_LIMIT) if AIMDConfig.ENABLED else RateLimitConfig.MAX_CONCURRENT_REQUESTS
+        self.max_concurrent = max_concurrent
+        self.model_id = model_id
+        self.request_manager = get_async_request_manager()
+
+        self.jobs: Dict[str, DocumentAnalysisJob] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, session_id: str, sections: Dict[str, str],
+               on_section_complete: Callable,
+               on_update: Optional[Callable] = None) -> DocumentAnalysisJob:
+        """
+        Start analysing every section in the background
+
+        Args:
+            session_id: Owning review session
+            sections: Ordered {section_name: content}
+            on_section_complete: Callable(section_name, content, result) -> stored feedback items
+            on_update: Callable(job) run on submit, after each section and when
+                       the job finishes (e.g. to persist job.to_dict())
+
+        Returns:
+            The aggregate DocumentAnalysisJob (poll with get_job)
+        """
+        job = DocumentAnalysisJob(session_id, sections)
+
+        with self.lock:
+            self._prune_finished_jobs()
+            self.jobs[job.job_id] = job
+
+        self._notify(on_update, job)
+
+        thread = threading.Thread(
+            target=self._run_job,
+            args=(job, sections, on_section_complete, on_update),
+            daemon=True,
+            name=f'doc_analysis_{job.job_id[:8]}'
+        )
+        thread.start()
+
+        print(f"📚 Document analysis {job.job_id[:8]} submitted: {len(sections)} sections "
+              f"(max {self.max_concurrent} concurrent)", flush=True)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[DocumentAnalysisJob]:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    @staticmethod
+    def _notify(on_update: Optional[Callable], job: DocumentAnalysisJob):
+        if on_update is None:
+            return
+        try:
+            on_update(job)
+        except Exception as e:
+            print(f"⚠️ Document analysis {job.job_id[:8]} status update failed: {e}", flush=True)
+
+    def _run_job(self, job: DocumentAnalysisJob, sections: Dict[str, str],
+                 on_section_complete: Callable, on_update: Optional[Callable] = None):
+        start_time = time.time()
+        workers = max(1, min(self.max_concurrent, len(sections)))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='doc_section') as executor:
+            futures = [
+                executor.submit(self._analyze_one, job, section_name, content, on_section_complete, on_update)
+                for section_name, content in sections.items()
+            ]
+            for future in futures:
+                future.result()
+
+        with job.callback_lock:
+            job.mark_finished()
+            self._notify(on_update, job)
+        print(f"✅ Document analysis {job.job_id[:8]} complete in {time.time() - start_time:.2f}s", flush=True)
+
+    def _analyze_one(self, job: DocumentAnalysisJob, section_name: str, content: str,
+                     on_section_complete: Callable, on_update: Optional[Callable] = None):
+        estimated_tokens = self.request_manager.token_counter.estimate_tokens(content)
+        # Waits outside the request manager's admission lock (see acquire)
+        self.request_manager.acquire(estimated_tokens)
+
+        job.mark_running(section_name)
+        section_start = time.time()
+        success = False
+        error = None
+
+        try:
+            # Already charged above - the engine's own admission is skipped
+            with self.request_manager.preadmitted():
+                result = self.analyze_fn(section_name, content)
+            if isinstance(result, dict) and result.get('success') is False:
+                error = result.get('error', 'Analysis failed')
+                result = {'feedback_items': [], 'error': error, 'fallback': True}
+            success = error is None
+        except Exception as e:
+            error = str(e)
+            print(f"❌ Document analysis {job.job_id[:8]}: {section_name} failed: {error}", flush=True)
+            traceback.print_exc()
+            result = {'feedback_items': [], 'error': f'AI analysis failed: {error}', 'fallback': True}
+        finally:
+            duration = time.time() - section_start
+            self.request_manager.record_request_end(
+                success=success,
+                model_id=self.model_id,
+                duration=duration,
+                tokens_used=estimated_tokens,
+                error=error
+            )
+
+        # One section at a time stores results and snapshots the job, so the
+        # session's feedback, statistics and serialization never interleave
+        with job.callback_lock:
+            try:
+                feedback_items = on_section_complete(section_name, content, result)
+            except Exception as e:
+                print(f"⚠️ Storing results for {section_name} failed: {e}", flush=True)
+                feedback_items = []
+                error = error or str(e)
+
+            job.mark_done(section_name, feedback_items, duration, error)
+            self._notify(on_update, job)
+
+    def _prune_finished_jobs(self):
+        """Drop finished jobs older than JOB_RETENTION_SECONDS (caller holds the lock)"""
+        cutoff = time.time() - self.JOB_RETENTION_SECONDS
+        expired = [job_id for job_id, job in self.jobs.items()
+                   if job.completed is not None and job.completed < cutoff]
+        for job_id in expired:
+            del self.jobs[job_id]
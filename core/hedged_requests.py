@@ -0,0 +1,300 @@
+"""
+Hedged Bedrock Requests for AI-Prism
+Cuts tail latency by racing a slow primary call against a fallback model
+
+If the primary model has not answered within a percentile of its own recent
+latency (p95 by default), the same prompt is sent to the next healthy model.
+The first response that is valid JSON wins; the other call is cancelled
+(queued retries stop and its result is discarded). Hedges are admitted and
+recorded through the AsyncRequestManager, so they count against the rate
+limits like any other request.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Callable, Optional
+
+from core.async_request_manager import get_async_request_manager
+
+
+class HedgingConfig:
+    """
+    Hedging settings (overridable via environment variables)
+    """
+    ENABLED = os.environ.get('BEDROCK_HEDGING_ENABLED', 'false').lower() == 'true'
+    # Latency percentile of the primary model after which a hedge is sent
+    PERCENTILE = float(os.environ.get('BEDROCK_HEDGE_PERCENTILE', '95'))
+    # Delay used until enough latency samples exist
+    DEFAULT_DELAY_SECONDS = float(os.environ.get('BEDROCK_HEDGE_DEFAULT_DELAY', '30'))
+    MIN_DELAY_SECONDS = float(os.environ.get('BEDROCK_HEDGE_MIN_DELAY', '5'))
+    MIN_SAMPLES = int(os.environ.get('BEDROCK_HEDGE_MIN_SAMPLES', '20'))
+    WINDOW_SIZE = int(os.environ.get('BEDROCK_HEDGE_WINDOW', '200'))
+
+
+class HedgeCancelled(Exception):
+    """Raised inside the losing call when the other one already won"""
+
+
+def is_valid_json_response(text: str) -> bool:
+    """Check whether a model response contains a parseable JSON object"""
+    if not text:
+        return False
+
+    cleaned = text.strip()
+    if cleaned.startswith('```'):
+        cleaned = re.sub(r'^```(?:json)?\s*', '', cleaned)
+        cleaned = re.sub(r'\s*```$', '', cleaned)
+
+    try:
+        return isinstance(json.loads(cleaned), dict)
+    except ValueError:
+        match = re.search(r'\{.*\}', cleaned, re.DOTALL)
+        if not match:
+            return False
+        try:
+            json.loads(match.group(0))
+            return True
+        except ValueError:
+            return False
+
+
+class LatencyTracker:
+    """
+    Sliding window of successful call latencies per model
+    """
+
+    def __init__(self, window_size: Optional[int] = None):
+        self.window_size = window_size or HedgingConfig.WINDOW_SIZE
+        self.samples = defaultdict(lambda: deque(maxlen=self.window_size))
+        self.lock = threading.Lock()
+
+    def record(self, model_id: str, duration: float):
+        with self.lock:
+            self.samples[model_id].append(duration)
+
+    def percentile(self, model_id: str, percentile: float) -> Optional[float]:
+        """Latency at the given percentile, or None with too few samples"""
+        with self.lock:
+            samples = sorted(self.samples.get(model_id, ()))
+
+        if len(samples) < HedgingConfig.MIN_SAMPLES:
+            return None
+
+        index = min(len(samples) - 1, int(round(percentile / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+    def hedge_delay(self, model_id: str) -> float:
+        """Seconds to wait on the primary before sending a hedge"""
+        latency = self.percentile(model_id, HedgingConfig.PERCENTILE)
+        if latency is None:
+            return HedgingConfig.DEFAULT_DELAY_SECONDS
+        return max(HedgingConfig.MIN_DELAY_SECONDS, latency)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            models = {model_id: list(samples) for model_id, samples in self.samples.items()}
+
+        stats = {}
+        for model_id, samples in models.items():
+            samples.sort()
+            stats[model_id] = {
+                'samples': len(samples),
+                'p50': round(samples[len(samples) // 2], 3) if samples else None,
+                'p95': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3) if samples else None,
+                'hedge_delay': round(self.hedge_delay(model_id), 3)
+            }
+        return stats
+
+
+class HedgedInvoker:
+    """
+    Runs a primary call and, if it is slow, one hedge on the next healthy model
+
+    Args:
+        call_fn: Callable(model, cancel_event) -> response text
+    """
+
+    def __init__(self, latency_tracker: LatencyTracker):
+        self.latency_tracker = latency_tracker
+        self.request_manager = get_async_request_manager()
+        self.stats = {
+            'requests': 0,
+            'hedges_sent': 0,
+            'hedge_wins': 0,
+            'primary_wins': 0,
+            'hedges_skipped_rate_limit': 0,
+            'hedges_skipped_no_model': 0
+        }
+        self.stats_lock = threading.Lock()
+
+    def _count(self, stat: str):
+        with self.stats_lock:
+            self.stats[stat] += 1
+
+    def invoke(self, models: List[Dict[str, Any]], call_fn: Callable,
+               estimated_tokens: int = 0) -> str:
+        """
+        Invoke the first model, hedging onto the next healthy one when slow
+
+        Args:
+            models: Candidate models in priority order (primary first)
+            call_fn: Callable(model, cancel_event) -> response text
+            estimated_tokens: Prompt size used for hedge rate-limit admission
+
+        Returns:
+            The winning response text
+        """
+        self._count('requests')
+        primary = models[0]
+        delay = self.latency_tracker.hedge_delay(primary['id'])
+
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='bedrock_hedge')
+        cancel_events = {primary['id']: threading.Event()}
+        futures = {executor.submit(call_fn, primary, cancel_events[primary['id']]): primary}
+
+        try:
+            done, _ = wait(futures, timeout=delay)
+            if done:
+                # Primary answered (or failed) before the hedge deadline
+                result = next(iter(done)).result()
+                self._count('primary_wins')
+                return result
+
+            hedge = self._pick_hedge_model(models[1:])
+            if hedge is None:
+                return next(iter(futures)).result()
+
+            if not self._admit_hedge(hedge, estimated_tokens):
+                return next(iter(futures)).result()
+
+            print(f"🪃 Primary {primary['name']} slower than {delay:.1f}s - hedging with {hedge['name']}", flush=True)
+            self._count('hedges_sent')
+            cancel_events[hedge['id']] = threading.Event()
+            futures[executor.submit(self._run_hedge, call_fn, hedge, cancel_events[hedge['id']],
+                                    estimated_tokens)] = hedge
+
+            return self._first_valid(futures, cancel_events, primary)
+
+        finally:
+            executor.shutdown(wait=False)
+
+    def _first_valid(self, futures, cancel_events, primary) -> str:
+        """Return the first valid JSON response and cancel the other call"""
+        pending = set(futures)
+        fallback_result = None
+        last_error = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                model = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    print(f"⚠️ Hedged call to {model['name']} failed: {e}", flush=True)
+                    continue
+
+                if is_valid_json_response(result):
+                    for model_id, event in cancel_events.items():
+                        if model_id != model['id']:
+                            event.set()
+                    self._count('primary_wins' if model['id'] == primary['id'] else 'hedge_wins')
+                    print(f"🏁 Hedged request won by {model['name']}", flush=True)
+                    return result
+
+                # Keep invalid output in case the other call fails too
+                fallback_result = fallback_result or result
+
+        if fallback_result is not None:
+            return fallback_result
+        raise last_error
+
+    def _pick_hedge_model(self, candidates: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        # Peek only - the probe slot of a half-open circuit is taken in _admit_hedge
+        for model in candidates:
+            if self.request_manager.would_model_be_available(model['id']):
+                return model
+
+        self._count('hedges_skipped_no_model')
+        return None
+
+    def _admit_hedge(self, model: Dict[str, Any], estimated_tokens: int) -> bool:
+        """Hedges never wait for the rate limiter - they are skipped instead"""
+        with self.request_manager.admission_lock:
+            # Takes the shared request token too, so hedges are charged like any call
+            can_make, reason, _ = self.request_manager.try_acquire(estimated_tokens)
+            if can_make:
+                self.request_manager.record_request_start()
+
+        if not can_make:
+            print(f"⏸️ Hedge skipped: {reason}", flush=True)
+            self._count('hedges_skipped_rate_limit')
+            return False
+
+        # Circuit admission last, right before the hedge is submitted
+        available, reason = self.request_manager.is_model_available(model['id'])
+        if not available:
+            self.request_manager.cancel_request()
+            print(f"⏸️ Hedge skipped: {reason}", flush=True)
+            self._count('hedges_skipped_no_model')
+            return False
+
+        return True
+
+    def _run_hedge(self, call_fn: Callable, model: Dict[str, Any], cancel_event: threading.Event,
+                   estimated_tokens: int) -> str:
+        start_time = time.time()
+        success = False
+        error = None
+        try:
+            # Admitted and recorded by _admit_hedge / this method
+            with self.request_manager.preadmitted():
+                result = call_fn(model, cancel_event)
+            success = True
+            return result
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            self.request_manager.record_request_end(
+                success=success,
+                model_id=model['id'],
+                duration=time.time() - start_time,
+                tokens_used=estimated_tokens,
+                error=error
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.stats_lock:
+            stats = self.stats.copy()
+        stats['enabled'] = HedgingConfig.ENABLED
+        stats['latency'] = self.latency_tracker.get_stats()
+        return stats
+
+
+# Global instances
+_latency_tracker = LatencyTracker()
+_hedged_invoker = None
+_invoker_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Get the process-wide model latency tracker"""
+    return _latency_tracker
+
+
+def get_hedged_invoker() -> HedgedInvoker:
+    """Get or create the process-wide hedged invoker"""
+    global _hedged_invoker
+
+    with _invoker_lock:
+        if _hedged_invoker is None:
+            _hedged_invoker = HedgedInvoker(_latency_tracker)
+
+        return _hedged_invoker
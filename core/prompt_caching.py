@@ -0,0 +1,125 @@
+"""
+Bedrock Prompt Caching Helpers for AI-Prism
+Marks the static system prompt as cacheable and tracks cache token usage
+
+Every analysis request resends the same large system prompt (Hawkeye
+checklist + analysis instructions). With prompt caching, Bedrock stores that
+prefix after the first request and later requests read it from cache, which
+costs a fraction of normal input tokens and cuts time-to-first-token.
+
+Prompts shorter than the model's minimum cacheable length are simply not
+cached by Bedrock; models without caching support get a plain string system
+prompt.
+"""
+
+import os
+import threading
+from typing import Dict, Any, List, Union
+
+
+PROMPT_CACHING_ENABLED = os.environ.get('BEDROCK_PROMPT_CACHING', 'true').lower() == 'true'
+
+# Model id fragments of Claude models that support Bedrock prompt caching
+CACHE_SUPPORTED_MODELS = [
+    'claude-3-5-haiku',
+    'claude-3-7-sonnet',
+    'claude-sonnet-4',
+    'claude-opus-4',
+    'claude-haiku-4'
+]
+
+
+def supports_prompt_caching(model_id: str) -> bool:
+    """Check whether prompt caching should be requested for a model"""
+    if not PROMPT_CACHING_ENABLED or not model_id:
+        return False
+    return any(fragment in model_id for fragment in CACHE_SUPPORTED_MODELS)
+
+
+def build_system_blocks(system_prompt: str, model_id: str) -> Union[str, List[Dict[str, Any]]]:
+    """
+    Build the 'system' field of an Anthropic Messages request body
+
+    Args:
+        system_prompt: Static system prompt
+        model_id: Target Bedrock model id
+
+    Returns:
+        A content-block list with a cache checkpoint after the system prompt,
+        or the plain string when the model does not support caching
+    """
+    if not system_prompt or not supports_prompt_caching(model_id):
+        return system_prompt
+
+    return [
+        {
+            'type': 'text',
+            'text': system_prompt,
+            'cache_control': {'type': 'ephemeral'}
+        }
+    ]
+
+
+class PromptCacheStats:
+    """
+    Process-wide counters for cache read/write token usage
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = {
+            'requests': 0,
+            'cache_hits': 0,
+            'input_tokens': 0,
+            'cache_read_input_tokens': 0,
+            'cache_creation_input_tokens': 0
+        }
+        self.by_model = {}
+
+    def record(self, usage: Dict[str, Any], model_id: str):
+        """Record the usage block returned by Bedrock"""
+        if not usage:
+            return
+
+        cache_read = usage.get('cache_read_input_tokens', 0) or 0
+        cache_write = usage.get('cache_creation_input_tokens', 0) or 0
+        input_tokens = usage.get('input_tokens', 0) or 0
+
+        with self.lock:
+            for bucket in (self.totals, self.by_model.setdefault(model_id, {
+                'requests': 0,
+                'cache_hits': 0,
+                'input_tokens': 0,
+                'cache_read_input_tokens': 0,
+                'cache_creation_input_tokens': 0
+            })):
+                bucket['requests'] += 1
+                bucket['input_tokens'] += input_tokens
+                bucket['cache_read_input_tokens'] += cache_read
+                bucket['cache_creation_input_tokens'] += cache_write
+                if cache_read:
+                    bucket['cache_hits'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = self.totals.copy()
+            stats['by_model'] = {model_id: values.copy() for model_id, values in self.by_model.items()}
+
+        prompt_tokens = stats['input_tokens'] + stats['cache_read_input_tokens'] + stats['cache_creation_input_tokens']
+        stats['cached_token_ratio'] = round(stats['cache_read_input_tokens'] / prompt_tokens, 3) if prompt_tokens else 0.0
+        stats['enabled'] = PROMPT_CACHING_ENABLED
+        return stats
+
+
+# Global instance
+_prompt_cache_stats = PromptCacheStats()
+
+
+def record_cache_usage(usage: Dict[str, Any], model_id: str):
+    """Record cache read/write token usage from a Bedrock response"""
+    _prompt_cache_stats.record(usage, model_id)
+
+
+def get_prompt_cache_stats() -> Dict[str, Any]:
+    """Get process-wide prompt cache usage"""
+    return _prompt_cache_stats.get_stats()
@@ -0,0 +1,851 @@
+"""
+Pluggable Review Session Store for AI-Prism
+Keeps ReviewSession data in memory, Redis or SQLite so several app processes can share it
+
+Sessions used to live only in a module-level dict, which pinned the app to a
+single Flask process. The store keeps each session's data fields (sections,
+feedback, decisions, chat history - see ReviewSession.to_dict) as versioned
+JSON in a backend:
+
+    memory - the original per-process dict (default; no serialization)
+    redis  - one hash per session {version, data}, shared by all processes
+    sqlite - sessions(session_id, version, data) table on a shared volume
+
+Every process keeps hot sessions in a local cache together with the version
+it loaded. A get() costs one version lookup; the data is only reloaded (into
+the same object) when another process wrote a newer version. save() is
+write-through: the session is serialized and, if anything changed, written
+with the next version.
+
+Writes are compare-and-set on the version the object was loaded at (a Lua
+script in Redis, UPDATE ... WHERE version = ? in SQLite). Background
+callbacks hold a session object for minutes, so when the stored version
+moved on, save() reloads it, reapplies this object's changes since it was
+loaded (merge_session_data) into the same object and retries. Only a
+session that keeps changing for SAVE_RETRIES attempts fails, with
+SessionConflictError.
+
+Sessions held in process memory are bounded. Each one is sized by its
+serialized data, and a periodic sweep evicts sessions idle for longer than
+IDLE_TTL_SECONDS and then the least recently used ones until the total fits
+in MEMORY_BUDGET_MB. Evicted sessions are rehydrated on their next get():
+shared backends reload them from Redis/SQLite; the memory backend first
+spills them to a local SQLite file (SPILL_PATH). A holder that kept an
+evicted object and saves it later either makes it live again or, if the
+session was rehydrated meanwhile, has its changes merged into the live one.
+
+Redis expires idle sessions itself; SQLite rows (sessions table and spill
+file) older than TTL_SECONDS are deleted every PURGE_INTERVAL_SECONDS.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import weakref
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, List, Tuple
+
+
+class SessionStoreConfig:
+    """
+    Session store settings (overridable via environment variables)
+    """
+    BACKEND = os.environ.get('SESSION_STORE_BACKEND', 'memory').lower()
+    REDIS_URL = os.environ.get('SESSION_STORE_REDIS_URL', os.environ.get('REDIS_URL', 'redis://localhost:6379/0'))
+    KEY_PREFIX = os.environ.get('SESSION_STORE_PREFIX', 'aiprism:session:')
+    SQLITE_PATH = os.environ.get('SESSION_STORE_SQLITE_PATH', 'data/sessions.db')
+    # Idle sessions expire from Redis/SQLite after this long
+    TTL_SECONDS = int(os.environ.get('SESSION_STORE_TTL_SECONDS', str(7 * 24 * 3600)))
+    # Compare-and-set attempts before a save gives up on a busy session
+    SAVE_RETRIES = int(os.environ.get('SESSION_STORE_SAVE_RETRIES', '5'))
+    # How often expired SQLite rows are deleted
+    PURGE_INTERVAL_SECONDS = int(os.environ.get('SESSION_STORE_PURGE_INTERVAL_SECONDS', '3600'))
+
+    # In-process eviction
+    IDLE_TTL_SECONDS = int(os.environ.get('SESSION_IDLE_TTL_SECONDS', '7200'))
+    MEMORY_BUDGET_MB = float(os.environ.get('SESSION_MEMORY_BUDGET_MB', '512'))
+    EVICTION_INTERVAL_SECONDS = int(os.environ.get('SESSION_EVICTION_INTERVAL_SECONDS', '60'))
+    # Budget eviction never takes a session used more recently than this
+    MIN_RESIDENT_SECONDS = int(os.environ.get('SESSION_MIN_RESIDENT_SECONDS', '300'))
+    # Where the memory backend persists evicted sessions
+    SPILL_PATH = os.environ.get('SESSION_SPILL_PATH', 'data/evicted_sessions.db')
+
+
+def encode_session_data(data: Dict[str, Any]) -> str:
+    """Serialize session data (datetimes and other objects become strings)"""
+    return json.dumps(data, default=str, sort_keys=True)
+
+
+class SessionConflictError(RuntimeError):
+    """A session kept changing underneath a save for SAVE_RETRIES attempts"""
+
+
+def _merge_value(base, local, remote):
+    """Reapply one field's local change (base -> local) on top of remote"""
+    if isinstance(local, dict) and isinstance(remote, dict):
+        base = base if isinstance(base, dict) else {}
+        merged = dict(remote)
+        for key in set(base) | set(local):
+            if key not in local:
+                merged.pop(key, None)
+            elif key not in base or local[key] != base[key]:
+                merged[key] = local[key]
+        return merged
+
+    if isinstance(local, list) and isinstance(remote, list):
+        base = base if isinstance(base, list) else []
+        # Both sides appended to the same history: keep both sets of entries
+        if local[:len(base)] == base and remote[:len(base)] == base:
+            return remote + local[len(base):]
+
+    return local
+
+
+def merge_session_data(base: Dict[str, Any], local: Dict[str, Any], remote: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Three-way merge of session data after a lost compare-and-set
+
+    Fields (and keys of dict fields) this writer left alone take the stored
+    value; the ones it changed since loading keep its value; lists both
+    sides appended to keep both sets of entries.
+
+    Args:
+        base: Data the writer loaded
+        local: Data the writer wants to save
+        remote: Data currently stored
+    """
+    merged = dict(remote)
+    for field, value in local.items():
+        base_value = base.get(field)
+        if value == base_value:
+            continue
+        remote_value = remote.get(field)
+        merged[field] = value if remote_value == base_value else _merge_value(base_value, value, remote_value)
+    return merged
+
+
+def estimate_session_bytes(session_obj) -> int:
+    """Approximate in-memory size of a session (its serialized data)"""
+    if hasattr(session_obj, 'estimate_size'):
+        return session_obj.estimate_size()
+    return len(encode_session_data(session_obj.to_dict()))
+
+
+class MemorySessionBackend:
+    """
+    Per-process dict of session objects (no serialization, nothing shared)
+    """
+    shared = False
+
+    def __init__(self):
+        self.objects = {}
+        self.lock = threading.Lock()
+
+    def get_object(self, session_id: str):
+        with self.lock:
+            return self.objects.get(session_id)
+
+    def put_object(self, session_id: str, session_obj):
+        with self.lock:
+            self.objects[session_id] = session_obj
+
+    def delete(self, session_id: str):
+        with self.lock:
+            self.objects.pop(session_id, None)
+
+    def list_ids(self) -> List[str]:
+        with self.lock:
+            return list(self.objects.keys())
+
+
+class RedisSessionBackend:
+    """
+    Session data as versioned Redis hashes shared by all processes
+    """
+    shared = True
+
+    # KEYS[1] = session hash; ARGV = expected version (0 = new), data, ttl
+    # Returns the new version, or -1 if the stored version differs
+    SAVE_SCRIPT = """
+    local stored = redis.call('HGET', KEYS[1], 'version')
+    local current = 0
+    if stored then current = tonumber(stored) end
+    if current ~= tonumber(ARGV[1]) then
+        return -1
+    end
+    redis.call('HSET', KEYS[1], 'version', current + 1, 'data', ARGV[2])
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+    return current + 1
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        from redis import Redis
+
+        self.redis = Redis.from_url(redis_url or SessionStoreConfig.REDIS_URL)
+        self.prefix = SessionStoreConfig.KEY_PREFIX
+        self._save_script = self.redis.register_script(self.SAVE_SCRIPT)
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def get_version(self, session_id: str) -> Optional[int]:
+        version = self.redis.hget(self._key(session_id), 'version')
+        return int(version) if version is not None else None
+
+    def load(self, session_id: str) -> Optional[Tuple[int, str]]:
+        version, data = self.redis.hmget(self._key(session_id), 'version', 'data')
+        if version is None or data is None:
+            return None
+        return int(version), data.decode('utf-8') if isinstance(data, bytes) else data
+
+    def save(self, session_id: str, encoded: str, expected_version: Optional[int] = None) -> Optional[int]:
+        """
+        Write a new version
+
+        Args:
+            expected_version: Only write if the stored version is still this
+                              (0 = not stored yet); None writes unconditionally
+
+        Returns:
+            The new version, or None if expected_version is out of date
+        """
+        key = self._key(session_id)
+        if expected_version is None:
+            pipe = self.redis.pipeline()
+            pipe.hincrby(key, 'version', 1)
+            pipe.hset(key, 'data', encoded)
+            pipe.expire(key, SessionStoreConfig.TTL_SECONDS)
+            version, _, _ = pipe.execute()
+            return int(version)
+
+        version = int(self._save_script(keys=[key], args=[expected_version, encoded, SessionStoreConfig.TTL_SECONDS]))
+        return version if version > 0 else None
+
+    def delete(self, session_id: str):
+        self.redis.delete(self._key(session_id))
+
+    def list_ids(self) -> List[str]:
+        ids = []
+        for key in self.redis.scan_iter(match=f"{self.prefix}*", count=500):
+            key = key.decode('utf-8') if isinstance(key, bytes) else key
+            ids.append(key[len(self.prefix):])
+        return ids
+
+
+class SQLiteSessionBackend:
+    """
+    Session data in a SQLite table (a shared volume for several processes)
+    """
+    shared = True
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or SessionStoreConfig.SQLITE_PATH
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS review_sessions (
+                    session_id TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_review_sessions_updated_at ON review_sessions (updated_at)'
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _expired_before(self) -> float:
+        return time.time() - SessionStoreConfig.TTL_SECONDS
+
+    def get_version(self, session_id: str) -> Optional[int]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT version FROM review_sessions WHERE session_id = ? AND updated_at >= ?',
+                (session_id, self._expired_before())
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def load(self, session_id: str) -> Optional[Tuple[int, str]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT version, data FROM review_sessions WHERE session_id = ? AND updated_at >= ?',
+                (session_id, self._expired_before())
+            ).fetchone()
+        finally:
+            conn.close()
+        return (row[0], row[1]) if row else None
+
+    def save(self, session_id: str, encoded: str, expected_version: Optional[int] = None) -> Optional[int]:
+        """
+        Write a new version
+
+        Args:
+            expected_version: Only write if the stored version is still this
+                              (0 = not stored yet); None writes unconditionally
+
+        Returns:
+            The new version, or None if expected_version is out of date
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            if expected_version is None:
+                cursor = conn.execute('''
+                    INSERT INTO review_sessions (session_id, version, data, updated_at) VALUES (?, 1, ?, ?)
+                    ON CONFLICT(session_id) DO UPDATE SET
+                        version = version + 1, data = excluded.data, updated_at = excluded.updated_at
+                ''', (session_id, encoded, now))
+            elif expected_version == 0:
+                # New session - an expired row counts as not stored
+                cursor = conn.execute('''
+                    INSERT INTO review_sessions (session_id, version, data, updated_at) VALUES (?, 1, ?, ?)
+                    ON CONFLICT(session_id) DO UPDATE SET
+                        version = version + 1, data = excluded.data, updated_at = excluded.updated_at
+                    WHERE review_sessions.updated_at < ?
+                ''', (session_id, encoded, now, self._expired_before()))
+            else:
+                cursor = conn.execute('''
+                    UPDATE review_sessions SET version = version + 1, data = ?, updated_at = ?
+                    WHERE session_id = ? AND version = ? AND updated_at >= ?
+                ''', (encoded, now, session_id, expected_version, self._expired_before()))
+
+            if cursor.rowcount == 0:
+                conn.rollback()
+                return None
+            version = conn.execute(
+                'SELECT version FROM review_sessions WHERE session_id = ?', (session_id,)
+            ).fetchone()[0]
+            conn.commit()
+        finally:
+            conn.close()
+        return version
+
+    def delete(self, session_id: str):
+        conn = self._connect()
+        try:
+            conn.execute('DELETE FROM review_sessions WHERE session_id = ?', (session_id,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def list_ids(self) -> List[str]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT session_id FROM review_sessions WHERE updated_at >= ?', (self._expired_before(),)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
+
+    def purge_expired(self) -> int:
+        """Delete sessions idle for longer than TTL_SECONDS; returns the number deleted"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute('DELETE FROM review_sessions WHERE updated_at < ?', (self._expired_before(),))
+            conn.commit()
+        finally:
+            conn.close()
+        return cursor.rowcount
+
+
+class SessionStore:
+    """
+    Review sessions over a backend, with a version-checked local cache
+
+    Args:
+        factory: Creates a blank session object; objects implement
+                 to_dict() -> data and load_dict(data)
+        backend: MemorySessionBackend, RedisSessionBackend or SQLiteSessionBackend
+    """
+
+    def __init__(self, factory: Callable, backend=None, spill_backend=None):
+        self.factory = factory
+        self.backend = backend or MemorySessionBackend()
+        self.lock = threading.RLock()
+
+        # session_id -> {'session', 'version'} (shared backends)
+        self.cache = {}
+        # session object -> (version, encoded data) it was last loaded or
+        # saved at; the base of its compare-and-set saves (shared backends)
+        # or of merging it back after eviction (memory backend)
+        self.loaded = weakref.WeakKeyDictionary()
+
+        # Sessions resident in this process, least recently used first:
+        # session_id -> {'last_access', 'bytes'} (bytes None = re-measure)
+        self.resident = OrderedDict()
+        self.last_sweep = time.time()
+        self.last_purge = 0.0
+
+        # Evicted sessions of the (unshared) memory backend
+        self.spill = spill_backend
+        self.spilled_ids = set()
+        if self.spill is None and not self.shared:
+            try:
+                self.spill = SQLiteSessionBackend(SessionStoreConfig.SPILL_PATH)
+            except Exception as e:
+                print(f"⚠️ Session spill file unavailable ({e}) - evicted sessions will be dropped")
+        if self.spill is not None:
+            try:
+                self.spilled_ids = set(self.spill.list_ids())
+            except Exception as e:
+                print(f"⚠️ Could not list spilled sessions: {e}")
+
+        self.stats = {
+            'cache_hits': 0,
+            'reloads': 0,
+            'writes': 0,
+            'unchanged_saves': 0,
+            'save_conflicts': 0,
+            'evictions_idle': 0,
+            'evictions_budget': 0,
+            'rehydrations': 0,
+            'stale_merges': 0,
+            'purged': 0
+        }
+
+    @property
+    def shared(self) -> bool:
+        return self.backend.shared
+
+    def _count(self, stat: str):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def _touch(self, session_id: str, size: Optional[int] = None):
+        """Mark a session as just used (caller holds the lock)"""
+        entry = self.resident.pop(session_id, None) or {'bytes': None}
+        entry['last_access'] = time.time()
+        if size is not None:
+            entry['bytes'] = size
+        self.resident[session_id] = entry
+
+    def get(self, session_id: str):
+        """Session object for session_id, or None"""
+        session_obj = self._get(session_id)
+        if session_obj is not None:
+            with self.lock:
+                self._touch(session_id)
+        self.maybe_evict()
+        return session_obj
+
+    def _get(self, session_id: str):
+        if not session_id:
+            return None
+        if not self.shared:
+            session_obj = self.backend.get_object(session_id)
+            if session_obj is None and self.spill is not None:
+                session_obj = self._rehydrate(session_id)
+            return session_obj
+
+        version = self.backend.get_version(session_id)
+        with self.lock:
+            entry = self.cache.get(session_id)
+            if version is None:
+                self.cache.pop(session_id, None)
+                return None
+            if entry is not None and entry['version'] == version:
+                self.stats['cache_hits'] += 1
+                return entry['session']
+
+        loaded = self.backend.load(session_id)
+        if loaded is None:
+            return None
+        version, encoded = loaded
+
+        with self.lock:
+            entry = self.cache.get(session_id)
+            if entry is not None and entry['version'] >= version:
+                return entry['session']
+
+            # Reload into the cached object so references held elsewhere stay current
+            session_obj = entry['session'] if entry else self.factory()
+            session_obj.load_dict(json.loads(encoded))
+            self.cache[session_id] = {'session': session_obj, 'version': version}
+            self.loaded[session_obj] = (version, encoded)
+            self.stats['reloads'] += 1
+            self._touch(session_id, len(encoded))
+            return session_obj
+
+    def _rehydrate(self, session_id: str):
+        """Bring a spilled session back into memory (memory backend)"""
+        with self.lock:
+            # Re-check under the lock: another thread may have rehydrated it
+            session_obj = self.backend.get_object(session_id)
+            if session_obj is not None or session_id not in self.spilled_ids:
+                return session_obj
+
+            loaded = self.spill.load(session_id)
+            self.spilled_ids.discard(session_id)
+            if loaded is None:
+                return None
+
+            session_obj = self.factory()
+            session_obj.load_dict(json.loads(loaded[1]))
+            self.backend.put_object(session_id, session_obj)
+            self.stats['rehydrations'] += 1
+
+        try:
+            self.spill.delete(session_id)
+        except Exception as e:
+            print(f"⚠️ Could not remove spilled session {session_id}: {e}")
+        print(f"♻️ Rehydrated evicted session {session_id}")
+        return session_obj
+
+    def save(self, session_obj) -> bool:
+        """
+        Write-through a session if its data changed
+
+        Returns:
+            True if a new version was written
+        """
+        session_id = session_obj.session_id
+        if not self.shared:
+            self._save_object(session_id, session_obj)
+            self.maybe_evict()
+            return False
+
+        encoded = encode_session_data(session_obj.to_dict())
+
+        with self.lock:
+            base_version, base_encoded = self.loaded.get(session_obj, (0, None))
+            if encoded == base_encoded:
+                self.stats['unchanged_saves'] += 1
+                return False
+
+        for _ in range(SessionStoreConfig.SAVE_RETRIES):
+            version = self.backend.save(session_id, encoded, base_version)
+            if version is not None:
+                break
+
+            # Another writer got there first: reapply our changes to its data
+            with self.lock:
+                self.stats['save_conflicts'] += 1
+            loaded = self.backend.load(session_id)
+            if loaded is None:
+                # Deleted or expired meanwhile - store ours as a new session
+                base_version = 0
+                continue
+            remote_version, remote_encoded = loaded
+            merged = merge_session_data(
+                json.loads(base_encoded) if base_encoded else {},
+                json.loads(encoded),
+                json.loads(remote_encoded)
+            )
+            session_obj.load_dict(merged)
+            encoded = encode_session_data(session_obj.to_dict())
+            base_version, base_encoded = remote_version, remote_encoded
+            with self.lock:
+                self.loaded[session_obj] = (base_version, base_encoded)
+            if encoded == remote_encoded:
+                # Our changes were already stored
+                version = remote_version
+                break
+        else:
+            raise SessionConflictError(
+                f"Session {session_id} changed underneath {SessionStoreConfig.SAVE_RETRIES} save attempts"
+            )
+
+        with self.lock:
+            self.cache[session_id] = {'session': session_obj, 'version': version}
+            self.loaded[session_obj] = (version, encoded)
+            self.stats['writes'] += 1
+            self._touch(session_id, len(encoded))
+        self.maybe_evict()
+        return True
+
+    def _save_object(self, session_id: str, session_obj):
+        """Memory backend save (under the lock, so it cannot interleave with an eviction)"""
+        with self.lock:
+            current = self.backend.get_object(session_id)
+            evicted = self.loaded.get(session_obj) if current is not session_obj else None
+
+            if evicted is not None:
+                # Saved by a holder of an evicted object: the session may have
+                # been rehydrated (current) or changed and spilled again since
+                remote = None
+                if current is not None:
+                    remote = encode_session_data(current.to_dict())
+                elif session_id in self.spilled_ids:
+                    spilled = self.spill.load(session_id)
+                    remote = spilled[1] if spilled else None
+
+                if remote is not None and remote != evicted[1]:
+                    # Reapply this holder's changes since the eviction
+                    merged = merge_session_data(
+                        json.loads(evicted[1]),
+                        json.loads(encode_session_data(session_obj.to_dict())),
+                        json.loads(remote)
+                    )
+                    session_obj.load_dict(merged)
+                    self.stats['stale_merges'] += 1
+                    if current is not None:
+                        current.load_dict(merged)
+                        self.loaded[session_obj] = (0, encode_session_data(merged))
+                        session_obj = current
+
+            if session_obj is not current:
+                self.loaded.pop(session_obj, None)
+                self.backend.put_object(session_id, session_obj)
+
+            # Changed data - size is re-measured by the next sweep
+            self._touch(session_id)
+            self.resident[session_id]['bytes'] = None
+            respilled = session_id in self.spilled_ids
+            self.spilled_ids.discard(session_id)
+            if respilled:
+                # The live object supersedes its evicted copy
+                self.spill.delete(session_id)
+
+    def exists(self, session_id: str) -> bool:
+        if not session_id:
+            return False
+        if not self.shared:
+            return self.backend.get_object(session_id) is not None or session_id in self.spilled_ids
+        return self.backend.get_version(session_id) is not None
+
+    def delete(self, session_id: str):
+        with self.lock:
+            self.cache.pop(session_id, None)
+            self.resident.pop(session_id, None)
+            spilled = session_id in self.spilled_ids
+            self.spilled_ids.discard(session_id)
+        self.backend.delete(session_id)
+        if spilled:
+            self.spill.delete(session_id)
+
+    def list_ids(self) -> List[str]:
+        ids = self.backend.list_ids()
+        if not self.shared:
+            with self.lock:
+                ids = ids + [sid for sid in self.spilled_ids if sid not in set(ids)]
+        return ids
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def maybe_evict(self):
+        """Run a sweep if EVICTION_INTERVAL_SECONDS have passed since the last one"""
+        with self.lock:
+            if time.time() - self.last_sweep < SessionStoreConfig.EVICTION_INTERVAL_SECONDS:
+                return
+            self.last_sweep = time.time()
+            purge = time.time() - self.last_purge >= SessionStoreConfig.PURGE_INTERVAL_SECONDS
+            if purge:
+                self.last_purge = time.time()
+        try:
+            self.evict()
+        except Exception as e:
+            print(f"⚠️ Session eviction sweep failed: {e}")
+        if purge:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Delete SQLite sessions (stored or spilled) idle for longer than TTL_SECONDS"""
+        purged = 0
+        for backend in (self.backend, self.spill):
+            if not hasattr(backend, 'purge_expired'):
+                continue
+            try:
+                purged += backend.purge_expired()
+            except Exception as e:
+                print(f"⚠️ Could not purge expired sessions: {e}")
+
+        if self.spill is not None and purged:
+            try:
+                live = set(self.spill.list_ids())
+                with self.lock:
+                    self.spilled_ids &= live
+            except Exception as e:
+                print(f"⚠️ Could not list spilled sessions: {e}")
+
+        with self.lock:
+            self.stats['purged'] += purged
+        if purged:
+            print(f"🧹 Purged {purged} expired session(s)")
+        return purged
+
+    def _resident_session(self, session_id: str):
+        if self.shared:
+            entry = self.cache.get(session_id)
+            return entry['session'] if entry else None
+        return self.backend.get_object(session_id)
+
+    def _measure(self):
+        """Size sessions whose data changed since the last sweep"""
+        with self.lock:
+            stale = [sid for sid, entry in self.resident.items() if entry['bytes'] is None]
+
+        for session_id in stale:
+            session_obj = self._resident_session(session_id)
+            if session_obj is None:
+                with self.lock:
+                    self.resident.pop(session_id, None)
+                continue
+            try:
+                size = estimate_session_bytes(session_obj)
+            except Exception as e:
+                print(f"⚠️ Could not size session {session_id}: {e}")
+                size = 0
+            with self.lock:
+                if session_id in self.resident:
+                    self.resident[session_id]['bytes'] = size
+
+    def evict(self) -> Dict[str, int]:
+        """
+        Evict idle sessions, then LRU sessions until under the memory budget
+
+        Returns:
+            Number of sessions evicted for each reason
+        """
+        self._measure()
+
+        now = time.time()
+        budget = SessionStoreConfig.MEMORY_BUDGET_MB * 1024 * 1024
+        idle, over_budget = [], []
+
+        with self.lock:
+            total = sum(entry['bytes'] or 0 for entry in self.resident.values())
+            for session_id, entry in self.resident.items():
+                idle_for = now - entry['last_access']
+                if idle_for > SessionStoreConfig.IDLE_TTL_SECONDS:
+                    idle.append(session_id)
+                    total -= entry['bytes'] or 0
+            for session_id, entry in self.resident.items():
+                if total <= budget:
+                    break
+                if session_id in idle or now - entry['last_access'] < SessionStoreConfig.MIN_RESIDENT_SECONDS:
+                    continue
+                over_budget.append(session_id)
+                total -= entry['bytes'] or 0
+
+        evicted = {'idle': 0, 'budget': 0}
+        for reason, session_ids in (('idle', idle), ('budget', over_budget)):
+            for session_id in session_ids:
+                if self._evict_one(session_id):
+                    evicted[reason] += 1
+
+        with self.lock:
+            self.stats['evictions_idle'] += evicted['idle']
+            self.stats['evictions_budget'] += evicted['budget']
+
+        if evicted['idle'] or evicted['budget']:
+            print(f"🧹 Evicted {evicted['idle']} idle and {evicted['budget']} over-budget sessions "
+                  f"({self.get_memory_stats()['resident_bytes'] / 1024 / 1024:.1f} MB resident)")
+        return evicted
+
+    def _evict_one(self, session_id: str) -> bool:
+        """Drop a session from process memory, persisting it first if only held here"""
+        if self.shared:
+            # Data already lives in Redis/SQLite; the next get() reloads it
+            with self.lock:
+                self.cache.pop(session_id, None)
+                self.resident.pop(session_id, None)
+            return True
+
+        # Snapshot, spill and drop under the lock: a save of this session
+        # (_save_object) waits, so nothing can land between the snapshot and
+        # the delete
+        with self.lock:
+            session_obj = self.backend.get_object(session_id)
+            if session_obj is None:
+                self.resident.pop(session_id, None)
+                return False
+
+            encoded = encode_session_data(session_obj.to_dict())
+            if self.spill is not None:
+                try:
+                    self.spill.save(session_id, encoded)
+                except Exception as e:
+                    print(f"⚠️ Could not persist evicted session {session_id}, keeping it: {e}")
+                    return False
+                self.spilled_ids.add(session_id)
+
+            self.backend.delete(session_id)
+            self.resident.pop(session_id, None)
+            # Holders may still save this object - keep what was spilled as
+            # the base to merge their changes into a rehydrated copy
+            self.loaded[session_obj] = (0, encoded)
+        return True
+
+    def get_memory_stats(self, top: int = 0) -> Dict[str, Any]:
+        """
+        Resident session count and bytes
+
+        Args:
+            top: Also list the N largest resident sessions
+        """
+        now = time.time()
+        with self.lock:
+            entries = list(self.resident.items())
+            spilled = len(self.spilled_ids)
+
+        stats = {
+            'resident_sessions': len(entries),
+            'resident_bytes': sum(entry['bytes'] or 0 for _, entry in entries),
+            'unmeasured_sessions': sum(1 for _, entry in entries if entry['bytes'] is None),
+            'spilled_sessions': spilled,
+            'memory_budget_bytes': int(SessionStoreConfig.MEMORY_BUDGET_MB * 1024 * 1024),
+            'idle_ttl_seconds': SessionStoreConfig.IDLE_TTL_SECONDS,
+            'seconds_since_sweep': round(now - self.last_sweep, 1)
+        }
+        if top:
+            largest = sorted(entries, key=lambda item: item[1]['bytes'] or 0, reverse=True)[:top]
+            stats['largest_sessions'] = [
+                {
+                    'session_id': session_id,
+                    'bytes': entry['bytes'],
+                    'idle_seconds': round(now - entry['last_access'], 1)
+                }
+                for session_id, entry in largest
+            ]
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = self.stats.copy()
+            stats['cached_sessions'] = len(self.cache)
+        stats['backend'] = type(self.backend).__name__
+        stats['shared'] = self.shared
+        stats['memory'] = self.get_memory_stats()
+        return stats
+
+
+def create_session_store(factory: Callable, backend_name: Optional[str] = None) -> SessionStore:
+    """
+    Build the session store for SESSION_STORE_BACKEND
+
+    Falls back to the in-memory backend if the configured one is unavailable.
+    """
+    backend_name = (backend_name or SessionStoreConfig.BACKEND).lower()
+
+    try:
+        if backend_name == 'redis':
+            backend = RedisSessionBackend()
+            backend.redis.ping()
+        elif backend_name == 'sqlite':
+            backend = SQLiteSessionBackend()
+        else:
+            backend = MemorySessionBackend()
+    except Exception as e:
+        print(f"⚠️ Session store backend '{backend_name}' unavailable ({e}) - using in-memory sessions")
+        backend = MemorySessionBackend()
+
+    print(f"✅ Session store: {type(backend).__name__}")
+    return SessionStore(factory, backend)
@@ -0,0 +1,144 @@
+"""
+Single-Flight Analysis for AI-Prism
+Coalesces identical in-flight section analyses into one model call
+
+Two users (or one double-click) analysing the same section with the same
+content, document type and model should pay for one Bedrock call, not two. The
+first caller for a flight key runs the analysis; callers arriving while it is
+in flight wait for it and receive a copy of the same result.
+
+This module is the in-process half (Flask threads, document batch analyzer
+pool). rq_single_flight.py applies the same keys across processes by
+attaching duplicate requests to the in-flight RQ job id.
+"""
+
+import os
+import copy
+import json
+import hashlib
+import threading
+from typing import Dict, Any, Callable, Tuple
+
+
+class SingleFlightConfig:
+    """
+    Single-flight settings (overridable via environment variables)
+    """
+    ENABLED = os.environ.get('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'
+    # Upper bound on how long a Redis flight key may outlive a lost job
+    FLIGHT_TTL_SECONDS = int(os.environ.get('SINGLE_FLIGHT_TTL_SECONDS', '600'))
+
+
+def make_flight_key(section_name: str, content: str, doc_type: str, model_id: str) -> str:
+    """
+    Build the coalescing key for one section analysis
+
+    The section name is part of the prompt and of the stored result, so it is
+    part of the key too.
+
+    Args:
+        section_name: Section title
+        content: Section text
+        doc_type: Document type passed to the analysis
+        model_id: Model the analysis will run on
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    material = json.dumps({
+        'section': section_name,
+        'content': content,
+        'doc_type': doc_type,
+        'model_id': model_id
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    In-process single-flight: one execution per key, shared by concurrent callers
+    """
+
+    def __init__(self):
+        self.flights: Dict[str, _Flight] = {}
+        self.lock = threading.Lock()
+        self.stats = {
+            'executions': 0,
+            'coalesced': 0
+        }
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once per in-flight key
+
+        Args:
+            key: Flight key (see make_flight_key)
+            fn: Performs the analysis
+
+        Returns:
+            (result, shared) - shared is True when the result came from
+            another caller's execution (followers get a deep copy, so callers
+            may mutate what they receive)
+        """
+        if not SingleFlightConfig.ENABLED:
+            return fn(), False
+
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self.stats['coalesced'] += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self.flights[key] = flight
+                self.stats['executions'] += 1
+                leader = True
+
+        if not leader:
+            print(f"🔗 Joined in-flight analysis {key[:12]}", flush=True)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result), True
+
+        try:
+            result = fn()
+        except Exception as e:
+            flight.error = e
+            raise
+        else:
+            flight.result = result
+            return result, False
+        finally:
+            with self.lock:
+                self.flights.pop(key, None)
+            # No new followers can join now - snapshot the result for the
+            # existing ones before the leader's caller can mutate it
+            if flight.waiters and flight.error is None:
+                flight.result = copy.deepcopy(flight.result)
+            flight.done.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = self.stats.copy()
+            stats['in_flight'] = len(self.flights)
+        stats['enabled'] = SingleFlightConfig.ENABLED
+        return stats
+
+
+# Global instance
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight group"""
+    return _single_flight
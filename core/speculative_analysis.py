@@ -0,0 +1,163 @@
+"""
+Speculative Section Pre-Analysis for AI-Prism
+Analyzes upcoming sections in the background before the reviewer opens them
+
+After /upload (and after every section the reviewer opens) the next few
+sections in reading order are analyzed at low priority, so navigating to one
+usually returns instantly instead of waiting 20-60s for Bedrock. Speculation
+only spends spare rate-limit headroom: the number of sections started is
+capped by free concurrency, remaining requests per minute and the token
+budget, minus a share reserved for interactive requests.
+
+Opt-in with SPECULATIVE_ANALYSIS_ENABLED=true.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Iterable, Optional
+
+from core.async_request_manager import get_async_request_manager
+
+
+class SpeculativeConfig:
+    """
+    Speculative analysis settings (overridable via environment variables)
+    """
+    ENABLED = os.environ.get('SPECULATIVE_ANALYSIS_ENABLED', 'false').lower() == 'true'
+    # Sections ahead of the reviewer to pre-analyze
+    LOOKAHEAD_SECTIONS = int(os.environ.get('SPECULATIVE_LOOKAHEAD_SECTIONS', '3'))
+    # Share of spare headroom kept free for interactive requests
+    RESERVED_FRACTION = float(os.environ.get('SPECULATIVE_RESERVED_FRACTION', '0.5'))
+    # In-process pool size (no-Redis mode)
+    MAX_WORKERS = int(os.environ.get('SPECULATIVE_MAX_WORKERS', '2'))
+
+
+def plan_speculative_sections(sections: Dict[str, str], after_section: Optional[str] = None,
+                              skip: Iterable[str] = (), limit: Optional[int] = None) -> List[str]:
+    """
+    Pick the next sections in reading order worth pre-analyzing
+
+    Args:
+        sections: Ordered {section_name: content}
+        after_section: Section the reviewer is on (None = start of document)
+        skip: Sections already analyzed or in flight
+        limit: Maximum sections to return (default LOOKAHEAD_SECTIONS)
+
+    Returns:
+        Section names, nearest first
+    """
+    limit = SpeculativeConfig.LOOKAHEAD_SECTIONS if limit is None else limit
+    names = list(sections.keys())
+    start = names.index(after_section) + 1 if after_section in sections else 0
+    skip = set(skip)
+
+    planned = []
+    for name in names[start:]:
+        if len(planned) >= limit:
+            break
+        if name in skip or not (sections[name] or '').strip():
+            continue
+        planned.append(name)
+    return planned
+
+
+class SpeculativeAnalyzer:
+    """
+    Budgets and runs speculative section analyses
+
+    Args:
+        analyze_fn: Callable(section_name, content) -> analysis result dict,
+                    used by the in-process runner
+    """
+
+    def __init__(self, analyze_fn: Callable, max_workers: Optional[int] = None):
+        self.analyze_fn = analyze_fn
+        self.request_manager = get_async_request_manager()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or SpeculativeConfig.MAX_WORKERS,
+            thread_name_prefix='speculative_analysis'
+        )
+        self.stats = {
+            'scheduled': 0,
+            'skipped_no_headroom': 0,
+            'completed': 0,
+            'failed': 0,
+            'served': 0
+        }
+        self.stats_lock = threading.Lock()
+
+    def _count(self, stat: str, amount: int = 1):
+        with self.stats_lock:
+            self.stats[stat] += amount
+
+    def record_scheduled(self):
+        """Count a speculative analysis started outside the in-process pool (RQ)"""
+        self._count('scheduled')
+
+    def record_served(self):
+        """Count a reviewer request answered from a speculative result"""
+        self._count('served')
+
+    def spare_capacity(self, estimated_tokens: int = 0) -> int:
+        """Number of speculative analyses the current headroom allows"""
+        headroom = self.request_manager.get_headroom()
+
+        slots = headroom['concurrent']
+        if headroom['requests_per_minute'] is not None:
+            slots = min(slots, headroom['requests_per_minute'])
+        if estimated_tokens:
+            slots = min(slots, headroom['tokens_per_minute'] // estimated_tokens)
+
+        return max(0, int(slots * (1 - SpeculativeConfig.RESERVED_FRACTION)))
+
+    def budget(self, sections: Dict[str, str], planned: List[str]) -> List[str]:
+        """Trim a plan to the spare capacity"""
+        if not planned:
+            return planned
+
+        token_counter = self.request_manager.token_counter
+        estimated_tokens = max(token_counter.estimate_tokens(sections[name]) for name in planned)
+        allowed = self.spare_capacity(estimated_tokens)
+
+        if allowed < len(planned):
+            self._count('skipped_no_headroom', len(planned) - allowed)
+        return planned[:allowed]
+
+    def submit(self, results: Dict[str, Any], section_name: str, content: str,
+               on_complete: Optional[Callable] = None):
+        """
+        Analyze a section on the in-process pool
+
+        Args:
+            results: Session-owned {section_name: analysis result} the result is stored in
+            section_name: Section to analyze
+            content: Section text
+            on_complete: Called after a result is stored (e.g. to save the session)
+        """
+        self.record_scheduled()
+        self.executor.submit(self._run, results, section_name, content, on_complete)
+
+    def _run(self, results: Dict[str, Any], section_name: str, content: str,
+             on_complete: Optional[Callable] = None):
+        try:
+            result = self.analyze_fn(section_name, content)
+            if isinstance(result, dict) and not result.get('error'):
+                results[section_name] = result
+                if on_complete:
+                    on_complete()
+                self._count('completed')
+                print(f"🔮 Pre-analyzed section '{section_name}' ({len(result.get('feedback_items', []))} items)", flush=True)
+            else:
+                self._count('failed')
+        except Exception as e:
+            self._count('failed')
+            print(f"⚠️ Speculative analysis of '{section_name}' failed: {e}", flush=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.stats_lock:
+            stats = self.stats.copy()
+        stats['enabled'] = SpeculativeConfig.ENABLED
+        stats['lookahead_sections'] = SpeculativeConfig.LOOKAHEAD_SECTIONS
+        stats['spare_capacity'] = self.spare_capacity()
+        return stats
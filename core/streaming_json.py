@@ -0,0 +1,112 @@
+"""
+Incremental JSON Array Parser for AI-Prism
+Emits each element of a JSON array as soon as the model finishes writing it
+
+Analysis responses look like {"feedback_items": [{...}, {...}], ...} and take
+20-60s to generate. Fed the streamed text fragment by fragment, this parser
+finds the array under the given key and returns every object element the
+moment its closing brace arrives, so the first feedback cards can be shown
+while the rest are still being generated. The complete response is still
+parsed normally at the end; elements are only a preview of it.
+"""
+
+import json
+import re
+from typing import Any, Dict, List
+
+
+class IncrementalArrayParser:
+    """
+    Streams the object elements of one top-level JSON array
+
+    Args:
+        key: Object key holding the array (default 'feedback_items')
+    """
+
+    def __init__(self, key: str = 'feedback_items'):
+        self.key_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self.buffer = ''
+        self.items = []
+
+        # Scanner state
+        self.pos = 0             # Next buffer index to scan
+        self.in_array = False
+        self.done = False
+        self.depth = 0           # Nesting depth inside the current element
+        self.element_start = None
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Add streamed text
+
+        Returns:
+            Elements completed by this fragment, in order
+        """
+        if self.done or not text:
+            return []
+
+        self.buffer += text
+        completed = []
+
+        if not self.in_array:
+            # Key may be split across fragments - rescan a short tail
+            match = self.key_pattern.search(self.buffer, max(0, self.pos - 32))
+            if match is None:
+                self.pos = len(self.buffer)
+                return completed
+            self.in_array = True
+            self.pos = match.end()
+
+        buffer = self.buffer
+        i = self.pos
+        while i < len(buffer):
+            char = buffer[i]
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+
+            elif char == '"':
+                self.in_string = True
+
+            elif char in '{[':
+                if self.depth == 0:
+                    self.element_start = i
+                self.depth += 1
+
+            elif char in '}]':
+                if self.depth == 0:
+                    # End of the array itself
+                    self.done = True
+                    break
+                self.depth -= 1
+                if self.depth == 0:
+                    element = self._parse(buffer[self.element_start:i + 1])
+                    if element is not None:
+                        self.items.append(element)
+                        completed.append(element)
+                    self.element_start = None
+
+            i += 1
+
+        self.pos = i
+        if self.element_start is None and not self.done:
+            # Drop text that can no longer be part of an element
+            self.buffer = buffer[self.pos:]
+            self.pos = 0
+
+        return completed
+
+    @staticmethod
+    def _parse(text: str):
+        try:
+            element = json.loads(text)
+        except ValueError:
+            return None
+        return element if isinstance(element, dict) else None
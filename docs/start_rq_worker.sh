@@ -29,7 +29,9 @@ echo ""
 echo "Starting RQ workers..."
 echo ""
 echo "Queues:"
+echo "  • analysis_interactive (5 min timeout) - Section the reviewer is looking at"
 echo "  • analysis (5 min timeout) - Document section analysis"
+echo "  • analysis_speculative (5 min timeout) - Background pre-analysis"
 echo "  • chat (2 min timeout) - Chat processing"
 echo "  • monitoring (1 min timeout) - Health monitoring"
 echo "  • default - General tasks"
@@ -40,15 +42,15 @@ echo ""
 cd "$(dirname "$0")"
 
 echo "💻 Worker command:"
-echo "   rq worker analysis chat monitoring default --url redis://localhost:6379/0"
+echo "   rq worker -w rq_worker.WarmWorker analysis_interactive chat analysis analysis_speculative monitoring default --url redis://localhost:6379/0"
 echo ""
 
 # Start worker with all queues
 # The worker will pick jobs from any of these queues
 # ✅ OBJC_DISABLE_INITIALIZE_FORK_SAFETY=YES fixes macOS fork() issues with Objective-C runtime
-OBJC_DISABLE_INITIALIZE_FORK_SAFETY=YES rq worker analysis chat monitoring default --url redis://localhost:6379/0
+OBJC_DISABLE_INITIALIZE_FORK_SAFETY=YES rq worker -w rq_worker.WarmWorker analysis_interactive chat analysis analysis_speculative monitoring default --url redis://localhost:6379/0
 
 # Note: To run multiple workers in parallel, use:
-# rq worker analysis &
+# rq worker analysis_interactive analysis analysis_speculative &
 # rq worker chat &
 # rq worker monitoring default &
@@ -1,69 +1,329 @@
 #!/usr/bin/env python3
 """
 AI-Prism Main Entry Point
-Single file to start everything - Flask + Celery Worker
+Single file to start everything - web server + RQ workers
 Works on both local development and App Runner
+
+Development mode runs the Flask dev server with RQ workers in the background.
+Production mode (SERVER_MODE=production, the default when FLASK_ENV=production)
+runs a preforking gunicorn server with the app preloaded in the master, and
+supervises RQ_WORKERS warm RQ workers next to it:
+
+    SIGTERM / SIGINT - graceful stop (RQ workers finish their current job)
+    SIGHUP           - graceful restart (gunicorn reloads its workers, RQ
+                       workers are replaced one at a time)
+
+Crashed processes are restarted with exponential backoff.
 """
 
 import os
 import sys
+import time
+import shutil
 import subprocess
 import signal
+import threading
 
 # Set default environment variables BEFORE any imports
 os.environ.setdefault('S3_BUCKET_NAME', 'felix-s3-bucket')
 os.environ.setdefault('S3_BASE_PATH', 'tara/')
 os.environ.setdefault('AWS_REGION', 'us-east-1')
-os.environ.setdefault('CELERY_RESULT_BACKEND', 's3://felix-s3-bucket/tara/celery-results/')
 os.environ.setdefault('FLASK_ENV', 'development')
 os.environ.setdefault('PORT', '8080')
-os.environ.setdefault('CELERY_BROKER_URL', 'sqs://')
-os.environ.setdefault('SQS_QUEUE_PREFIX', 'aiprism-')
+os.environ.setdefault('REDIS_URL', 'redis://localhost:6379/0')
 
-def start_celery_worker():
-    """Start Celery worker as subprocess"""
-    print("🔧 Starting Celery worker in background...")
-    sys.stdout.flush()
 
+def _available_cpus():
+    """CPUs this process may run on (respects container CPU affinity)"""
     try:
-        import subprocess
-
-        # Build celery command
-        celery_cmd = [
-            'celery',
-            '-A', 'celery_config.celery_app',
-            'worker',
-            '--loglevel=INFO',
-            '--concurrency=4',
-            '--queues=analysis,chat,monitoring,celery',
-            '--pool=solo',
-            '--without-gossip',
-            '--without-mingle',
-            '--without-heartbeat',
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class ServerConfig:
+    """
+    Launch settings (overridable via environment variables)
+    """
+    MODE = os.environ.get(
+        'SERVER_MODE', 'production' if os.environ.get('FLASK_ENV') == 'production' else 'development'
+    ).lower()
+
+    # Preforked web server (production mode)
+    WEB_WORKERS = int(os.environ.get('WEB_WORKERS', str(_available_cpus())))
+    # gthread: every open /events or /chat/stream connection holds one thread
+    # for its whole lifetime, so size WEB_THREADS for the expected SSE clients
+    # per worker plus headroom for ordinary requests.
+    # gevent: one greenlet per connection, up to WEB_WORKER_CONNECTIONS
+    WEB_WORKER_CLASS = os.environ.get('WEB_WORKER_CLASS', 'gthread').lower()
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', '32'))
+    WEB_WORKER_CONNECTIONS = int(os.environ.get('WEB_WORKER_CONNECTIONS', '1000'))
+    WEB_TIMEOUT = int(os.environ.get('WEB_TIMEOUT', '120'))
+    WEB_GRACEFUL_TIMEOUT = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', '30'))
+    # Recycle a web worker after this many requests (0 = never)
+    WEB_MAX_REQUESTS = int(os.environ.get('WEB_MAX_REQUESTS', '0'))
+
+    # Supervised RQ workers
+    RQ_WORKERS = int(os.environ.get(
+        'RQ_WORKERS', str(_available_cpus()) if MODE == 'production' else '1'
+    ))
+    RQ_QUEUES = os.environ.get(
+        'RQ_QUEUES', 'analysis_interactive chat analysis analysis_speculative monitoring default'
+    ).replace(',', ' ').split()
+    RQ_WORKER_CLASS = os.environ.get('RQ_WORKER_CLASS', 'rq_worker.WarmWorker')
+    # Seconds a stopping RQ worker gets to finish its current job
+    RQ_SHUTDOWN_TIMEOUT = int(os.environ.get('RQ_SHUTDOWN_TIMEOUT', '300'))
+
+    # Restart backoff for crashed processes
+    RESTART_BACKOFF_SECONDS = float(os.environ.get('RESTART_BACKOFF_SECONDS', '1'))
+    RESTART_BACKOFF_MAX_SECONDS = float(os.environ.get('RESTART_BACKOFF_MAX_SECONDS', '60'))
+
+
+def start_rq_worker(index):
+    """Start one RQ worker as subprocess"""
+    rq_cmd = [
+        'rq', 'worker',
+        '--worker-class', ServerConfig.RQ_WORKER_CLASS,
+        '--url', os.environ['REDIS_URL'],
+        *ServerConfig.RQ_QUEUES
+    ]
+
+    rq_process = subprocess.Popen(
+        rq_cmd,
+        env=os.environ.copy(),
+        # Don't capture output - let it print to console for debugging
+        stdout=None,
+        stderr=None
+    )
+
+    print(f"✅ RQ worker {index} started (PID: {rq_process.pid})")
+    sys.stdout.flush()
+    return rq_process
+
+
+def start_web_server():
+    """Start the preforking gunicorn server as subprocess (production mode)"""
+    port = int(os.environ.get('PORT', 8080))
+
+    gunicorn_cmd = [sys.executable, '-m', 'gunicorn', '--workers', str(ServerConfig.WEB_WORKERS)]
+    if ServerConfig.WEB_WORKER_CLASS == 'gevent':
+        # No --preload: gevent must monkey-patch before the app creates its
+        # locks, pools and Redis/boto3 clients, which happens in each worker
+        gunicorn_cmd += [
+            '--worker-class', 'gevent',
+            '--worker-connections', str(ServerConfig.WEB_WORKER_CONNECTIONS),
+        ]
+        capacity = f"{ServerConfig.WEB_WORKER_CONNECTIONS} connections"
+    else:
+        gunicorn_cmd += [
+            '--preload',
+            '--worker-class', 'gthread',
+            '--threads', str(ServerConfig.WEB_THREADS),
         ]
+        capacity = f"{ServerConfig.WEB_THREADS} threads"
+    gunicorn_cmd += [
+        '--bind', f'0.0.0.0:{port}',
+        '--timeout', str(ServerConfig.WEB_TIMEOUT),
+        '--graceful-timeout', str(ServerConfig.WEB_GRACEFUL_TIMEOUT),
+        '--access-logfile', '-',
+        '--error-logfile', '-',
+    ]
+    if ServerConfig.WEB_MAX_REQUESTS > 0:
+        gunicorn_cmd += [
+            '--max-requests', str(ServerConfig.WEB_MAX_REQUESTS),
+            '--max-requests-jitter', str(max(1, ServerConfig.WEB_MAX_REQUESTS // 10)),
+        ]
+    gunicorn_cmd.append('app:app')
+
+    web_process = subprocess.Popen(gunicorn_cmd, env=os.environ.copy(), stdout=None, stderr=None)
+
+    print(f"✅ Web server started (PID: {web_process.pid}) - {ServerConfig.WEB_WORKERS} "
+          f"{ServerConfig.WEB_WORKER_CLASS} workers x {capacity} on http://0.0.0.0:{port}")
+    sys.stdout.flush()
+    return web_process
+
+
+class ProcessSupervisor:
+    """
+    Keeps a set of named child processes running
+
+    Each child has a start function returning a Popen. Children that exit
+    are restarted with exponential backoff; stop() and restart() terminate
+    them gracefully (SIGTERM, then SIGKILL after a timeout).
+    """
+
+    def __init__(self):
+        self.children = {}  # name -> {'start', 'process', 'failures', 'restart_at', 'stop_timeout', 'reload_signal'}
+        self.lock = threading.RLock()
+        self.stopping = False
+
+    def add(self, name, start, stop_timeout=30, reload_signal=None):
+        """
+        Register and start a child
+
+        Args:
+            name: Unique child name
+            start: Callable returning a subprocess.Popen
+            stop_timeout: Seconds to wait after SIGTERM before SIGKILL
+            reload_signal: Signal that makes the child reload itself (None =
+                           restart() replaces the process instead)
+        """
+        with self.lock:
+            self.children[name] = {
+                'start': start,
+                'process': None,
+                'failures': 0,
+                'restart_at': 0.0,
+                'stop_timeout': stop_timeout,
+                'reload_signal': reload_signal
+            }
+            self._spawn(name)
 
-        # Start Celery worker as subprocess
-        # Pass current environment to subprocess
-        env = os.environ.copy()
+    def _spawn(self, name):
+        child = self.children[name]
+        try:
+            child['process'] = child['start']()
+        except Exception as e:
+            print(f"⚠️  Could not start {name}: {e}")
+            child['process'] = None
+            self._schedule_restart(name)
 
-        celery_process = subprocess.Popen(
-            celery_cmd,
-            env=env,
-            # Don't capture output - let it print to console for debugging
-            stdout=None,
-            stderr=None
+    def _schedule_restart(self, name):
+        child = self.children[name]
+        child['failures'] += 1
+        delay = min(
+            ServerConfig.RESTART_BACKOFF_MAX_SECONDS,
+            ServerConfig.RESTART_BACKOFF_SECONDS * (2 ** (child['failures'] - 1))
         )
+        child['restart_at'] = time.time() + delay
+        print(f"🔄 Restarting {name} in {delay:.0f}s")
+        sys.stdout.flush()
+
+    def poll(self):
+        """Restart children that exited"""
+        with self.lock:
+            if self.stopping:
+                return
+            now = time.time()
+            for name, child in self.children.items():
+                process = child['process']
+                if process is not None:
+                    code = process.poll()
+                    if code is None:
+                        # Running long enough - forget earlier crashes
+                        if child['failures'] and now - child['restart_at'] > ServerConfig.RESTART_BACKOFF_MAX_SECONDS:
+                            child['failures'] = 0
+                        continue
+                    print(f"⚠️  {name} (PID: {process.pid}) exited with code {code}")
+                    child['process'] = None
+                    self._schedule_restart(name)
+                elif now >= child['restart_at']:
+                    self._spawn(name)
+
+    def _stop_process(self, name, process):
+        """SIGTERM one process and wait for it, SIGKILL on timeout"""
+        if process is None or process.poll() is not None:
+            return
 
-        print(f"✅ Celery worker started (PID: {celery_process.pid})")
+        timeout = self.children[name]['stop_timeout']
+        print(f"   Stopping {name} (PID: {process.pid})")
         sys.stdout.flush()
+        process.terminate()
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            print(f"   {name} did not stop in {timeout}s - killing")
+            process.kill()
+            process.wait()
 
-        return celery_process
+    def _terminate(self, name):
+        child = self.children[name]
+        process, child['process'] = child['process'], None
+        self._stop_process(name, process)
+
+    def restart(self):
+        """
+        Graceful rolling restart, one child at a time
+
+        Each replacement is started before the old process is stopped, so
+        capacity never drops by more than one process.
+        """
+        with self.lock:
+            for name, child in self.children.items():
+                process = child['process']
+                if child['reload_signal'] is not None and process is not None and process.poll() is None:
+                    print(f"🔄 Reloading {name} (PID: {process.pid})")
+                    process.send_signal(child['reload_signal'])
+                    continue
+                child['failures'] = 0
+                self._spawn(name)
+                self._stop_process(name, process)
+
+    def stop(self):
+        """Stop all children in parallel and wait for them"""
+        with self.lock:
+            self.stopping = True
+            names = list(self.children)
+
+        threads = [threading.Thread(target=self._terminate, args=(name,)) for name in names]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def alive_count(self):
+        with self.lock:
+            return sum(
+                1 for child in self.children.values()
+                if child['process'] is not None and child['process'].poll() is None
+            )
+
+
+def start_rq_workers(supervisor, count):
+    """Start `count` supervised RQ workers"""
+    if count <= 0:
+        return 0
+
+    print(f"🔧 Starting {count} RQ worker(s) in background...")
+    sys.stdout.flush()
+
+    if shutil.which('rq') is None:
+        print("⚠️  rq command not found - install rq or run workers separately")
+        return 0
+
+    for index in range(count):
+        supervisor.add(
+            f"rq-worker-{index}",
+            lambda index=index: start_rq_worker(index),
+            stop_timeout=ServerConfig.RQ_SHUTDOWN_TIMEOUT
+        )
+    return count
+
+
+def configure_production_env():
+    """
+    Environment defaults that preforked web workers need
+
+    Review sessions (and the /analyze_document status snapshots kept in them)
+    must live in a shared store. The local task queue keeps task ids in one
+    process, so it pins the server to a single web worker.
+    """
+    backend = os.environ.get('SESSION_STORE_BACKEND')
+    local_tasks = os.environ.get('LOCAL_TASK_QUEUE_ENABLED', 'false').lower() == 'true'
+    if ServerConfig.WEB_WORKERS > 1 and local_tasks:
+        print("⚠️  LOCAL_TASK_QUEUE_ENABLED=true keeps task status per process - "
+              "running a single web worker (use RQ to scale out)")
+        ServerConfig.WEB_WORKERS = 1
+    if ServerConfig.WEB_WORKERS > 1:
+        if backend is None:
+            # Review sessions must be visible to every web worker
+            os.environ['SESSION_STORE_BACKEND'] = 'sqlite'
+            print("ℹ️  SESSION_STORE_BACKEND not set - using sqlite so web workers share sessions")
+        elif backend.lower() == 'memory':
+            print("⚠️  SESSION_STORE_BACKEND=memory keeps sessions per process - "
+                  "running a single web worker (use redis or sqlite to scale out)")
+            ServerConfig.WEB_WORKERS = 1
 
-    except Exception as e:
-        print(f"⚠️  Celery worker error: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
 
 def start_flask_app():
     """Start Flask app"""
@@ -89,53 +349,106 @@ def start_flask_app():
         threaded=True
     )
 
+
+def run_production():
+    """Preforked web server + supervised RQ workers (blocks until stopped)"""
+    configure_production_env()
+
+    supervisor = ProcessSupervisor()
+    events = {'stop': False, 'restart': False}
+
+    def request_stop(signum, frame):
+        events['stop'] = True
+
+    def request_restart(signum, frame):
+        events['restart'] = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGHUP, request_restart)
+
+    supervisor.add(
+        'web',
+        start_web_server,
+        stop_timeout=ServerConfig.WEB_GRACEFUL_TIMEOUT + 5,
+        reload_signal=signal.SIGHUP
+    )
+    start_rq_workers(supervisor, ServerConfig.RQ_WORKERS)
+
+    while not events['stop']:
+        if events['restart']:
+            events['restart'] = False
+            print("\n🔄 Graceful restart requested")
+            supervisor.restart()
+        supervisor.poll()
+        time.sleep(1)
+
+    print("\n🛑 Shutting down...")
+    supervisor.stop()
+    print("✅ Cleanup complete")
+
+
+def run_development():
+    """Flask dev server + background RQ workers (blocks until Ctrl+C)"""
+    supervisor = ProcessSupervisor()
+
+    # Check if we're on App Runner or similar managed environment
+    is_managed_env = os.environ.get('AWS_EXECUTION_ENV', '').startswith('AWS_ECS_')
+
+    if not is_managed_env:
+        # Local development - start RQ workers as subprocesses
+        if start_rq_workers(supervisor, ServerConfig.RQ_WORKERS):
+            def watch():
+                while not supervisor.stopping:
+                    supervisor.poll()
+                    time.sleep(1)
+
+            threading.Thread(target=watch, daemon=True, name='rq_supervisor').start()
+    else:
+        print("ℹ️  Running in managed environment (App Runner)")
+        print("   RQ workers should be running separately")
+        print()
+
+    try:
+        # Start Flask app (blocks until shutdown)
+        start_flask_app()
+    finally:
+        supervisor.stop()
+
+
 def main():
     """Main entry point"""
     print("=" * 60)
     print("AI-Prism Document Analysis Platform")
     print("=" * 60)
     print(f"Environment: {os.environ.get('FLASK_ENV', 'development')}")
+    print(f"Server mode: {ServerConfig.MODE}")
     print(f"Port: {os.environ.get('PORT', 8080)}")
     print(f"AWS Region: {os.environ.get('AWS_REGION', 'us-east-1')}")
     print(f"S3 Bucket: {os.environ.get('S3_BUCKET_NAME', 'felix-s3-bucket')}")
-    print(f"Celery Backend: {os.environ.get('CELERY_RESULT_BACKEND', 's3://...')}")
+    print(f"Redis: {os.environ.get('REDIS_URL')}")
+    if ServerConfig.MODE == 'production':
+        if ServerConfig.WEB_WORKER_CLASS == 'gevent':
+            print(f"Web workers: {ServerConfig.WEB_WORKERS} gevent x {ServerConfig.WEB_WORKER_CONNECTIONS} connections")
+        else:
+            print(f"Web workers: {ServerConfig.WEB_WORKERS} gthread x {ServerConfig.WEB_THREADS} threads")
+    print(f"RQ workers: {ServerConfig.RQ_WORKERS} ({', '.join(ServerConfig.RQ_QUEUES)})")
     print("=" * 60)
     print()
 
-    celery_process = None
-
     try:
-        # Check if we're on App Runner or similar managed environment
-        is_managed_env = os.environ.get('AWS_EXECUTION_ENV', '').startswith('AWS_ECS_')
-
-        if not is_managed_env:
-            # Local development - start Celery worker as subprocess
-            celery_process = start_celery_worker()
-
-            # Give Celery a moment to start
-            import time
-            time.sleep(3)
+        if ServerConfig.MODE == 'production':
+            run_production()
         else:
-            print("ℹ️  Running in managed environment (App Runner)")
-            print("   Celery worker should be running separately")
-            print()
-
-        # Start Flask app (blocks until shutdown)
-        start_flask_app()
+            run_development()
 
     except KeyboardInterrupt:
         print("\n🛑 Shutting down...")
-        if celery_process:
-            print(f"   Stopping Celery worker (PID: {celery_process.pid})")
-            celery_process.terminate()
-            celery_process.wait(timeout=5)
         print("✅ Cleanup complete")
     except Exception as e:
         print(f"\n❌ Fatal error: {e}")
         import traceback
         traceback.print_exc()
-        if celery_process:
-            celery_process.terminate()
         return 1
 
     return 0
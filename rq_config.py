@@ -28,6 +28,9 @@ redis_conn = Redis.from_url(REDIS_URL, decode_responses=False)
 # Create task queues
 # Separate queues for different task types (optional, but organized)
 analysis_queue = Queue('analysis', connection=redis_conn, default_timeout=300)  # 5 min timeout
+# Analysis priority lanes (see rq_fair_scheduler.py) - 'analysis' is the normal lane
+analysis_interactive_queue = Queue('analysis_interactive', connection=redis_conn, default_timeout=300)
+analysis_speculative_queue = Queue('analysis_speculative', connection=redis_conn, default_timeout=300)
 chat_queue = Queue('chat', connection=redis_conn, default_timeout=120)  # 2 min timeout
 monitoring_queue = Queue('monitoring', connection=redis_conn, default_timeout=60)  # 1 min timeout
 
@@ -39,13 +42,16 @@ def get_queue(queue_name='default'):
     Get a queue by name
 
     Args:
-        queue_name: One of 'analysis', 'chat', 'monitoring', 'default'
+        queue_name: One of 'analysis_interactive', 'analysis', 'analysis_speculative',
+                    'chat', 'monitoring', 'default'
 
     Returns:
         RQ Queue instance
     """
     queues = {
+        'analysis_interactive': analysis_interactive_queue,
         'analysis': analysis_queue,
+        'analysis_speculative': analysis_speculative_queue,
         'chat': chat_queue,
         'monitoring': monitoring_queue,
         'default': default_queue
@@ -75,7 +81,7 @@ if __name__ != "__main__":
         redis_conn.ping()
         print("✅ RQ configured with local Redis (No AWS costs!)")
         print(f"   Redis URL: {REDIS_URL}")
-        print(f"   Queues: analysis, chat, monitoring, default")
+        print(f"   Queues: analysis_interactive, analysis, analysis_speculative, chat, monitoring, default")
         print(f"   Free & Open Source: 100%")
     except Exception as e:
         print(f"⚠️  Could not connect to Redis: {e}")
@@ -0,0 +1,131 @@
+"""
+RQ Task Events for AI-Prism
+Push task lifecycle events to the browser through Redis pub/sub
+
+RQ jobs publish 'started', 'progress', 'finished' and 'failed' events on a
+per-session channel. The Flask /events/<session_id> endpoint subscribes to
+that channel and relays the events as Server-Sent Events, so the browser no
+longer has to poll /task_status/<task_id> (which stays as a fallback).
+
+Jobs find their session through job.meta['session_id'], set at enqueue time:
+
+    queue.enqueue(analyze_section_task, args=(...), meta={'session_id': session_id, 'task_type': 'analysis'})
+
+Other sessions attached to the same job (single-flight, see
+rq_single_flight.py) are registered with add_job_watcher and receive the
+job's events on their own channels too.
+"""
+
+import json
+import time
+from typing import Dict, Any, List, Optional, Iterator
+
+from rq import get_current_job
+
+from rq_config import redis_conn
+
+
+EVENTS_CHANNEL_PREFIX = 'aiprism:events:'
+WATCHERS_KEY_PREFIX = 'aiprism:watchers:'
+
+
+def session_channel(session_id: str) -> str:
+    """Redis pub/sub channel carrying events for one review session"""
+    return f"{EVENTS_CHANNEL_PREFIX}{session_id}"
+
+
+def publish_event(session_id: str, event: str, payload: Dict[str, Any]) -> int:
+    """
+    Publish one event to a session channel
+
+    Returns:
+        Number of subscribers that received it (0 on error)
+    """
+    message = dict(payload, event=event, timestamp=time.time())
+    try:
+        return redis_conn.publish(session_channel(session_id), json.dumps(message, default=str))
+    except Exception as e:
+        print(f"⚠️ Could not publish {event} event for session {session_id}: {e}")
+        return 0
+
+
+def add_job_watcher(job_id: str, session_id: str, ttl: int = 3600):
+    """Also deliver a job's events to another session's channel"""
+    key = f"{WATCHERS_KEY_PREFIX}{job_id}"
+    try:
+        pipe = redis_conn.pipeline()
+        pipe.sadd(key, session_id)
+        pipe.expire(key, ttl)
+        pipe.execute()
+    except Exception as e:
+        print(f"⚠️ Could not register session {session_id} as watcher of {job_id}: {e}")
+
+
+def get_job_watchers(job_id: str) -> List[str]:
+    """Sessions attached to a job besides its own"""
+    try:
+        members = redis_conn.smembers(f"{WATCHERS_KEY_PREFIX}{job_id}")
+    except Exception:
+        return []
+    return [m.decode('utf-8') if isinstance(m, bytes) else m for m in members]
+
+
+def publish_job_event(event: str, **payload) -> int:
+    """
+    Publish an event for the RQ job currently executing
+
+    Published to the job's session and every attached watcher session. No-op
+    outside an RQ job or when the job was enqueued without a session_id (e.g.
+    tasks called in-process by the document batch analyzer).
+    """
+    job = get_current_job()
+    if job is None:
+        return 0
+
+    session_ids = [job.meta.get('session_id')] + get_job_watchers(job.id)
+    session_ids = [s for s in dict.fromkeys(session_ids) if s]
+    if not session_ids:
+        return 0
+
+    payload.update({
+        'task_id': job.id,
+        'task_type': job.meta.get('task_type')
+    })
+    return sum(publish_event(session_id, event, payload) for session_id in session_ids)
+
+
+def listen_session_events(session_id: str, heartbeat_seconds: float = 15.0) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Subscribe to a session channel and yield events as they arrive
+
+    Yields:
+        Event dicts, or None every heartbeat_seconds of silence so the caller
+        can send a keep-alive and notice disconnected clients
+    """
+    pubsub = redis_conn.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(session_channel(session_id))
+
+    try:
+        while True:
+            message = pubsub.get_message(timeout=heartbeat_seconds)
+            if message is None:
+                yield None
+                continue
+
+            if message.get('type') != 'message':
+                continue
+
+            data = message['data']
+            if isinstance(data, bytes):
+                data = data.decode('utf-8')
+
+            try:
+                yield json.loads(data)
+            except ValueError:
+                print(f"⚠️ Ignoring malformed event on {session_channel(session_id)}")
+    finally:
+        try:
+            pubsub.unsubscribe()
+            pubsub.close()
+        except Exception:
+            pass
@@ -0,0 +1,318 @@
+"""
+Fair Scheduler for the AI-Prism RQ Analysis Queue
+Priority lanes with round-robin fairness across review sessions
+
+A single FIFO lets one "analyze everything" burst starve every other user's
+interactive clicks. Instead, analysis jobs are submitted here:
+
+1. Priority lanes - each lane is its own RQ queue, and workers listen to them
+   in priority order, so interactive work always goes first:
+       analysis_interactive > analysis (normal) > analysis_speculative
+2. Per-session fairness - jobs wait in per-session backlogs in Redis and are
+   released into their lane's RQ queue round-robin across sessions. Only
+   DISPATCH_DEPTH jobs per lane sit in RQ at a time, so a session's 20-job
+   burst interleaves with other sessions instead of queueing ahead of them.
+3. Metrics - per-lane backlog depth, RQ depth and submit-to-start wait times.
+
+Backlogs are released on submit, when a scheduled job finishes and, as a
+safety net for jobs that die without reaching on_job_finished (timeouts,
+killed work-horses), every DISPATCH_INTERVAL_SECONDS from each RQ worker
+(see start_periodic_dispatch and rq_worker.WarmWorkerMixin).
+
+Workers must listen to the lanes in priority order:
+
+    rq worker analysis_interactive chat analysis analysis_speculative monitoring default
+"""
+
+import os
+import time
+import threading
+from typing import Dict, Any, Optional
+
+from rq import get_current_job
+from rq.job import Job
+
+from rq_config import redis_conn, get_queue
+
+
+class SchedulerConfig:
+    """
+    Scheduler settings (overridable via environment variables)
+    """
+    ENABLED = os.environ.get('RQ_FAIR_SCHEDULER_ENABLED', 'true').lower() == 'true'
+    # Jobs per lane released into RQ ahead of the workers
+    DISPATCH_DEPTH = int(os.environ.get('RQ_SCHEDULER_DISPATCH_DEPTH', '2'))
+    # Wait-time samples kept per lane
+    WAIT_SAMPLES = int(os.environ.get('RQ_SCHEDULER_WAIT_SAMPLES', '200'))
+    # Periodic dispatch from RQ workers (0 = only on submit / job finish)
+    DISPATCH_INTERVAL_SECONDS = float(os.environ.get('RQ_SCHEDULER_DISPATCH_INTERVAL', '5'))
+
+
+# Highest priority first; values are RQ queue names
+LANES = {
+    'interactive': 'analysis_interactive',
+    'normal': 'analysis',
+    'speculative': 'analysis_speculative'
+}
+
+KEY_PREFIX = 'aiprism:sched'
+
+
+def _key(*parts) -> str:
+    return ':'.join((KEY_PREFIX,) + parts)
+
+
+class FairScheduler:
+    """
+    Redis-backed lane + round-robin dispatcher in front of queue.enqueue
+
+    State (all in Redis, so every app process and worker shares it):
+        {lane}:ring              - round-robin list of sessions with backlog
+        {lane}:backlog:{session} - job ids waiting for that session
+        {lane}:waits             - recent submit-to-start waits (seconds)
+    """
+
+    def __init__(self, connection=None):
+        self.connection = connection or redis_conn
+        self._dispatch_thread = None
+
+    def _lock(self, blocking_timeout: Optional[float] = 5):
+        return self.connection.lock(_key('lock'), timeout=10, blocking_timeout=blocking_timeout)
+
+    def submit(self, func, args=(), session_id: Optional[str] = None, lane: str = 'interactive',
+               job_timeout: int = 300, meta: Optional[Dict[str, Any]] = None,
+               job_id: Optional[str] = None) -> Job:
+        """
+        Create a job and queue it in a lane's per-session backlog
+
+        Args:
+            func: RQ task function
+            args: Task arguments
+            session_id: Owning review session (fairness key)
+            lane: 'interactive', 'normal' or 'speculative'
+            job_timeout: RQ job timeout in seconds
+            meta: Extra job.meta fields
+            job_id: Preassigned job id (e.g. claimed by single-flight)
+
+        Returns:
+            The RQ Job (status 'queued' until a worker picks it up)
+        """
+        if lane not in LANES:
+            raise ValueError(f"Unknown scheduler lane: {lane}")
+
+        queue = get_queue(LANES[lane])
+        job_meta = dict(meta or {})
+        job_meta.update({
+            'session_id': session_id,
+            'lane': lane,
+            'submitted_at': time.time()
+        })
+
+        if not SchedulerConfig.ENABLED:
+            return queue.enqueue(func, args=args, job_timeout=job_timeout, meta=job_meta, job_id=job_id)
+
+        fairness_key = session_id or 'anonymous'
+        with self._lock():
+            # Job hash and backlog entry are written together under the lock,
+            # so a lock timeout never leaves a saved job that nothing dispatches
+            job = queue.create_job(func, args=args, timeout=job_timeout, meta=job_meta, job_id=job_id)
+            backlog_key = _key(lane, 'backlog', fairness_key)
+            pipe = self.connection.pipeline()
+            job.save(pipeline=pipe)
+            pipe.rpush(backlog_key, job.id)
+            pipe.llen(backlog_key)
+            backlog_length = pipe.execute()[-1]
+
+            # First job for this session in the lane - join the rotation
+            if backlog_length == 1:
+                self.connection.rpush(_key(lane, 'ring'), fairness_key)
+
+            self._dispatch_locked()
+
+        return job
+
+    def promote(self, job_id: str, lane: str = 'interactive') -> bool:
+        """
+        Move a waiting job into a higher-priority lane
+
+        Used when a reviewer opens a section whose speculative job has not
+        started yet. Returns True if the job was moved.
+        """
+        if lane not in LANES:
+            raise ValueError(f"Unknown scheduler lane: {lane}")
+        if not SchedulerConfig.ENABLED:
+            return False
+
+        lane_order = list(LANES)
+        try:
+            job = Job.fetch(job_id, connection=self.connection)
+        except Exception:
+            return False
+
+        current = job.meta.get('lane')
+        if current not in LANES or lane_order.index(current) <= lane_order.index(lane):
+            return False
+
+        with self._lock():
+            if job.get_status(refresh=True) != 'queued':
+                return False
+
+            fairness_key = job.meta.get('session_id') or 'anonymous'
+            if not self.connection.lrem(_key(current, 'backlog', fairness_key), 0, job.id):
+                # Already released into the lower lane's RQ queue
+                get_queue(LANES[current]).remove(job)
+
+            job.meta['lane'] = lane
+            job.save_meta()
+
+            # Front of the session's backlog in the new lane
+            backlog_key = _key(lane, 'backlog', fairness_key)
+            if self.connection.lpush(backlog_key, job.id) == 1:
+                self.connection.rpush(_key(lane, 'ring'), fairness_key)
+
+            self._dispatch_locked()
+
+        print(f"⏫ Promoted job {job.id} from {current} to {lane} lane")
+        return True
+
+    def dispatch(self, blocking: bool = True):
+        """
+        Release backlog jobs into lanes with free dispatch slots
+
+        Args:
+            blocking: Wait for the scheduler lock; when False, skip this round
+                      if another process is already dispatching
+        """
+        if not SchedulerConfig.ENABLED:
+            return
+
+        lock = self._lock()
+        try:
+            if not lock.acquire(blocking=blocking):
+                return
+            try:
+                self._dispatch_locked()
+            finally:
+                lock.release()
+        except Exception as e:
+            print(f"⚠️ Scheduler dispatch failed: {e}")
+
+    def start_periodic_dispatch(self, interval: Optional[float] = None):
+        """Dispatch every interval seconds on a daemon thread (idempotent)"""
+        interval = SchedulerConfig.DISPATCH_INTERVAL_SECONDS if interval is None else interval
+        if not SchedulerConfig.ENABLED or interval <= 0:
+            return
+        if self._dispatch_thread is not None and self._dispatch_thread.is_alive():
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.dispatch(blocking=False)
+
+        self._dispatch_thread = threading.Thread(target=loop, name='fair_scheduler_dispatch', daemon=True)
+        self._dispatch_thread.start()
+
+    def _dispatch_locked(self):
+        for lane, queue_name in LANES.items():
+            queue = get_queue(queue_name)
+            ring_key = _key(lane, 'ring')
+
+            while queue.count < SchedulerConfig.DISPATCH_DEPTH:
+                session_key = self.connection.lpop(ring_key)
+                if session_key is None:
+                    break
+
+                session_key = session_key.decode('utf-8') if isinstance(session_key, bytes) else session_key
+                backlog_key = _key(lane, 'backlog', session_key)
+                job_id = self.connection.lpop(backlog_key)
+
+                # Still has work - back of the rotation
+                if self.connection.llen(backlog_key):
+                    self.connection.rpush(ring_key, session_key)
+
+                if job_id is None:
+                    continue
+
+                job_id = job_id.decode('utf-8') if isinstance(job_id, bytes) else job_id
+                try:
+                    job = Job.fetch(job_id, connection=self.connection)
+                except Exception:
+                    # Expired or deleted while waiting
+                    continue
+
+                if job.get_status(refresh=False) in ('canceled', 'stopped'):
+                    continue
+
+                queue.enqueue_job(job)
+
+    def on_job_started(self):
+        """Record submit-to-start wait for the current job (called by tasks)"""
+        job = get_current_job()
+        if job is None or 'lane' not in job.meta:
+            return
+
+        wait = time.time() - job.meta.get('submitted_at', time.time())
+        waits_key = _key(job.meta['lane'], 'waits')
+        try:
+            pipe = self.connection.pipeline()
+            pipe.lpush(waits_key, round(wait, 3))
+            pipe.ltrim(waits_key, 0, SchedulerConfig.WAIT_SAMPLES - 1)
+            pipe.execute()
+        except Exception as e:
+            print(f"⚠️ Could not record scheduler wait time: {e}")
+
+    def on_job_finished(self):
+        """Refill the lanes once a scheduled job completes (called by tasks)"""
+        job = get_current_job()
+        if job is not None and 'lane' in job.meta:
+            self.dispatch()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-lane backlog/queue depth and wait times"""
+        lanes = {}
+        for lane, queue_name in LANES.items():
+            queue = get_queue(queue_name)
+            sessions = [s.decode('utf-8') if isinstance(s, bytes) else s
+                        for s in self.connection.lrange(_key(lane, 'ring'), 0, -1)]
+
+            pipe = self.connection.pipeline()
+            for session_key in sessions:
+                pipe.llen(_key(lane, 'backlog', session_key))
+            backlog_lengths = pipe.execute() if sessions else []
+
+            waits = sorted(float(w) for w in self.connection.lrange(_key(lane, 'waits'), 0, -1))
+
+            lanes[lane] = {
+                'queue': queue_name,
+                'backlog': sum(backlog_lengths),
+                'sessions_waiting': len(sessions),
+                'queued_in_rq': queue.count,
+                'running': queue.started_job_registry.count,
+                'wait_samples': len(waits),
+                'wait_avg': round(sum(waits) / len(waits), 2) if waits else None,
+                'wait_p95': waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else None,
+                'wait_max': waits[-1] if waits else None
+            }
+
+        return {
+            'enabled': SchedulerConfig.ENABLED,
+            'dispatch_depth': SchedulerConfig.DISPATCH_DEPTH,
+            'lanes': lanes
+        }
+
+
+# Global instance
+_fair_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_fair_scheduler() -> FairScheduler:
+    """Get or create the process-wide fair scheduler"""
+    global _fair_scheduler
+
+    with _scheduler_lock:
+        if _fair_scheduler is None:
+            _fair_scheduler = FairScheduler()
+
+        return _fair_scheduler
@@ -0,0 +1,124 @@
+"""
+Single-Flight RQ Jobs for AI-Prism
+Attaches duplicate analysis requests to the in-flight RQ job
+
+The first /analyze_section request for a flight key (hash of section name,
+text, doc type and model - see core/single_flight.py) claims the key in Redis
+with the id its job will get. Identical requests from any Flask process then
+receive that job id instead of enqueueing a second job, and their session is
+registered as a watcher so it also receives the job's pushed events. The task
+releases the key just before it publishes its final event.
+"""
+
+import uuid
+from typing import Dict, Any, Optional, Tuple
+
+from rq import get_current_job
+from rq.job import Job
+
+from rq_config import redis_conn
+from core.single_flight import SingleFlightConfig
+
+
+FLIGHT_KEY_PREFIX = 'aiprism:flight:'
+FLIGHT_STATS_KEY = 'aiprism:flight:stats'
+
+# Seconds a leader has to save its job after claiming the key
+CLAIM_GRACE_SECONDS = 5
+
+# Job states that can still produce a result for an attached request
+ACTIVE_JOB_STATES = ('queued', 'started', 'deferred', 'scheduled')
+
+# Delete the key only if it still points at this job
+_RELEASE_SCRIPT = redis_conn.register_script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+""")
+
+
+def _flight_key(flight_key: str) -> str:
+    return f"{FLIGHT_KEY_PREFIX}{flight_key}"
+
+
+def claim_flight(flight_key: str, ttl: Optional[int] = None) -> Tuple[str, bool]:
+    """
+    Claim a flight key or attach to the job already holding it
+
+    Args:
+        flight_key: See core.single_flight.make_flight_key
+        ttl: Seconds before an unreleased claim expires
+
+    Returns:
+        (job_id, is_leader) - the leader must create its job with this id;
+        followers just return the existing id to their caller
+    """
+    ttl = ttl or SingleFlightConfig.FLIGHT_TTL_SECONDS
+    key = _flight_key(flight_key)
+    job_id = str(uuid.uuid4())
+
+    if not SingleFlightConfig.ENABLED:
+        return job_id, True
+
+    # Second pass only runs after clearing a stale claim
+    for _ in range(2):
+        if redis_conn.set(key, job_id, nx=True, ex=ttl):
+            redis_conn.hincrby(FLIGHT_STATS_KEY, 'leaders', 1)
+            return job_id, True
+
+        existing_id = redis_conn.get(key)
+        if existing_id is None:
+            continue
+        existing_id = existing_id.decode('utf-8') if isinstance(existing_id, bytes) else existing_id
+
+        try:
+            status = Job.fetch(existing_id, connection=redis_conn).get_status(refresh=False)
+        except Exception:
+            # Claimed moments ago - the leader is still creating the job.
+            # Otherwise it expired or its creator died before saving it.
+            status = 'queued' if redis_conn.ttl(key) > ttl - CLAIM_GRACE_SECONDS else None
+
+        if status in ACTIVE_JOB_STATES:
+            redis_conn.hincrby(FLIGHT_STATS_KEY, 'coalesced', 1)
+            return existing_id, False
+
+        _RELEASE_SCRIPT(keys=[key], args=[existing_id])
+
+    # Lost the race twice - run independently rather than block the request
+    return job_id, True
+
+
+def release_flight(flight_key: str, job_id: str) -> bool:
+    """Release a flight key held by job_id"""
+    try:
+        return bool(_RELEASE_SCRIPT(keys=[_flight_key(flight_key)], args=[job_id]))
+    except Exception as e:
+        print(f"⚠️ Could not release flight {flight_key[:12]}: {e}")
+        return False
+
+
+def release_current_job_flight() -> bool:
+    """
+    Release the flight key of the RQ job currently executing
+
+    No-op outside an RQ job or for jobs enqueued without a flight key.
+    """
+    job = get_current_job()
+    if job is None or not job.meta.get('flight_key'):
+        return False
+    return release_flight(job.meta['flight_key'], job.id)
+
+
+def get_flight_stats() -> Dict[str, Any]:
+    """Leader/coalesced counters shared by all processes"""
+    try:
+        counters = redis_conn.hgetall(FLIGHT_STATS_KEY)
+    except Exception as e:
+        return {'enabled': SingleFlightConfig.ENABLED, 'error': str(e)}
+
+    stats = {'enabled': SingleFlightConfig.ENABLED, 'leaders': 0, 'coalesced': 0}
+    for name, value in counters.items():
+        name = name.decode('utf-8') if isinstance(name, bytes) else name
+        stats[name] = int(value)
+    return stats
@@ -22,17 +22,31 @@ import sys
 import json
 import time
 import re
-import boto3
 from typing import Dict, List, Any, Optional
-from datetime import datetime
-from botocore.config import Config
+from datetime import datetime, timezone
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config.bedrock_prompt_templates import BedrockPromptTemplate
+from core.bedrock_client import get_bedrock_client as get_shared_bedrock_client, get_client_registry
+from core.analysis_cache import get_analysis_cache, make_cache_key
+from core.prompt_caching import build_system_blocks, record_cache_usage, get_prompt_cache_stats
+from core.adaptive_concurrency import get_concurrency_controller
+from core.async_request_manager import get_async_request_manager
+from core.bedrock_cassette import get_bedrock_cassette
+from core.circuit_breaker import get_circuit_breaker
+from core.streaming_json import IncrementalArrayParser
+from rq import get_current_job
+from rq_events import publish_job_event
+from rq_fair_scheduler import get_fair_scheduler
+from rq_single_flight import release_current_job_flight
+from rq_worker import record_job_overhead, get_worker_overhead_stats
 from config.model_config_enhanced import get_primary_model, FEEDBACK_MIN_CONFIDENCE
 
+# Stream analysis responses and publish feedback items as they are generated
+ANALYSIS_STREAMING_ENABLED = os.environ.get('ANALYSIS_STREAMING_ENABLED', 'true').lower() == 'true'
+
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -40,34 +54,59 @@ from config.model_config_enhanced import get_primary_model, FEEDBACK_MIN_CONFIDE
 
 def get_bedrock_client():
     """
-    Create AWS Bedrock client with optimized configuration
+    Get the shared AWS Bedrock client with optimized configuration
+
+    The client comes from the process-wide registry, so it is reused across
+    jobs and rebuilt automatically inside forked RQ work-horses.
 
     Returns:
         boto3.client: Configured Bedrock Runtime client
     """
-    boto_config = Config(
+    bedrock_region = os.environ.get('BEDROCK_REGION', 'us-east-2')
+
+    return get_shared_bedrock_client(
+        bedrock_region,
         connect_timeout=15,
         read_timeout=240,
-        retries={'max_attempts': 3, 'mode': 'standard'},
-        max_pool_connections=50
+        max_attempts=3
     )
 
-    bedrock_region = os.environ.get('BEDROCK_REGION', 'us-east-2')
 
-    return boto3.client(
-        'bedrock-runtime',
-        region_name=bedrock_region,
-        config=boto_config
+def invoke_bedrock_model(system_prompt: str, user_prompt: str, on_text=None) -> Dict[str, Any]:
+    """
+    Invoke AWS Bedrock Claude model, through the record/replay cassette when
+    BEDROCK_CASSETTE_MODE is set
+
+    Args:
+        system_prompt: System instruction prompt
+        user_prompt: User query/task prompt
+        on_text: Optional callable(fragment) - streams the response and calls
+                 it with each text fragment (not called for replayed responses)
+
+    Returns:
+        Dict with result, model_used, and tokens
+    """
+    cassette = get_bedrock_cassette()
+    if cassette is None:
+        return _invoke_bedrock_model_live(system_prompt, user_prompt, on_text)
+
+    return cassette.call(
+        'rq_tasks',
+        system_prompt,
+        user_prompt,
+        get_task_primary_model().id,
+        lambda: _invoke_bedrock_model_live(system_prompt, user_prompt, on_text)
     )
 
 
-def invoke_bedrock_model(system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+def _invoke_bedrock_model_live(system_prompt: str, user_prompt: str, on_text=None) -> Dict[str, Any]:
     """
     Invoke AWS Bedrock Claude model with prompts
 
     Args:
         system_prompt: System instruction prompt
         user_prompt: User query/task prompt
+        on_text: Optional callable(fragment); uses invoke_model_with_response_stream
 
     Returns:
         Dict with result, model_used, and tokens
@@ -76,13 +115,14 @@ def invoke_bedrock_model(system_prompt: str, user_prompt: str) -> Dict[str, Any]
         Exception: If invocation fails
     """
     bedrock_client = get_bedrock_client()
-    model_config = get_primary_model()
+    model_config = get_task_primary_model()
 
     request_body = {
         'anthropic_version': 'bedrock-2023-05-31',
         'max_tokens': model_config.max_tokens,
         'temperature': model_config.temperature,
-        'system': system_prompt,
+        # Static system prompt (Hawkeye checklist) marked cacheable
+        'system': build_system_blocks(system_prompt, model_config.id),
         'messages': [
             {
                 'role': 'user',
@@ -91,22 +131,35 @@ def invoke_bedrock_model(system_prompt: str, user_prompt: str) -> Dict[str, Any]
         ]
     }
 
-    response = bedrock_client.invoke_model(
-        modelId=model_config.id,
-        body=json.dumps(request_body)
-    )
-
-    response_body = json.loads(response['body'].read())
-
-    # Extract text from content blocks
-    content_blocks = response_body.get('content', [])
-    result_text = ''
-    for block in content_blocks:
-        if block.get('type') == 'text':
-            result_text += block.get('text', '')
-
-    # Get usage stats
-    usage = response_body.get('usage', {})
+    # Shared request/token budgets across all workers; shared circuit breaker
+    # fails fast (CircuitOpenError) while the model is down; AIMD concurrency
+    # limit per model/region
+    request_manager = get_async_request_manager()
+    estimated_tokens = request_manager.token_counter.estimate_tokens(system_prompt + user_prompt)
+    with request_manager.admitted(model_config.id, estimated_tokens) as call:
+        # Slot first: waiting for it (or timing out) is not a model outcome
+        with get_concurrency_controller().slot(model_config.id, bedrock_client.meta.region_name):
+            with get_circuit_breaker().guard(model_config.id):
+                if on_text is not None:
+                    result_text, usage = _stream_bedrock_response(bedrock_client, model_config.id, request_body, on_text)
+                else:
+                    response = bedrock_client.invoke_model(
+                        modelId=model_config.id,
+                        body=json.dumps(request_body)
+                    )
+                    response_body = json.loads(response['body'].read())
+
+                    # Extract text from content blocks
+                    result_text = ''
+                    for block in response_body.get('content', []):
+                        if block.get('type') == 'text':
+                            result_text += block.get('text', '')
+                    usage = response_body.get('usage', {})
+
+        call['tokens_used'] = usage.get('input_tokens', 0) + usage.get('output_tokens', 0) or estimated_tokens
+
+    # Get usage stats (including prompt cache reads/writes)
+    record_cache_usage(usage, model_config.id)
 
     return {
         'success': True,
@@ -114,11 +167,46 @@ def invoke_bedrock_model(system_prompt: str, user_prompt: str) -> Dict[str, Any]
         'model_used': model_config.name,
         'tokens': {
             'input': usage.get('input_tokens', 0),
-            'output': usage.get('output_tokens', 0)
+            'output': usage.get('output_tokens', 0),
+            'cache_read': usage.get('cache_read_input_tokens', 0),
+            'cache_write': usage.get('cache_creation_input_tokens', 0)
         }
     }
 
 
+def _stream_bedrock_response(bedrock_client, model_id: str, request_body: Dict[str, Any], on_text):
+    """
+    Invoke with invoke_model_with_response_stream, passing text fragments to on_text
+
+    Returns:
+        (full response text, usage dict in the invoke_model format)
+    """
+    response = bedrock_client.invoke_model_with_response_stream(
+        modelId=model_id,
+        body=json.dumps(request_body)
+    )
+
+    fragments = []
+    usage = {}
+    for event in response['body']:
+        chunk = event.get('chunk')
+        if not chunk:
+            continue
+
+        payload = json.loads(chunk['bytes'].decode('utf-8'))
+        if payload.get('type') == 'message_start':
+            usage.update(payload.get('message', {}).get('usage', {}))
+        elif payload.get('type') == 'message_delta':
+            usage.update(payload.get('usage', {}))
+        elif payload.get('type') == 'content_block_delta':
+            delta = payload.get('delta', {})
+            if delta.get('type') == 'text_delta' and delta.get('text'):
+                fragments.append(delta['text'])
+                on_text(delta['text'])
+
+    return ''.join(fragments), usage
+
+
 def load_hawkeye_checklist() -> str:
     """
     Load Hawkeye framework checklist
@@ -195,6 +283,91 @@ def get_hawkeye_sections() -> Dict[int, str]:
     }
 
 
+def build_analysis_system_prompt(hawkeye_guidelines: str) -> str:
+    """System prompt for section analysis (static - cacheable by Bedrock)"""
+    return BedrockPromptTemplate.build_system_prompt(
+        role="Senior Investigation Analyst",
+        expertise=[
+            "Hawkeye investigation framework",
+            "Document quality assessment",
+            "Risk analysis and compliance",
+            "Investigation best practices"
+        ],
+        guidelines=hawkeye_guidelines
+    )
+
+
+def build_chat_system_prompt() -> str:
+    """System prompt for chat"""
+    return BedrockPromptTemplate.build_system_prompt(
+        role="Hawkeye Framework Expert",
+        expertise=[
+            "Investigation framework guidance",
+            "Document review assistance",
+            "Best practices consulting"
+        ]
+    )
+
+
+# ============================================================================
+# WARM STATE (preloaded once per worker by rq_worker.WarmWorker)
+# ============================================================================
+
+class WarmState:
+    """
+    Everything a job needs besides the model call, built once per process
+    """
+
+    def __init__(self):
+        start_time = time.time()
+        self.hawkeye_checklist = load_hawkeye_checklist()
+        self.hawkeye_sections = get_hawkeye_sections()
+        self.analysis_system_prompt = build_analysis_system_prompt(self.hawkeye_checklist)
+        self.chat_system_prompt = build_chat_system_prompt()
+        self.primary_model = get_primary_model()
+        # Created but unused, so forked work-horses inherit it (see BedrockClientRegistry)
+        self.bedrock_client = get_bedrock_client()
+        self.load_seconds = time.time() - start_time
+
+
+_warm_state = None
+
+
+def preload_warm_state() -> WarmState:
+    """Build the warm state for this process (called by warm workers at start)"""
+    global _warm_state
+    _warm_state = WarmState()
+    return _warm_state
+
+
+def get_warm_state() -> Optional[WarmState]:
+    """The preloaded warm state, or None in a cold worker / the Flask process"""
+    return _warm_state
+
+
+def get_task_primary_model():
+    """Primary model config, from the warm state when preloaded"""
+    return _warm_state.primary_model if _warm_state else get_primary_model()
+
+
+def _record_setup_overhead(job, start_time: float):
+    """Record time from job start until the Bedrock call is about to be made"""
+    if job is None:
+        return
+
+    # started_at is set before the task function is imported, so cold
+    # workers also pay for the import here
+    started = job.started_at
+    if started is None:
+        overhead = time.time() - start_time
+    else:
+        # Naive UTC on older RQ versions, timezone-aware on newer ones
+        if started.tzinfo is None:
+            started = started.replace(tzinfo=timezone.utc)
+        overhead = time.time() - started.timestamp()
+    record_job_overhead(overhead, warm=_warm_state is not None)
+
+
 # ============================================================================
 # RQ TASK 1: DOCUMENT SECTION ANALYSIS
 # ============================================================================
@@ -228,24 +401,22 @@ def analyze_section_task(
             - feedback_count: Number of feedback items
     """
     start_time = time.time()
+    job = get_current_job()
+    scheduler = get_fair_scheduler()
+    scheduler.on_job_started()
 
     try:
         print(f"📝 [RQ] Analyzing section: {section_name}")
+        publish_job_event('started', section=section_name)
 
-        # Build prompts using AWS Bedrock templates
-        hawkeye_checkpoints = get_hawkeye_sections()
-        hawkeye_guidelines = load_hawkeye_checklist()
-
-        system_prompt = BedrockPromptTemplate.build_system_prompt(
-            role="Senior Investigation Analyst",
-            expertise=[
-                "Hawkeye investigation framework",
-                "Document quality assessment",
-                "Risk analysis and compliance",
-                "Investigation best practices"
-            ],
-            guidelines=hawkeye_guidelines
-        )
+        # Build prompts using AWS Bedrock templates (preloaded by warm workers)
+        warm = get_warm_state()
+        if warm:
+            hawkeye_checkpoints = warm.hawkeye_sections
+            system_prompt = warm.analysis_system_prompt
+        else:
+            hawkeye_checkpoints = get_hawkeye_sections()
+            system_prompt = build_analysis_system_prompt(load_hawkeye_checklist())
 
         user_prompt = BedrockPromptTemplate.build_analysis_prompt(
             section_name=section_name,
@@ -255,8 +426,40 @@ def analyze_section_task(
             max_feedback_items=10
         )
 
-        # Invoke Bedrock API
-        result = invoke_bedrock_model(system_prompt, user_prompt)
+        # Content-addressed cache shared with the Flask process and other workers
+        cache = get_analysis_cache()
+        cache_key = None
+        if cache:
+            model_config = get_task_primary_model()
+            cache_key = make_cache_key(system_prompt, user_prompt, model_config.id, {
+                'max_tokens': model_config.max_tokens,
+                'temperature': model_config.temperature,
+                'min_confidence': FEEDBACK_MIN_CONFIDENCE
+            })
+            cached = cache.get(cache_key)
+            if cached is not None:
+                duration = time.time() - start_time
+                print(f"💾 [RQ] Cache hit: {section_name} ({cached.get('feedback_count', 0)} items)")
+                cached.update({
+                    'section': section_name,
+                    'duration': round(duration, 2),
+                    'cached': True
+                })
+                # Later duplicates start a new job rather than attach to this finished one
+                release_current_job_flight()
+                publish_job_event('finished', section=section_name, result=cached)
+                return cached
+
+        _record_setup_overhead(job, start_time)
+        update_job_progress(job, 20, 'Waiting for Claude', section=section_name)
+
+        # Invoke Bedrock API, streaming feedback items to the browser as they complete
+        on_text = None
+        if ANALYSIS_STREAMING_ENABLED and job is not None:
+            on_text = PartialFeedbackPublisher(job, section_name).feed
+        result = invoke_bedrock_model(system_prompt, user_prompt, on_text)
+
+        update_job_progress(job, 80, 'Parsing response', section=section_name)
 
         if not result['success']:
             raise Exception("Bedrock invocation failed")
@@ -297,7 +500,7 @@ def analyze_section_task(
 
         print(f"✅ [RQ] Complete: {len(high_quality_items)} items ({duration:.2f}s)")
 
-        return {
+        task_result = {
             'success': True,
             'feedback_items': high_quality_items,
             'section': section_name,
@@ -307,18 +510,32 @@ def analyze_section_task(
             'feedback_count': len(high_quality_items)
         }
 
+        if cache_key:
+            cache.set(cache_key, task_result)
+
+        release_current_job_flight()
+        publish_job_event('finished', section=section_name, result=task_result)
+        return task_result
+
     except Exception as e:
         error_msg = str(e)
         duration = time.time() - start_time
 
         print(f"❌ [RQ] Error analyzing {section_name}: {error_msg}")
 
-        return {
+        task_result = {
             'success': False,
             'error': error_msg,
             'section': section_name,
             'duration': round(duration, 2)
         }
+        release_current_job_flight()
+        publish_job_event('failed', section=section_name, result=task_result)
+        return task_result
+
+    finally:
+        # Release the next backlog job from the fair scheduler lanes
+        scheduler.on_job_finished()
 
 
 # ============================================================================
@@ -347,6 +564,7 @@ def process_chat_task(query: str, context: Dict[str, Any]) -> Dict[str, Any]:
 
     try:
         print(f"💬 [RQ] Processing chat: {query[:50]}...")
+        publish_job_event('started')
 
         # Build prompts
         framework_overview = """Hawkeye 20-Point Investigation Checklist covering:
@@ -355,14 +573,8 @@ Verification, Appeals, Security, Funds, Outreach, Sentiment, Root Cause,
 Prevention, Documentation, Collaboration, QC, Improvement, Communication,
 Metrics, Legal, Launch."""
 
-        system_prompt = BedrockPromptTemplate.build_system_prompt(
-            role="Hawkeye Framework Expert",
-            expertise=[
-                "Investigation framework guidance",
-                "Document review assistance",
-                "Best practices consulting"
-            ]
-        )
+        warm = get_warm_state()
+        system_prompt = warm.chat_system_prompt if warm else build_chat_system_prompt()
 
         user_prompt = BedrockPromptTemplate.build_chat_prompt(
             user_query=query,
@@ -380,13 +592,15 @@ Metrics, Legal, Launch."""
 
         print(f"✅ [RQ] Chat complete ({duration:.2f}s)")
 
-        return {
+        task_result = {
             'success': True,
             'response': result['result'],
             'duration': round(duration, 2),
             'model_used': result['model_used'],
             'tokens': result['tokens']
         }
+        publish_job_event('finished', result=task_result)
+        return task_result
 
     except Exception as e:
         error_msg = str(e)
@@ -394,11 +608,13 @@ Metrics, Legal, Launch."""
 
         print(f"❌ [RQ] Chat error: {error_msg}")
 
-        return {
+        task_result = {
             'success': False,
             'error': error_msg,
             'duration': round(duration, 2)
         }
+        publish_job_event('failed', result=task_result)
+        return task_result
 
 
 # ============================================================================
@@ -417,6 +633,9 @@ def monitor_health() -> Dict[str, Any]:
     try:
         from core.async_request_manager import get_async_request_manager
 
+        # Release any fair-scheduler backlog left behind by jobs that died
+        get_fair_scheduler().dispatch(blocking=False)
+
         # Get stats from request manager
         async_manager = get_async_request_manager()
         stats = async_manager.get_stats()
@@ -432,13 +651,48 @@ def monitor_health() -> Dict[str, Any]:
         print(f"Requests/min: {stats['requests_last_minute']}")
         print(f"Tokens/min: {stats['tokens_last_minute']}")
         print(f"Avg Response: {stats['avg_response_time']:.2f}s")
+
+        client_stats = get_client_registry().get_stats()
+        print(f"Bedrock Clients: {client_stats['active_clients']} "
+              f"(reuse rate: {client_stats['reuse_rate']:.0%}, requests: {client_stats['requests_sent']})")
+
+        cache = get_analysis_cache()
+        cache_stats = cache.get_stats() if cache else {'enabled': False}
+        if cache:
+            print(f"Analysis Cache: {cache_stats['entries']} entries, "
+                  f"hit rate {cache_stats['hit_rate']:.0%} ({cache_stats['hits']} hits / {cache_stats['misses']} misses)")
+
+        prompt_cache_stats = get_prompt_cache_stats()
+        print(f"Prompt Cache: {prompt_cache_stats['cache_read_input_tokens']} tokens read, "
+              f"{prompt_cache_stats['cache_creation_input_tokens']} written "
+              f"({prompt_cache_stats['cached_token_ratio']:.0%} of prompt tokens cached)")
+
+        concurrency_stats = get_concurrency_controller().get_stats()
+        print(f"Adaptive Concurrency: total limit {concurrency_stats['total_limit']} "
+              f"across {len(concurrency_stats['limiters'])} model/region pairs")
+
+        circuit_stats = get_circuit_breaker().get_stats()
+        open_circuits = [model_id for model_id, state in circuit_stats['models'].items() if state['state'] != 'closed']
+        print(f"Circuit Breakers: {len(circuit_stats['models'])} models, "
+              f"not closed: {', '.join(open_circuits) or 'none'}")
+
+        worker_stats = get_worker_overhead_stats()
+        job_overhead = worker_stats.get('job_overhead', {})
+        print(f"Job Overhead: warm avg {job_overhead.get('warm', {}).get('avg')}s, "
+              f"cold avg {job_overhead.get('cold', {}).get('avg')}s")
         print("=" * 60)
 
         return {
             'success': True,
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
-            'stats': stats
+            'stats': stats,
+            'bedrock_clients': client_stats,
+            'analysis_cache': cache_stats,
+            'prompt_cache': prompt_cache_stats,
+            'adaptive_concurrency': concurrency_stats,
+            'circuit_breakers': circuit_stats,
+            'workers': worker_stats
         }
 
     except Exception as e:
@@ -456,19 +710,61 @@ def monitor_health() -> Dict[str, Any]:
 # TASK PROGRESS TRACKING (Optional)
 # ============================================================================
 
-def update_job_progress(job, progress: int, status: str):
+class PartialFeedbackPublisher:
+    """
+    Publishes feedback items from a streaming analysis response as they complete
+
+    Each item that passes the confidence filter is appended to
+    job.meta['partial_feedback_items'] (read by /task_status and by /events on
+    reconnect) and pushed as a 'partial' event. The final 'finished' result
+    replaces them.
+    """
+
+    def __init__(self, job, section_name: str):
+        self.job = job
+        self.section_name = section_name
+        self.parser = IncrementalArrayParser('feedback_items')
+        self.published = []
+        self.first_item_time = None
+        self.start_time = time.time()
+
+    def feed(self, text: str):
+        items = [
+            item for item in self.parser.feed(text)
+            if item.get('confidence', 0) >= FEEDBACK_MIN_CONFIDENCE
+        ]
+        if not items:
+            return
+
+        if self.first_item_time is None:
+            self.first_item_time = time.time() - self.start_time
+            print(f"⚡ [RQ] First feedback item for {self.section_name} after {self.first_item_time:.2f}s")
+
+        self.published.extend(items)
+        try:
+            self.job.meta['partial_feedback_items'] = self.published
+            self.job.save_meta()
+        except Exception as e:
+            print(f"⚠️ Could not save partial feedback: {e}")
+
+        publish_job_event('partial', section=self.section_name, items=items, total=len(self.published))
+
+
+def update_job_progress(job, progress: int, status: str, **details):
     """
-    Update RQ job progress metadata
+    Update RQ job progress metadata and publish a 'progress' event
 
     Args:
         job: RQ Job instance
         progress: Progress percentage (0-100)
         status: Status message
+        **details: Extra fields for the pushed event (e.g. section)
     """
     if job:
         job.meta['progress'] = progress
         job.meta['status'] = status
         job.save_meta()
+        publish_job_event('progress', progress=progress, status=status, **details)
 
 
 # ============================================================================
@@ -0,0 +1,121 @@
+"""
+Warm RQ Workers for AI-Prism
+Load prompts, checklist, model config and the Bedrock client once per worker
+
+The stock RQ worker forks a fresh work-horse per job, and every
+analyze_section_task re-read the Hawkeye checklist, rebuilt the system prompt,
+resolved the primary model and created a Bedrock client. These workers build
+all of that (rq_tasks.WarmState) in the parent before the first job, so each
+forked work-horse inherits it and per-job overhead is just the model call.
+
+    rq worker -w rq_worker.WarmWorker analysis_interactive chat analysis analysis_speculative monitoring default
+
+WarmSimpleWorker runs jobs in the preloaded process itself (no fork), which
+also keeps Bedrock connections alive between jobs.
+
+Warm-up time per worker and per-job overhead (job start until the Bedrock
+call, split by warm/cold) are kept in Redis and reported by monitor_health.
+"""
+
+import os
+import time
+from typing import Dict, Any
+
+from rq import Worker, SimpleWorker
+
+from rq_config import redis_conn
+
+
+OVERHEAD_KEY_PREFIX = 'aiprism:worker:overhead:'
+WARMUP_KEY = 'aiprism:worker:warmup'
+OVERHEAD_SAMPLES = int(os.environ.get('RQ_WORKER_OVERHEAD_SAMPLES', '200'))
+
+
+def record_job_overhead(seconds: float, warm: bool):
+    """Record one job's setup overhead (job start until the Bedrock call)"""
+    key = f"{OVERHEAD_KEY_PREFIX}{'warm' if warm else 'cold'}"
+    try:
+        pipe = redis_conn.pipeline()
+        pipe.lpush(key, round(seconds, 4))
+        pipe.ltrim(key, 0, OVERHEAD_SAMPLES - 1)
+        pipe.execute()
+    except Exception as e:
+        print(f"⚠️ Could not record job overhead: {e}")
+
+
+def _summarize(samples) -> Dict[str, Any]:
+    samples = sorted(float(s) for s in samples)
+    if not samples:
+        return {'samples': 0, 'avg': None, 'p95': None}
+    return {
+        'samples': len(samples),
+        'avg': round(sum(samples) / len(samples), 4),
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    }
+
+
+def get_worker_overhead_stats() -> Dict[str, Any]:
+    """Warm-up time per worker and per-job overhead for warm and cold jobs"""
+    try:
+        warmup = {
+            (name.decode('utf-8') if isinstance(name, bytes) else name): float(seconds)
+            for name, seconds in redis_conn.hgetall(WARMUP_KEY).items()
+        }
+        return {
+            'warmup_seconds': warmup,
+            'job_overhead': {
+                'warm': _summarize(redis_conn.lrange(f"{OVERHEAD_KEY_PREFIX}warm", 0, -1)),
+                'cold': _summarize(redis_conn.lrange(f"{OVERHEAD_KEY_PREFIX}cold", 0, -1))
+            }
+        }
+    except Exception as e:
+        return {'error': str(e)}
+
+
+class WarmWorkerMixin:
+    """
+    Preloads rq_tasks.WarmState in the worker process before the work loop
+    """
+
+    def work(self, *args, **kwargs):
+        self.preload()
+        self.start_scheduler_dispatch()
+        return super().work(*args, **kwargs)
+
+    def start_scheduler_dispatch(self):
+        """Keep fair-scheduler backlogs moving even if a job dies before releasing them"""
+        from rq_fair_scheduler import get_fair_scheduler
+
+        try:
+            get_fair_scheduler().start_periodic_dispatch()
+        except Exception as e:
+            print(f"⚠️ Could not start scheduler dispatch loop: {e}", flush=True)
+
+    def preload(self):
+        # Imported here: rq_tasks imports this module for the overhead stats
+        import rq_tasks
+
+        start_time = time.time()
+        try:
+            state = rq_tasks.preload_warm_state()
+        except Exception as e:
+            # Jobs still work cold - they build what they need per job
+            print(f"⚠️ Warm worker preload failed, running cold: {e}", flush=True)
+            return
+
+        warmup = time.time() - start_time
+        print(f"🔥 Worker {self.name} warm in {warmup:.2f}s "
+              f"(model: {state.primary_model.name}, checklist: {len(state.hawkeye_checklist)} chars)", flush=True)
+
+        try:
+            redis_conn.hset(WARMUP_KEY, self.name, round(warmup, 4))
+        except Exception as e:
+            print(f"⚠️ Could not record warm-up time: {e}")
+
+
+class WarmWorker(WarmWorkerMixin, Worker):
+    """Forks a work-horse per job from the preloaded parent"""
+
+
+class WarmSimpleWorker(WarmWorkerMixin, SimpleWorker):
+    """Runs every job inside the preloaded worker process"""
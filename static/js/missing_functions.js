@@ -804,17 +804,140 @@ function sendChatMessage() {
 
     // Add thinking indicator
     const thinkingMessage = addChatMessage('🤔 Thinking...', 'assistant', true);
+    const payload = {
+        session_id: sessionId,
+        message: message,
+        current_section: window.sections[window.currentSectionIndex] || null
+    };
+
+    // Stream the answer token by token; POST /chat stays the fallback
+    let streamDiv = null;
+    let streamedText = '';
+    streamChatMessage(payload, {
+        onToken: (text) => {
+            streamedText += text;
+            if (!streamDiv) {
+                streamDiv = thinkingMessage;
+                streamDiv.style.opacity = '1';
+            }
+            streamDiv.lastElementChild.textContent = streamedText;
+        },
+        onDone: (data) => {
+            if (thinkingMessage && thinkingMessage.parentNode) {
+                thinkingMessage.remove();
+            }
+            addChatMessage(data.response, 'assistant');
+        },
+        onError: (error) => {
+            if (thinkingMessage && thinkingMessage.parentNode) {
+                thinkingMessage.remove();
+            }
+            addChatMessage(`Sorry, I encountered an error: ${error}`, 'assistant');
+        }
+    })
+    .catch(error => {
+        console.warn('Chat stream unavailable, falling back to /chat:', error);
+        postChatMessage(payload, thinkingMessage);
+    });
+}
+
+// POST a chat message to /chat/stream and dispatch its Server-Sent Events
+// (token {text}, done {response, ...}, error {error}) to handlers.
+// Rejects only if nothing was received (no streaming support, HTTP error,
+// connection lost before the first event), so callers can fall back to /chat.
+function streamChatMessage(payload, handlers) {
+    if (!window.fetch || !window.ReadableStream || !window.TextDecoder) {
+        return Promise.reject(new Error('Streaming responses not supported'));
+    }
+
+    let received = false;
+    let finished = false;
+
+    const dispatch = (block) => {
+        let event = 'message';
+        const dataLines = [];
+        block.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                event = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                dataLines.push(line.slice(5).replace(/^ /, ''));
+            }
+        });
+        if (!dataLines.length) {
+            return;
+        }
+
+        const data = JSON.parse(dataLines.join('\n'));
+        received = true;
+        if (event === 'token') {
+            handlers.onToken(data.text || '');
+        } else if (event === 'done') {
+            finished = true;
+            handlers.onDone(data);
+        } else if (event === 'error') {
+            finished = true;
+            handlers.onError(data.error || 'Unknown error');
+        }
+    };
 
+    return fetch('/chat/stream', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream'
+        },
+        body: JSON.stringify(payload)
+    })
+    .then(response => {
+        if (!response.ok || !response.body) {
+            throw new Error(`Chat stream unavailable: ${response.status} ${response.statusText}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        const read = () => reader.read().then(({ done, value }) => {
+            if (value) {
+                buffer += decoder.decode(value, { stream: true });
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    dispatch(buffer.slice(0, boundary));
+                    buffer = buffer.slice(boundary + 2);
+                }
+            }
+            if (!done) {
+                return read();
+            }
+            if (!received) {
+                throw new Error('Chat stream closed before any event');
+            }
+            if (!finished) {
+                finished = true;
+                handlers.onError('Chat stream ended unexpectedly');
+            }
+        });
+        return read();
+    })
+    .catch(error => {
+        if (!received) {
+            throw error;
+        }
+        if (!finished) {
+            finished = true;
+            handlers.onError(error.message);
+        }
+    });
+}
+
+// Non-streaming chat fallback: POST /chat and show the synchronous answer
+function postChatMessage(payload, thinkingMessage) {
     fetch('/chat', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         },
-        body: JSON.stringify({
-            session_id: sessionId,
-            message: message,
-            current_section: window.sections[window.currentSectionIndex] || null
-        })
+        body: JSON.stringify(payload)
     })
     .then(response => {
         if (!response.ok) {
@@ -413,7 +413,7 @@ function analyzeCurrentSection() {
         if (data.success && data.task_id) {
             // Async processing - poll for result
             console.log('Task submitted:', data.task_id);
-            pollTaskResult(data.task_id, sectionName);
+            pollTaskResult(data.task_id, sectionName, data.events_url);
         } else if (data.success && data.feedback_items) {
             // Synchronous result
             isAnalyzing = false;
@@ -602,6 +602,53 @@ function displaySectionFeedback(feedbackItems, sectionName) {
     feedbackContainer.innerHTML = feedbackHtml;
 }
 
+// Preview of feedback items streamed while the analysis is still running.
+// Read-only: the items get their ids (and actions) with the final result.
+function displayPartialFeedback(feedbackItems, sectionName) {
+    const feedbackContainer = document.getElementById('feedbackContainer');
+    if (!feedbackContainer || !feedbackItems || feedbackItems.length === 0) {
+        return;
+    }
+
+    // Don't overwrite another section the reviewer has moved on to
+    if (typeof sections !== 'undefined' && sections[currentSectionIndex] !== sectionName) {
+        return;
+    }
+
+    let feedbackHtml = `
+        <div style="margin-bottom: 20px; padding: 15px; background: linear-gradient(135deg, #f8f9ff 0%, #e3f2fd 100%); border-radius: 12px; border: 2px dashed #4f46e5;">
+            <h3 style="color: #4f46e5; margin-bottom: 10px;">⏳ AI Analysis In Progress</h3>
+            <p style="color: #666; margin: 0;">Section: <strong>"${sectionName}"</strong> - ${feedbackItems.length} feedback item${feedbackItems.length !== 1 ? 's' : ''} so far, more are being generated...</p>
+        </div>
+    `;
+
+    feedbackItems.forEach((item) => {
+        const riskColor = item.risk_level === 'High' ? '#ef4444' :
+                         item.risk_level === 'Medium' ? '#f59e0b' : '#10b981';
+
+        const typeColor = item.type === 'critical' ? '#ef4444' :
+                         item.type === 'important' ? '#f59e0b' : '#3b82f6';
+
+        feedbackHtml += `
+            <div class="feedback-item feedback-item-partial" style="background: white; border-left: 4px solid ${riskColor}; padding: 20px; margin-bottom: 15px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); opacity: 0.85;">
+                <div class="feedback-meta" style="display: flex; gap: 10px; align-items: center; flex-wrap: wrap; margin-bottom: 15px;">
+                    <span class="feedback-type" style="background: ${typeColor}; color: white; padding: 4px 8px; border-radius: 4px; font-size: 0.8em; font-weight: 600; text-transform: uppercase;">${item.type}</span>
+                    <span class="risk-indicator" style="background: ${riskColor}; color: white; padding: 4px 8px; border-radius: 4px; font-size: 0.8em; font-weight: 600;">${item.risk_level} Risk</span>
+                    <span style="background: #e5e7eb; color: #374151; padding: 4px 8px; border-radius: 4px; font-size: 0.8em; font-weight: 500;">${item.category}</span>
+                </div>
+                <p style="margin: 0; line-height: 1.6; color: #374151;"><strong>Issue:</strong> ${item.description}</p>
+                ${item.suggestion ? `
+                    <div style="margin-top: 15px; padding: 12px; background: #f0f9ff; border-left: 3px solid #3b82f6; border-radius: 4px;">
+                        <p style="margin: 0; color: #1e40af;"><strong>💡 Suggestion:</strong> ${item.suggestion}</p>
+                    </div>
+                ` : ''}
+            </div>
+        `;
+    });
+
+    feedbackContainer.innerHTML = feedbackHtml;
+}
+
 // Modified loadSection function to trigger analysis - DELEGATES TO missing_functions.js
 function loadSection(index) {
     // IMPORTANT: This function now delegates to the proper implementation in missing_functions.js
@@ -1095,8 +1142,82 @@ document.addEventListener('DOMContentLoaded', function() {
     console.log('   - saveInlineFeedback:', typeof window.saveInlineFeedback);
 });
 
-// Task polling function for async analysis
-function pollTaskResult(taskId, sectionName) {
+// Task completion for async analysis: pushed over SSE when the response offered
+// an events_url (RQ only - the local task queue publishes no events), polled otherwise
+function pollTaskResult(taskId, sectionName, eventsUrl) {
+    if (window.EventSource && eventsUrl) {
+        waitForTaskEvent(taskId, sectionName, eventsUrl);
+    } else {
+        pollAnalysisTaskStatus(taskId, sectionName);
+    }
+}
+
+// Wait for the task's 'finished'/'failed' event on eventsUrl (/events/<session_id>)
+function waitForTaskEvent(taskId, sectionName, eventsUrl) {
+    console.log(`Waiting for pushed completion of task ${taskId} for section: ${sectionName}`);
+
+    let settled = false;
+    let partialItems = [];
+    const source = new EventSource(`${eventsUrl}?task_ids=${encodeURIComponent(taskId)}`);
+    const timeout = setTimeout(() => {
+        if (!settled) {
+            settled = true;
+            source.close();
+            handleTaskStatusData({ task_id: taskId, state: 'TIMEOUT' }, sectionName, () => {}, true);
+        }
+    }, 300000); // Matches the RQ job timeout
+
+    const onTaskEvent = (event) => {
+        const data = JSON.parse(event.data);
+        if (settled || data.task_id !== taskId) {
+            return;
+        }
+        settled = true;
+        clearTimeout(timeout);
+        source.close();
+
+        // Same shape as /task_status so the existing handling applies
+        handleTaskStatusData({
+            task_id: taskId,
+            state: 'SUCCESS',
+            result: data.result || { success: false, error: 'Task failed' }
+        }, sectionName, () => {}, false);
+    };
+
+    source.addEventListener('finished', onTaskEvent);
+    source.addEventListener('failed', onTaskEvent);
+    source.addEventListener('progress', (event) => {
+        const data = JSON.parse(event.data);
+        if (data.task_id === taskId) {
+            console.log(`Task ${taskId} progress: ${data.progress}% (${data.status})`);
+        }
+    });
+
+    // Feedback items parsed from the streaming response - shown until 'finished'
+    source.addEventListener('partial', (event) => {
+        const data = JSON.parse(event.data);
+        if (settled || data.task_id !== taskId) {
+            return;
+        }
+        partialItems = data.snapshot ? data.items : partialItems.concat(data.items || []);
+        displayPartialFeedback(partialItems, sectionName);
+    });
+
+    source.onerror = () => {
+        if (settled) {
+            return;
+        }
+        // Stream unavailable (e.g. RQ disabled or proxy buffering) - fall back to polling
+        console.warn('Task event stream failed, falling back to polling');
+        settled = true;
+        clearTimeout(timeout);
+        source.close();
+        pollAnalysisTaskStatus(taskId, sectionName);
+    };
+}
+
+// Poll /task_status (fallback when the event stream is unavailable)
+function pollAnalysisTaskStatus(taskId, sectionName) {
     console.log(`Polling task ${taskId} for section: ${sectionName}`);
 
     const maxAttempts = 120; // 2 minutes max (120 * 1 second)
@@ -1109,103 +1230,111 @@ function pollTaskResult(taskId, sectionName) {
         fetch(`/task_status/${taskId}?session_id=${currentSession}`)
             .then(response => response.json())
             .then(data => {
-                console.log(`Task ${taskId} status:`, data.status, 'state:', data.state);
-
-                // Check both data.state and data.status for SUCCESS
-                if (data.state === 'SUCCESS' || data.status === 'SUCCESS' || data.status === 'Task completed successfully') {
-                    clearInterval(pollInterval);
-
-                    // ✅ CRITICAL FIX: Check if task completed but analysis actually failed
-                    if (data.result && data.result.success === false) {
-                        isAnalyzing = false;
-                        sectionAnalysisStatus[sectionName] = 'failed';
-
-                        const error = data.result.error || 'Analysis failed';
-                        console.error('❌ Task completed but analysis failed for section:', sectionName, error);
-
-                        // Show error message in feedback container
-                        const feedbackContainer = document.getElementById('feedbackContainer');
-                        if (feedbackContainer) {
-                            feedbackContainer.innerHTML = `
-                                <div style="text-align: center; padding: 40px; background: #fff5f5; border: 2px solid #ef4444; border-radius: 15px; margin: 20px 0;">
-                                    <div style="font-size: 3em; margin-bottom: 20px;">⏱️</div>
-                                    <h3 style="color: #ef4444; margin-bottom: 15px;">Analysis Failed</h3>
-                                    <p style="color: #666; margin-bottom: 20px;">Section: "${sectionName}"</p>
-                                    <p style="color: #ef4444; font-size: 0.9em; margin-bottom: 10px;"><strong>Error:</strong> ${error}</p>
-                                    <p style="color: #999; font-size: 0.85em; margin-bottom: 20px;">This is usually due to AWS Bedrock API timeout. Please try again.</p>
-                                    <button class="btn btn-primary" onclick="retryAnalysis()" style="margin-top: 15px;">🔄 Retry Analysis</button>
-                                </div>
-                            `;
-                        }
-
-                        showNotification('Analysis failed: ' + error, 'error');
-                        return; // Stop here, don't proceed to success path
-                    }
-
-                    // Normal success path - analysis actually succeeded
-                    isAnalyzing = false;
-                    sectionAnalysisStatus[sectionName] = 'analyzed';
-
-                    // Extract feedback items from result
-                    const feedbackItems = data.result?.feedback_items || [];
-                    console.log('📊 Extracted feedback items:', {
-                        count: feedbackItems.length,
-                        items: feedbackItems,
-                        sectionName: sectionName
-                    });
-
-                    console.log('✅ Analysis completed for section:', sectionName, 'Feedback items:', feedbackItems.length);
-                    displaySectionFeedback(feedbackItems, sectionName);
-                    showNotification(`Analysis completed for "${sectionName}"!`, 'success');
-
-                } else if (data.state === 'FAILURE' || data.status === 'FAILURE') {
-                    clearInterval(pollInterval);
-                    isAnalyzing = false;
-                    sectionAnalysisStatus[sectionName] = 'failed';
-
-                    const error = data.result?.error || data.error || 'Task failed';
-                    console.error('Analysis failed for section:', sectionName, error);
-
-                    const feedbackContainer = document.getElementById('feedbackContainer');
-                    if (feedbackContainer) {
-                        feedbackContainer.innerHTML = `
-                            <div style="text-align: center; padding: 40px; background: #fff5f5; border: 2px solid #ef4444; border-radius: 15px; margin: 20px 0;">
-                                <div style="font-size: 3em; margin-bottom: 20px;">❌</div>
-                                <h3 style="color: #ef4444; margin-bottom: 15px;">Analysis Failed</h3>
-                                <p style="color: #666; margin-bottom: 20px;">Section: "${sectionName}"</p>
-                                <p style="color: #ef4444; font-size: 0.9em;">${error}</p>
-                                <button class="btn btn-primary" onclick="retryAnalysis()" style="margin-top: 15px;">🔄 Retry Analysis</button>
-                            </div>
-                        `;
-                    }
-
-                    showNotification('Analysis failed: ' + error, 'error');
-
-                } else if (attempts >= maxAttempts) {
-                    clearInterval(pollInterval);
-                    isAnalyzing = false;
-                    sectionAnalysisStatus[sectionName] = 'failed';
-
-                    console.error('Analysis timeout for section:', sectionName);
-                    showNotification('Analysis timeout - please try again', 'error');
-
-                    const feedbackContainer = document.getElementById('feedbackContainer');
-                    if (feedbackContainer) {
-                        feedbackContainer.innerHTML = `
-                            <div style="text-align: center; padding: 40px; background: #fff5f5; border: 2px solid #f59e0b; border-radius: 15px; margin: 20px 0;">
-                                <div style="font-size: 3em; margin-bottom: 20px;">⏱️</div>
-                                <h3 style="color: #f59e0b; margin-bottom: 15px;">Analysis Timeout</h3>
-                                <p style="color: #666; margin-bottom: 20px;">Section: "${sectionName}"</p>
-                                <p style="color: #f59e0b; font-size: 0.9em;">The analysis is taking longer than expected</p>
-                                <button class="btn btn-primary" onclick="retryAnalysis()" style="margin-top: 15px;">🔄 Retry Analysis</button>
-                            </div>
-                        `;
-                    }
-                }
+                handleTaskStatusData(data, sectionName, () => clearInterval(pollInterval), attempts >= maxAttempts);
             })
             .catch(error => {
                 console.error('Error polling task:', error);
                 // Don't stop polling on network errors, just log and continue
             });
     }, 1000); // Poll every 1 second
-}
\ No newline at end of file
+}
+
+// Render a task status (from polling or a pushed event); stop() ends polling
+function handleTaskStatusData(data, sectionName, stop, timedOut) {
+    console.log(`Task ${data.task_id} status:`, data.status, 'state:', data.state);
+
+    // Check both data.state and data.status for SUCCESS
+    if (data.state === 'SUCCESS' || data.status === 'SUCCESS' || data.status === 'Task completed successfully') {
+        stop();
+
+        // ✅ CRITICAL FIX: Check if task completed but analysis actually failed
+        if (data.result && data.result.success === false) {
+            isAnalyzing = false;
+            sectionAnalysisStatus[sectionName] = 'failed';
+
+            const error = data.result.error || 'Analysis failed';
+            console.error('❌ Task completed but analysis failed for section:', sectionName, error);
+
+            // Show error message in feedback container
+            const feedbackContainer = document.getElementById('feedbackContainer');
+            if (feedbackContainer) {
+                feedbackContainer.innerHTML = `
+                    <div style="text-align: center; padding: 40px; background: #fff5f5; border: 2px solid #ef4444; border-radius: 15px; margin: 20px 0;">
+                        <div style="font-size: 3em; margin-bottom: 20px;">⏱️</div>
+                        <h3 style="color: #ef4444; margin-bottom: 15px;">Analysis Failed</h3>
+                        <p style="color: #666; margin-bottom: 20px;">Section: "${sectionName}"</p>
+                        <p style="color: #ef4444; font-size: 0.9em; margin-bottom: 10px;"><strong>Error:</strong> ${error}</p>
+                        <p style="color: #999; font-size: 0.85em; margin-bottom: 20px;">This is usually due to AWS Bedrock API timeout. Please try again.</p>
+                        <button class="btn btn-primary" onclick="retryAnalysis()" style="margin-top: 15px;">🔄 Retry Analysis</button>
+                    </div>
+                `;
+            }
+
+            showNotification('Analysis failed: ' + error, 'error');
+            return; // Stop here, don't proceed to success path
+        }
+
+        // Normal success path - analysis actually succeeded
+        isAnalyzing = false;
+        sectionAnalysisStatus[sectionName] = 'analyzed';
+
+        // Extract feedback items from result
+        const feedbackItems = data.result?.feedback_items || [];
+        console.log('📊 Extracted feedback items:', {
+            count: feedbackItems.length,
+            items: feedbackItems,
+            sectionName: sectionName
+        });
+
+        console.log('✅ Analysis completed for section:', sectionName, 'Feedback items:', feedbackItems.length);
+        displaySectionFeedback(feedbackItems, sectionName);
+        showNotification(`Analysis completed for "${sectionName}"!`, 'success');
+
+    } else if (data.state === 'FAILURE' || data.status === 'FAILURE') {
+        stop();
+        isAnalyzing = false;
+        sectionAnalysisStatus[sectionName] = 'failed';
+
+        const error = data.result?.error || data.error || 'Task failed';
+        console.error('Analysis failed for section:', sectionName, error);
+
+        const feedbackContainer = document.getElementById('feedbackContainer');
+        if (feedbackContainer) {
+            feedbackContainer.innerHTML = `
+                <div style="text-align: center; padding: 40px; background: #fff5f5; border: 2px solid #ef4444; border-radius: 15px; margin: 20px 0;">
+                    <div style="font-size: 3em; margin-bottom: 20px;">❌</div>
+                    <h3 style="color: #ef4444; margin-bottom: 15px;">Analysis Failed</h3>
+                    <p style="color: #666; margin-bottom: 20px;">Section: "${sectionName}"</p>
+                    <p style="color: #ef4444; font-size: 0.9em;">${error}</p>
+                    <button class="btn btn-primary" onclick="retryAnalysis()" style="margin-top: 15px;">🔄 Retry Analysis</button>
+                </div>
+            `;
+        }
+
+        showNotification('Analysis failed: ' + error, 'error');
+
+    } else if (timedOut) {
+        stop();
+        isAnalyzing = false;
+        sectionAnalysisStatus[sectionName] = 'failed';
+
+        console.error('Analysis timeout for section:', sectionName);
+        showNotification('Analysis timeout - please try again', 'error');
+
+        const feedbackContainer = document.getElementById('feedbackContainer');
+        if (feedbackContainer) {
+            feedbackContainer.innerHTML = `
+                <div style="text-align: center; padding: 40px; background: #fff5f5; border: 2px solid #f59e0b; border-radius: 15px; margin: 20px 0;">
+                    <div style="font-size: 3em; margin-bottom: 20px;">⏱️</div>
+                    <h3 style="color: #f59e0b; margin-bottom: 15px;">Analysis Timeout</h3>
+                    <p style="color: #666; margin-bottom: 20px;">Section: "${sectionName}"</p>
+                    <p style="color: #f59e0b; font-size: 0.9em;">The analysis is taking longer than expected</p>
+                    <button class="btn btn-primary" onclick="retryAnalysis()" style="margin-top: 15px;">🔄 Retry Analysis</button>
+                </div>
+            `;
+        }
+    } else if (data.partial_feedback_items && data.partial_feedback_items.length > 0) {
+        // Still running - show the items streamed so far
+        displayPartialFeedback(data.partial_feedback_items, sectionName);
+    }
+}
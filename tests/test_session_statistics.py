@@ -0,0 +1,134 @@
+"""
+Behavior tests for SessionStatistics (utils/statistics_manager.py)
+
+The incremental counters must always agree with a full rebuild() of the
+same session data.
+"""
+
+from collections import defaultdict
+
+from utils.statistics_manager import SessionStatistics
+
+
+class FakeSession:
+    def __init__(self):
+        self.feedback_data = {}
+        self.accepted_feedback = defaultdict(list)
+        self.rejected_feedback = defaultdict(list)
+        self.user_feedback = defaultdict(list)
+
+
+def _item(item_id, risk_level):
+    return {'id': item_id, 'risk_level': risk_level, 'type': 'important', 'category': 'Clarity'}
+
+
+def _assert_consistent(stats):
+    incremental = dict(stats.get_statistics())
+    rebuilt = SessionStatistics(stats.session).get_statistics()
+    assert incremental == rebuilt
+    return incremental
+
+
+def test_counters_follow_analysis_accept_and_reject():
+    session = FakeSession()
+    stats = SessionStatistics(session)
+
+    session.feedback_data['Summary'] = [_item('1', 'High'), _item('2', 'Low')]
+    stats.update_feedback_data('Summary', session.feedback_data['Summary'])
+    session.feedback_data['Background'] = [_item('3', 'Medium')]
+    stats.update_feedback_data('Background', session.feedback_data['Background'])
+
+    session.accepted_feedback['Summary'].append(session.feedback_data['Summary'][0])
+    stats.record_acceptance('Summary', session.feedback_data['Summary'][0])
+    session.rejected_feedback['Background'].append(session.feedback_data['Background'][0])
+    stats.record_rejection('Background', session.feedback_data['Background'][0])
+
+    result = _assert_consistent(stats)
+    assert result['total_feedback'] == 3
+    assert (result['high_risk'], result['medium_risk'], result['low_risk']) == (1, 1, 1)
+    assert (result['accepted'], result['rejected']) == (1, 1)
+    assert result['sections_analyzed'] == 2
+
+
+def test_reanalysis_replaces_a_sections_counts():
+    session = FakeSession()
+    stats = SessionStatistics(session)
+
+    session.feedback_data['Summary'] = [_item('1', 'High'), _item('2', 'High')]
+    stats.update_feedback_data('Summary', session.feedback_data['Summary'])
+    session.feedback_data['Summary'] = [_item('3', 'Low')]
+    stats.update_feedback_data('Summary', session.feedback_data['Summary'])
+
+    result = _assert_consistent(stats)
+    assert result['total_feedback'] == 1
+    assert (result['high_risk'], result['low_risk']) == (0, 1)
+
+
+def test_revert_and_user_feedback_removal():
+    session = FakeSession()
+    stats = SessionStatistics(session)
+    items = [_item('1', 'High'), _item('2', 'Medium')]
+    session.feedback_data['Summary'] = items
+    stats.update_feedback_data('Summary', items)
+
+    session.accepted_feedback['Summary'].append(items[0])
+    stats.record_acceptance('Summary', items[0])
+    session.rejected_feedback['Summary'].append(items[1])
+    stats.record_rejection('Summary', items[1])
+
+    # Revert both decisions to pending
+    session.accepted_feedback['Summary'].remove(items[0])
+    session.rejected_feedback['Summary'].remove(items[1])
+    stats.record_revert('Summary', accepted_removed=1, rejected_removed=1)
+    result = _assert_consistent(stats)
+    assert (result['accepted'], result['rejected']) == (0, 0)
+
+    # A user-added item is accepted on creation, then deleted
+    custom = _item('u1', 'Low')
+    session.user_feedback['Summary'].append(custom)
+    stats.add_user_feedback('Summary', custom)
+    session.accepted_feedback['Summary'].append(custom)
+    stats.record_acceptance('Summary', custom)
+    assert _assert_consistent(stats)['user_added'] == 1
+
+    session.user_feedback['Summary'].remove(custom)
+    session.accepted_feedback['Summary'].remove(custom)
+    stats.remove_user_feedback('Summary', accepted_removed=1)
+    result = _assert_consistent(stats)
+    assert (result['user_added'], result['accepted']) == (0, 0)
+
+
+def test_reset_decisions_and_bulk_rebuild():
+    session = FakeSession()
+    stats = SessionStatistics(session)
+    items = [_item('1', 'High'), _item('2', 'Low')]
+    session.feedback_data['Summary'] = items
+    stats.update_feedback_data('Summary', items)
+    session.accepted_feedback['Summary'].extend(items)
+    stats.record_acceptance('Summary', items[0])
+    stats.record_acceptance('Summary', items[1])
+
+    session.accepted_feedback.clear()
+    stats.reset_decisions()
+    assert _assert_consistent(stats)['accepted'] == 0
+
+    # A session reload swaps the data wholesale
+    session.feedback_data = {'Other': [_item('9', 'Medium')]}
+    session.rejected_feedback = defaultdict(list, {'Other': [session.feedback_data['Other'][0]]})
+    stats.rebuild()
+    result = _assert_consistent(stats)
+    assert (result['total_feedback'], result['medium_risk'], result['rejected']) == (1, 1, 1)
+
+
+def test_cached_statistics_refresh_after_a_change():
+    session = FakeSession()
+    stats = SessionStatistics(session)
+    session.feedback_data['Summary'] = [_item('1', 'High')]
+    stats.update_feedback_data('Summary', session.feedback_data['Summary'])
+
+    before = stats.get_statistics()
+    assert stats.get_statistics() is before
+
+    session.accepted_feedback['Summary'].append(session.feedback_data['Summary'][0])
+    stats.record_acceptance('Summary', session.feedback_data['Summary'][0])
+    assert stats.get_statistics()['accepted'] == 1
@@ -0,0 +1,149 @@
+"""
+Behavior tests for core/single_flight.py
+"""
+
+import threading
+import time
+
+import pytest
+
+from core.single_flight import SingleFlight, make_flight_key
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, "timed out waiting for condition"
+        time.sleep(0.005)
+
+
+def _run_followers(group, key, count, results, errors):
+    def follower():
+        try:
+            results.append(group.do(key, lambda: pytest.fail("follower executed fn")))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=follower) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_concurrent_callers_share_one_execution():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def analyse():
+        calls.append(1)
+        release.wait(5)
+        return {'feedback_items': [{'id': 1}]}
+
+    leader_result = []
+    leader = threading.Thread(target=lambda: leader_result.append(group.do('key', analyse)))
+    leader.start()
+    _wait_for(lambda: 'key' in group.flights)
+
+    results, errors = [], []
+    followers = _run_followers(group, 'key', 3, results, errors)
+    _wait_for(lambda: group.flights['key'].waiters == 3)
+    release.set()
+
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert calls == [1]
+    assert not errors
+    assert leader_result == [({'feedback_items': [{'id': 1}]}, False)]
+    assert results == [({'feedback_items': [{'id': 1}]}, True)] * 3
+    assert group.get_stats() == {'executions': 1, 'coalesced': 3, 'in_flight': 0, 'enabled': True}
+
+
+def test_followers_get_deep_copies_the_leader_cannot_mutate():
+    group = SingleFlight()
+    release = threading.Event()
+
+    def analyse():
+        release.wait(5)
+        return {'feedback_items': [{'id': 1}]}
+
+    def leader():
+        result, _ = group.do('key', analyse)
+        # Callers annotate what they receive
+        result['feedback_items'][0]['section'] = 'leader'
+        result['feedback_items'].append({'id': 2})
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    _wait_for(lambda: 'key' in group.flights)
+
+    results, errors = [], []
+    followers = _run_followers(group, 'key', 2, results, errors)
+    _wait_for(lambda: group.flights['key'].waiters == 2)
+    release.set()
+
+    for thread in [leader_thread] + followers:
+        thread.join(5)
+
+    assert not errors
+    first, second = results[0][0], results[1][0]
+    assert first == second == {'feedback_items': [{'id': 1}]}
+    assert first is not second
+    assert first['feedback_items'][0] is not second['feedback_items'][0]
+
+
+def test_leader_error_is_raised_to_followers():
+    group = SingleFlight()
+    release = threading.Event()
+
+    def analyse():
+        release.wait(5)
+        raise RuntimeError('model unavailable')
+
+    leader_errors = []
+
+    def leader():
+        try:
+            group.do('key', analyse)
+        except RuntimeError as e:
+            leader_errors.append(e)
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    _wait_for(lambda: 'key' in group.flights)
+
+    results, errors = [], []
+    followers = _run_followers(group, 'key', 2, results, errors)
+    _wait_for(lambda: group.flights['key'].waiters == 2)
+    release.set()
+
+    for thread in [leader_thread] + followers:
+        thread.join(5)
+
+    assert not results
+    assert len(leader_errors) == 1
+    assert [str(e) for e in errors] == ['model unavailable'] * 2
+
+
+def test_sequential_calls_are_not_coalesced():
+    group = SingleFlight()
+    calls = []
+
+    def analyse():
+        calls.append(1)
+        return len(calls)
+
+    assert group.do('key', analyse) == (1, False)
+    assert group.do('key', analyse) == (2, False)
+    assert group.get_stats()['coalesced'] == 0
+
+
+def test_flight_key_covers_every_input():
+    base = make_flight_key('Summary', 'text', 'Full Write-up', 'model-a')
+
+    assert base == make_flight_key('Summary', 'text', 'Full Write-up', 'model-a')
+    assert base != make_flight_key('Background', 'text', 'Full Write-up', 'model-a')
+    assert base != make_flight_key('Summary', 'other text', 'Full Write-up', 'model-a')
+    assert base != make_flight_key('Summary', 'text', 'Summary', 'model-a')
+    assert base != make_flight_key('Summary', 'text', 'Full Write-up', 'model-b')
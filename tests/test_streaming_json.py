@@ -0,0 +1,72 @@
+"""
+Behavior tests for core/streaming_json.py
+"""
+
+import json
+
+from core.streaming_json import IncrementalArrayParser
+
+
+ITEMS = [
+    {'id': 'FB001', 'description': 'Missing {timeline} for "root cause"', 'risk_level': 'High'},
+    {'id': 'FB002', 'description': 'Escaped \\ backslash and } brace', 'tags': ['a', {'b': [1, 2]}]},
+    {'id': 'FB003', 'description': 'Unicode – naïve café', 'risk_level': 'Low'},
+]
+
+RESPONSE = 'Here is the analysis:\n' + json.dumps({
+    'feedback_items': ITEMS,
+    'summary': {'note': 'trailing object [not an item]'}
+}, ensure_ascii=False)
+
+
+def _feed_in_chunks(parser, text, size):
+    completed = []
+    for start in range(0, len(text), size):
+        completed.extend(parser.feed(text[start:start + size]))
+    return completed
+
+
+def test_whole_response_at_once():
+    parser = IncrementalArrayParser()
+    assert parser.feed(RESPONSE) == ITEMS
+    assert parser.items == ITEMS
+    assert parser.done
+
+
+def test_every_fragment_size_yields_the_same_items():
+    for size in (1, 2, 3, 7, 16, 64):
+        parser = IncrementalArrayParser()
+        assert _feed_in_chunks(parser, RESPONSE, size) == ITEMS, size
+
+
+def test_each_item_is_emitted_when_its_closing_brace_arrives():
+    parser = IncrementalArrayParser()
+    first_end = RESPONSE.index('"High"}') + len('"High"}')
+
+    assert parser.feed(RESPONSE[:first_end - 1]) == []
+    assert parser.feed(RESPONSE[first_end - 1:first_end]) == [ITEMS[0]]
+    assert parser.feed(RESPONSE[first_end:]) == ITEMS[1:]
+
+
+def test_key_split_across_fragments():
+    parser = IncrementalArrayParser()
+    split = RESPONSE.index('feedback_items') + 5
+
+    assert parser.feed(RESPONSE[:split]) == []
+    assert not parser.in_array
+    assert parser.feed(RESPONSE[split:]) == ITEMS
+
+
+def test_nothing_after_the_array_is_parsed():
+    parser = IncrementalArrayParser()
+    parser.feed(RESPONSE)
+
+    assert parser.feed('{"id": "late"}') == []
+    assert parser.items == ITEMS
+
+
+def test_other_keys_and_non_object_elements_are_ignored():
+    parser = IncrementalArrayParser(key='items')
+    text = '{"feedback_items": [{"id": "x"}], "items": [1, "two", {"id": "y"}, [3]]}'
+
+    assert parser.feed(text) == [{'id': 'y'}]
@@ -0,0 +1,108 @@
+"""
+Behavior tests for utils/thread_pool_manager.py
+"""
+
+import threading
+import time
+
+import pytest
+
+from utils.thread_pool_manager import TaskManager, TaskQueueFull
+
+
+@pytest.fixture
+def make_manager():
+    managers = []
+
+    def make(**kwargs):
+        manager = TaskManager(**kwargs)
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.shutdown(wait=True)
+
+
+def _wait_ready(manager, task_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while True:
+        status = manager.get_task_status(task_id)
+        if status['ready']:
+            return status
+        assert time.time() < deadline, f"task {task_id} never finished"
+        time.sleep(0.01)
+
+
+def test_submissions_beyond_workers_and_queue_are_rejected(make_manager):
+    manager = make_manager(max_workers=1, max_queue_size=1)
+    release = threading.Event()
+
+    running = manager.submit_task(release.wait, 5)
+    queued = manager.submit_task(release.wait, 5)
+    with pytest.raises(TaskQueueFull):
+        manager.submit_task(release.wait, 5)
+    assert manager.get_stats()['counters']['rejected'] == 1
+
+    release.set()
+    _wait_ready(manager, running)
+    _wait_ready(manager, queued)
+
+    # Capacity is returned as tasks finish
+    assert _wait_ready(manager, manager.submit_task(lambda: 'ok'))['result'] == 'ok'
+
+
+def test_failed_task_reports_its_error(make_manager):
+    manager = make_manager(max_workers=1)
+
+    def broken():
+        raise ValueError('bad input')
+
+    status = _wait_ready(manager, manager.submit_task(broken))
+    assert status['state'] == 'FAILURE'
+    assert status['error'] == 'bad input'
+    assert status['error_type'] == 'ValueError'
+
+
+def test_results_expire_after_their_ttl(make_manager):
+    manager = make_manager(max_workers=1, result_ttl=1, cleanup_interval=0.05)
+    task_id = manager.submit_task(lambda: 'done')
+    assert _wait_ready(manager, task_id)['result'] == 'done'
+
+    deadline = time.time() + 5
+    while manager.has_task(task_id):
+        assert time.time() < deadline, "result never expired"
+        time.sleep(0.05)
+
+    assert manager.get_task_status(task_id)['status'] == 'Task not found'
+    stats = manager.get_stats()
+    assert stats['counters']['expired'] == 1
+    assert stats['stored_result_bytes'] == 0
+
+
+def test_oldest_results_are_evicted_over_the_byte_cap(make_manager):
+    manager = make_manager(max_workers=1, max_result_bytes=250)
+    payload = 'x' * 100
+
+    task_ids = []
+    for _ in range(3):
+        task_ids.append(manager.submit_task(lambda: payload))
+        _wait_ready(manager, task_ids[-1])
+
+    assert not manager.has_task(task_ids[0])
+    assert manager.has_task(task_ids[1]) and manager.has_task(task_ids[2])
+    stats = manager.get_stats()
+    assert stats['counters']['evicted'] == 1
+    assert stats['stored_result_bytes'] <= 250
+
+
+def test_oldest_results_are_evicted_over_the_count_cap(make_manager):
+    manager = make_manager(max_workers=1, max_results=2)
+
+    task_ids = []
+    for number in range(3):
+        task_ids.append(manager.submit_task(lambda value=number: value))
+        _wait_ready(manager, task_ids[-1])
+
+    assert [manager.has_task(task_id) for task_id in task_ids] == [False, True, True]
+    assert manager.get_stats()['counters']['evicted'] == 1
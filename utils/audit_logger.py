@@ -6,25 +6,95 @@ Comprehensive logging of all user actions and system events
 import json
 import os
 import uuid
+import threading
 from datetime import datetime
 from collections import defaultdict
 
 
+class AuditLogFile:
+    """
+    Process-wide writer for the persistent audit log file
+
+    Shared by every AuditLogger so concurrent sessions append under one lock
+    instead of racing each other's read-modify-write of the same file.
+    """
+
+    MAX_ENTRIES = 1000
+
+    def __init__(self, log_file):
+        self.log_file = log_file
+        self.lock = threading.Lock()
+
+    def append(self, entries):
+        """Append log entries to the persistent file"""
+        with self.lock:
+            try:
+                existing_logs = self._read()
+
+                # Add new entries
+                existing_logs.extend(entries)
+
+                # Keep only last 1000 entries to prevent file from growing too large
+                if len(existing_logs) > self.MAX_ENTRIES:
+                    existing_logs = existing_logs[-self.MAX_ENTRIES:]
+
+                # Save back to file
+                os.makedirs(os.path.dirname(self.log_file) or '.', exist_ok=True)
+                with open(self.log_file, 'w') as f:
+                    json.dump(existing_logs, f, indent=2)
+
+            except Exception as e:
+                print(f"Error saving log entry: {e}")
+
+    def read_all(self):
+        """All entries in the persistent file"""
+        with self.lock:
+            return self._read()
+
+    def _read(self):
+        if not os.path.exists(self.log_file):
+            return []
+
+        try:
+            with open(self.log_file, 'r') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return []
+
+
+# Shared writers, one per log file
+_log_files = {}
+_log_files_lock = threading.Lock()
+
+
+def get_audit_log_file(log_file="data/audit_logs.json"):
+    """Get the process-wide writer for a log file"""
+    with _log_files_lock:
+        if log_file not in _log_files:
+            _log_files[log_file] = AuditLogFile(log_file)
+        return _log_files[log_file]
+
+
 class AuditLogger:
-    def __init__(self, log_file="data/audit_logs.json"):
+    """
+    Per-session view of the audit log
+
+    Construction does no I/O: SESSION_START is recorded in memory and written
+    to the shared log file together with the session's first real entry.
+    """
+
+    def __init__(self, log_file="data/audit_logs.json", session_id=None):
         self.log_file = log_file
-        self.session_id = str(uuid.uuid4())[:8]
+        self.log_store = get_audit_log_file(log_file)
+        self.session_id = session_id or str(uuid.uuid4())[:8]
         self.session_start = datetime.now()
         self.session_logs = []
+        self._unsaved = []
         
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        
-        # Log session start
-        self.log("SESSION_START", "New review session started")
+        # Log session start (persisted with the first real entry)
+        self._record("SESSION_START", "New review session started", "INFO")
     
-    def log(self, action, details, level="INFO"):
-        """Add a log entry"""
+    def _record(self, action, details, level):
         log_entry = {
             "timestamp": datetime.now().isoformat(),
             "session_id": self.session_id,
@@ -35,50 +105,39 @@ class AuditLogger:
         
         # Add to session logs
         self.session_logs.append(log_entry)
+        self._unsaved.append(log_entry)
+        return log_entry
+    
+    def log(self, action, details, level="INFO"):
+        """Add a log entry"""
+        self._record(action, details, level)
         
         # Also save to persistent file
-        self._save_to_file(log_entry)
+        self._save_to_file()
     
-    def _save_to_file(self, log_entry):
-        """Save log entry to persistent file"""
-        try:
-            # Load existing logs
-            existing_logs = []
-            if os.path.exists(self.log_file):
-                try:
-                    with open(self.log_file, 'r') as f:
-                        existing_logs = json.load(f)
-                except json.JSONDecodeError:
-                    existing_logs = []
-            
-            # Add new entry
-            existing_logs.append(log_entry)
-            
-            # Keep only last 1000 entries to prevent file from growing too large
-            if len(existing_logs) > 1000:
-                existing_logs = existing_logs[-1000:]
-            
-            # Save back to file
-            with open(self.log_file, 'w') as f:
-                json.dump(existing_logs, f, indent=2)
-                
-        except Exception as e:
-            print(f"Error saving log entry: {e}")
+    def _save_to_file(self):
+        """Save pending log entries to the shared persistent file"""
+        entries, self._unsaved = self._unsaved, []
+        if entries:
+            self.log_store.append(entries)
     
+    def restore_session_logs(self, logs):
+        """Continue a session whose logs were recorded elsewhere (e.g. another app process)"""
+        self.session_logs = list(logs)
+        # Pending entries stay pending only if they are still part of the session
+        self._unsaved = [entry for entry in self._unsaved if entry in self.session_logs]
+        try:
+            self.session_start = datetime.fromisoformat(self.session_logs[0]['timestamp'])
+        except (IndexError, KeyError, TypeError, ValueError):
+            pass
+
     def get_session_logs(self):
         """Get logs for current session"""
         return self.session_logs
     
     def get_all_logs(self):
         """Get all logs from file"""
-        if not os.path.exists(self.log_file):
-            return []
-        
-        try:
-            with open(self.log_file, 'r') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return []
+        return self.log_store.read_all()
     
     def get_logs_by_session(self, session_id):
         """Get logs for a specific session"""
@@ -3,16 +3,58 @@ AI Learning System Module for AI-Prism
 Learns from user feedback patterns to improve AI suggestions
 """
 
+import copy
 import json
 import os
+import threading
 from datetime import datetime
 from collections import defaultdict
 
 
 class FeedbackLearningSystem:
+    """
+    Learns from feedback decisions across all sessions, backed by a JSON file
+
+    One instance is shared by all sessions (see get_learning_system). The
+    file is only read on first use, and re-read before an update or report if
+    another process has written it since. Readers and writers hold self.lock;
+    data handed out of the lock is a copy.
+    """
+
     def __init__(self, storage_file="data/learning_data.json"):
         self.storage_file = storage_file
-        self.learning_data = self._load_learning_data()
+        self.lock = threading.RLock()
+        self._learning_data = None
+        self._loaded_mtime = None
+    
+    @property
+    def learning_data(self):
+        """Learning data, loaded from disk on first access"""
+        if self._learning_data is None:
+            with self.lock:
+                if self._learning_data is None:
+                    self._loaded_mtime = self._file_mtime()
+                    self._learning_data = self._load_learning_data()
+        return self._learning_data
+    
+    @learning_data.setter
+    def learning_data(self, value):
+        self._learning_data = value
+    
+    def _file_mtime(self):
+        try:
+            return os.path.getmtime(self.storage_file)
+        except OSError:
+            return None
+    
+    def _reload_if_changed(self):
+        """Pick up writes from other processes (caller holds the lock)"""
+        if self._learning_data is not None:
+            mtime = self._file_mtime()
+            if mtime != self._loaded_mtime:
+                # Swap in the fresh copy - never leave the data unset
+                self._learning_data = self._load_learning_data()
+                self._loaded_mtime = mtime
         
     def _load_learning_data(self):
         """Load existing learning data"""
@@ -54,9 +96,15 @@ class FeedbackLearningSystem:
         os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
         with open(self.storage_file, 'w') as f:
             json.dump(self.learning_data, f, indent=2)
+        self._loaded_mtime = self._file_mtime()
     
     def add_custom_feedback(self, feedback_item, section_name):
         """Add custom feedback for learning"""
+        with self.lock:
+            self._reload_if_changed()
+            self._add_custom_feedback(feedback_item, section_name)
+    
+    def _add_custom_feedback(self, feedback_item, section_name):
         feedback_entry = feedback_item.copy()
         feedback_entry["section_type"] = section_name
         feedback_entry["timestamp"] = datetime.now().isoformat()
@@ -73,6 +121,11 @@ class FeedbackLearningSystem:
     
     def record_ai_feedback_response(self, feedback_item, section_name, accepted):
         """Record user response to AI feedback"""
+        with self.lock:
+            self._reload_if_changed()
+            self._record_ai_feedback_response(feedback_item, section_name, accepted)
+    
+    def _record_ai_feedback_response(self, feedback_item, section_name, accepted):
         feedback_entry = feedback_item.copy()
         feedback_entry["section_type"] = section_name
         feedback_entry["timestamp"] = datetime.now().isoformat()
@@ -219,6 +272,11 @@ class FeedbackLearningSystem:
     
     def get_recommended_feedback(self, section_name, content):
         """Get recommended feedback based on past patterns"""
+        with self.lock:
+            self._reload_if_changed()
+            return self._get_recommended_feedback(section_name, content)
+    
+    def _get_recommended_feedback(self, section_name, content):
         if section_name not in self.learning_data["section_patterns"]:
             return []
         
@@ -262,6 +320,11 @@ class FeedbackLearningSystem:
     
     def generate_learning_report_html(self):
         """Generate HTML report of learning system status"""
+        with self.lock:
+            self._reload_if_changed()
+            return self._generate_learning_report_html()
+    
+    def _generate_learning_report_html(self):
         metrics = self.learning_data["learning_metrics"]
         
         html = f"""
@@ -401,28 +464,46 @@ class FeedbackLearningSystem:
     
     def get_learning_statistics(self):
         """Get learning statistics for API"""
-        return {
-            "total_custom_feedback": len(self.learning_data["custom_feedback"]),
-            "total_accepted": len(self.learning_data["accepted_ai_feedback"]),
-            "total_rejected": len(self.learning_data["rejected_ai_feedback"]),
-            "sections_with_patterns": len(self.learning_data["section_patterns"]),
-            "learning_metrics": self.learning_data["learning_metrics"],
-            "user_preferences": self.learning_data["user_preferences"]
-        }
+        with self.lock:
+            self._reload_if_changed()
+            return {
+                "total_custom_feedback": len(self.learning_data["custom_feedback"]),
+                "total_accepted": len(self.learning_data["accepted_ai_feedback"]),
+                "total_rejected": len(self.learning_data["rejected_ai_feedback"]),
+                "sections_with_patterns": len(self.learning_data["section_patterns"]),
+                "learning_metrics": copy.deepcopy(self.learning_data["learning_metrics"]),
+                "user_preferences": copy.deepcopy(self.learning_data["user_preferences"])
+            }
     
     def clear_learning_data(self):
         """Clear all learning data"""
-        self.learning_data = {
-            "custom_feedback": [],
-            "accepted_ai_feedback": [],
-            "rejected_ai_feedback": [],
-            "section_patterns": {},
-            "user_preferences": {},
-            "learning_metrics": {
-                "total_sessions": 0,
-                "total_feedback_items": 0,
-                "acceptance_rate": 0.0,
-                "learning_accuracy": 0.0
+        with self.lock:
+            self.learning_data = {
+                "custom_feedback": [],
+                "accepted_ai_feedback": [],
+                "rejected_ai_feedback": [],
+                "section_patterns": {},
+                "user_preferences": {},
+                "learning_metrics": {
+                    "total_sessions": 0,
+                    "total_feedback_items": 0,
+                    "acceptance_rate": 0.0,
+                    "learning_accuracy": 0.0
+                }
             }
-        }
-        self._save_learning_data()
\ No newline at end of file
+            self._save_learning_data()
+
+
+# Global instance
+_learning_system = None
+_learning_system_lock = threading.Lock()
+
+
+def get_learning_system():
+    """Get the process-wide learning system"""
+    global _learning_system
+
+    with _learning_system_lock:
+        if _learning_system is None:
+            _learning_system = FeedbackLearningSystem()
+        return _learning_system
\ No newline at end of file
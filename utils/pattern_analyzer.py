@@ -3,16 +3,58 @@ Pattern Analysis Module for AI-Prism
 Identifies recurring patterns across documents and feedback
 """
 
+import copy
 import json
 import os
+import threading
 from datetime import datetime
 from collections import defaultdict
 
 
 class DocumentPatternAnalyzer:
+    """
+    Cross-document pattern analysis backed by a JSON file
+
+    One instance is shared by all sessions (see get_pattern_analyzer). The
+    file is only read on first use, and re-read before an update or report if
+    another process has written it since. Readers and writers hold self.lock;
+    data handed out of the lock is a copy.
+    """
+
     def __init__(self, storage_file="data/pattern_analysis.json"):
         self.storage_file = storage_file
-        self.pattern_data = self._load_pattern_data()
+        self.lock = threading.RLock()
+        self._pattern_data = None
+        self._loaded_mtime = None
+    
+    @property
+    def pattern_data(self):
+        """Pattern data, loaded from disk on first access"""
+        if self._pattern_data is None:
+            with self.lock:
+                if self._pattern_data is None:
+                    self._loaded_mtime = self._file_mtime()
+                    self._pattern_data = self._load_pattern_data()
+        return self._pattern_data
+    
+    @pattern_data.setter
+    def pattern_data(self, value):
+        self._pattern_data = value
+    
+    def _file_mtime(self):
+        try:
+            return os.path.getmtime(self.storage_file)
+        except OSError:
+            return None
+    
+    def _reload_if_changed(self):
+        """Pick up writes from other processes (caller holds the lock)"""
+        if self._pattern_data is not None:
+            mtime = self._file_mtime()
+            if mtime != self._loaded_mtime:
+                # Swap in the fresh copy - never leave the data unset
+                self._pattern_data = self._load_pattern_data()
+                self._loaded_mtime = mtime
         
     def _load_pattern_data(self):
         """Load existing pattern data"""
@@ -40,9 +82,15 @@ class DocumentPatternAnalyzer:
         os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
         with open(self.storage_file, 'w') as f:
             json.dump(self.pattern_data, f, indent=2)
+        self._loaded_mtime = self._file_mtime()
     
     def add_document_feedback(self, doc_name, feedback_items):
         """Add feedback from a document to the analyzer"""
+        with self.lock:
+            self._reload_if_changed()
+            self._add_document_feedback(doc_name, feedback_items)
+    
+    def _add_document_feedback(self, doc_name, feedback_items):
         document_entry = {
             "document_name": doc_name,
             "timestamp": datetime.now().isoformat(),
@@ -166,12 +214,17 @@ class DocumentPatternAnalyzer:
     
     def find_recurring_patterns(self, threshold=2):
         """Get recurring patterns that meet the threshold"""
-        return [pattern for pattern in self.pattern_data["recurring_patterns"] 
-                if pattern["occurrence_count"] >= threshold]
+        with self.lock:
+            self._reload_if_changed()
+            return copy.deepcopy([pattern for pattern in self.pattern_data["recurring_patterns"] 
+                                  if pattern["occurrence_count"] >= threshold])
     
     def get_pattern_report_html(self):
         """Generate HTML report of patterns"""
-        patterns = self.find_recurring_patterns()
+        with self.lock:
+            self._reload_if_changed()
+            patterns = self.find_recurring_patterns()
+            total_docs = len(self.pattern_data["document_history"])
         
         if not patterns:
             return """
@@ -220,7 +273,6 @@ class DocumentPatternAnalyzer:
             """
         
         # Add summary statistics
-        total_docs = len(self.pattern_data["document_history"])
         html += f"""
             </div>
             <div style="margin-top: 20px; padding: 15px; background: #f0f8ff; border-radius: 4px;" class="dark-mode-feedback-item">
@@ -236,18 +288,38 @@ class DocumentPatternAnalyzer:
     
     def get_category_trends(self):
         """Get category trends data"""
-        return self.pattern_data.get("category_trends", {})
+        with self.lock:
+            self._reload_if_changed()
+            return copy.deepcopy(self.pattern_data.get("category_trends", {}))
     
     def get_risk_patterns(self):
         """Get risk pattern data"""
-        return self.pattern_data.get("risk_patterns", {})
+        with self.lock:
+            self._reload_if_changed()
+            return copy.deepcopy(self.pattern_data.get("risk_patterns", {}))
     
     def clear_pattern_data(self):
         """Clear all pattern data"""
-        self.pattern_data = {
-            "document_history": [],
-            "recurring_patterns": [],
-            "category_trends": {},
-            "risk_patterns": {}
-        }
-        self._save_pattern_data()
\ No newline at end of file
+        with self.lock:
+            self.pattern_data = {
+                "document_history": [],
+                "recurring_patterns": [],
+                "category_trends": {},
+                "risk_patterns": {}
+            }
+            self._save_pattern_data()
+
+
+# Global instance
+_pattern_analyzer = None
+_pattern_analyzer_lock = threading.Lock()
+
+
+def get_pattern_analyzer():
+    """Get the process-wide pattern analyzer"""
+    global _pattern_analyzer
+
+    with _pattern_analyzer_lock:
+        if _pattern_analyzer is None:
+            _pattern_analyzer = DocumentPatternAnalyzer()
+        return _pattern_analyzer
\ No newline at end of file
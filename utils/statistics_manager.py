@@ -372,4 +372,143 @@ class StatisticsManager:
         if total_ai_feedback == 0:
             return 0
         
-        return round((user_additions / total_ai_feedback) * 100, 1)
\ No newline at end of file
+        return round((user_additions / total_ai_feedback) * 100, 1)
+
+
+class SessionStatistics(StatisticsManager):
+    """
+    Statistics for one review session, updated incrementally
+
+    Reads the session's own feedback_data / accepted_feedback /
+    rejected_feedback / user_feedback instead of copying them. Totals, risk
+    buckets and decision counts are counters adjusted in O(1) per accept,
+    reject, add or revert, so get_statistics never rescans the session.
+    Breakdowns are built lazily and cached until the next change (version).
+
+    Callers update the session's lists first, then report the change here.
+    Bulk edits (reloads, clears) call rebuild().
+    """
+
+    def __init__(self, review_session):
+        self.session = review_session
+        self.statistics_cache = {}
+        self.version = 0
+        self.cache_version = 0
+        self.rebuild()
+
+    # Session data (read-only views used by the inherited breakdowns)
+    @property
+    def feedback_data(self):
+        return self.session.feedback_data
+
+    @property
+    def accepted_feedback(self):
+        return self.session.accepted_feedback
+
+    @property
+    def rejected_feedback(self):
+        return self.session.rejected_feedback
+
+    @property
+    def user_feedback(self):
+        return self.session.user_feedback
+
+    def rebuild(self):
+        """Recount everything from the session (after bulk changes)"""
+        self.section_counts = {}
+        self.total = 0
+        self.risk_counts = defaultdict(int)
+        for section_name, items in self.feedback_data.items():
+            self._add_section(section_name, items)
+
+        self.counts = {
+            'accepted': sum(len(items) for items in self.accepted_feedback.values()),
+            'rejected': sum(len(items) for items in self.rejected_feedback.values()),
+            'user_added': sum(len(items) for items in self.user_feedback.values())
+        }
+        self._invalidate_cache()
+
+    def _add_section(self, section_name, items):
+        risks = defaultdict(int)
+        for item in items:
+            risks[item.get('risk_level')] += 1
+        self.section_counts[section_name] = (len(items), risks)
+        self.total += len(items)
+        for risk_level, count in risks.items():
+            self.risk_counts[risk_level] += count
+
+    def update_feedback_data(self, section_name, feedback_items):
+        """Section (re-)analyzed - swap its counts for the new items"""
+        previous = self.section_counts.pop(section_name, None)
+        if previous is not None:
+            self.total -= previous[0]
+            for risk_level, count in previous[1].items():
+                self.risk_counts[risk_level] -= count
+        self._add_section(section_name, feedback_items)
+        self._invalidate_cache()
+
+    def record_acceptance(self, section_name, feedback_item):
+        self.counts['accepted'] += 1
+        self._invalidate_cache()
+
+    def record_rejection(self, section_name, feedback_item):
+        self.counts['rejected'] += 1
+        self._invalidate_cache()
+
+    def add_user_feedback(self, section_name, feedback_item):
+        self.counts['user_added'] += 1
+        self._invalidate_cache()
+
+    def record_revert(self, section_name, accepted_removed=0, rejected_removed=0):
+        """Decisions reverted to pending"""
+        self.counts['accepted'] -= accepted_removed
+        self.counts['rejected'] -= rejected_removed
+        self._invalidate_cache()
+
+    def remove_user_feedback(self, section_name, accepted_removed=0):
+        """One user-added item deleted"""
+        self.counts['user_added'] -= 1
+        self.counts['accepted'] -= accepted_removed
+        self._invalidate_cache()
+
+    def reset_decisions(self):
+        """All accept/reject decisions cleared"""
+        self.counts['accepted'] = 0
+        self.counts['rejected'] = 0
+        self._invalidate_cache()
+
+    def mark_changed(self):
+        """Item contents edited - counts unchanged, breakdowns stale"""
+        self._invalidate_cache()
+
+    def _invalidate_cache(self):
+        self.version += 1
+
+    def _sync_cache(self):
+        if self.cache_version != self.version:
+            self.statistics_cache = {}
+            self.cache_version = self.version
+
+    def get_statistics(self):
+        self._sync_cache()
+        return super().get_statistics()
+
+    def get_detailed_breakdown(self, stat_type):
+        self._sync_cache()
+        return super().get_detailed_breakdown(stat_type)
+
+    # O(1) counters
+    def _calculate_total_feedback(self):
+        return self.total
+
+    def _count_risk_level(self, risk_level):
+        return self.risk_counts.get(risk_level, 0)
+
+    def _count_accepted(self):
+        return self.counts['accepted']
+
+    def _count_rejected(self):
+        return self.counts['rejected']
+
+    def _count_user_added(self):
+        return self.counts['user_added']
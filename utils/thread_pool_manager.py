@@ -1,47 +1,112 @@
 """
 Thread Pool Task Manager - Replacement for Celery
 Simple, efficient task queue using ThreadPoolExecutor
+
+This is the no-Redis fallback for the RQ path. Task statuses use the same
+schema as app.build_job_status (task_id, state, status, progress, ready,
+result/error), so the Flask endpoints can serve either transparently.
 """
 
-from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, defaultdict, deque
+import os
+import json
 import uuid
 import time
 from typing import Dict, Callable, Any, Optional
 import threading
 import traceback
-from datetime import datetime
+
+
+class TaskManagerConfig:
+    """
+    Local task manager limits (overridable via environment variables)
+    """
+    MAX_WORKERS = int(os.environ.get('LOCAL_TASK_MAX_WORKERS', '10'))
+    # Tasks allowed to wait for a worker before submissions are rejected
+    MAX_QUEUE_SIZE = int(os.environ.get('LOCAL_TASK_MAX_QUEUE', '50'))
+    RESULT_TTL_SECONDS = int(os.environ.get('LOCAL_TASK_RESULT_TTL', '3600'))
+    MAX_RESULTS = int(os.environ.get('LOCAL_TASK_MAX_RESULTS', '1000'))
+    MAX_RESULT_BYTES = int(os.environ.get('LOCAL_TASK_MAX_RESULT_BYTES', str(50 * 1024 * 1024)))  # 50MB
+    LATENCY_WINDOW = int(os.environ.get('LOCAL_TASK_LATENCY_WINDOW', '200'))
+
+
+class TaskQueueFull(Exception):
+    """Raised by submit_task when every worker is busy and the queue is full"""
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate memory held by a stored result (its JSON size)"""
+    try:
+        return len(json.dumps(value, default=str))
+    except Exception:
+        return 1024
+
 
 class TaskManager:
     """
-    Simple task manager using ThreadPoolExecutor
+    Bounded task manager using ThreadPoolExecutor
 
     Replaces Celery with a simpler in-memory solution.
     Perfect for I/O-bound tasks like Bedrock API calls.
 
     Features:
-    - Non-blocking task submission
-    - Task status polling (compatible with existing frontend)
-    - Automatic cleanup of old tasks
-    - Thread pool management
-    - Error handling and recovery
+    - Backpressure: at most max_workers running + max_queue_size waiting,
+      further submissions raise TaskQueueFull
+    - Finished results kept in a TTL store capped by count and bytes
+    - Status reads never call back into the manager while holding its lock
+    - Per-function latency and queue-wait statistics
+    - Same status schema as the RQ path
     """
 
-    def __init__(self, max_workers: int = 10, cleanup_interval: int = 300):
+    def __init__(self, max_workers: Optional[int] = None, cleanup_interval: int = 60,
+                 max_queue_size: Optional[int] = None, result_ttl: Optional[int] = None,
+                 max_results: Optional[int] = None, max_result_bytes: Optional[int] = None):
         """
         Initialize task manager
 
         Args:
             max_workers: Maximum number of concurrent threads
-            cleanup_interval: Cleanup interval in seconds (default 5 minutes)
+            cleanup_interval: Seconds between expired-result sweeps
+            max_queue_size: Tasks allowed to wait for a free worker
+            result_ttl: Seconds a finished result stays retrievable
+            max_results: Maximum finished results kept
+            max_result_bytes: Approximate memory cap for finished results
         """
+        self.max_workers = max_workers or TaskManagerConfig.MAX_WORKERS
+        self.max_queue_size = TaskManagerConfig.MAX_QUEUE_SIZE if max_queue_size is None else max_queue_size
+        self.result_ttl = result_ttl or TaskManagerConfig.RESULT_TTL_SECONDS
+        self.max_results = max_results or TaskManagerConfig.MAX_RESULTS
+        self.max_result_bytes = max_result_bytes or TaskManagerConfig.MAX_RESULT_BYTES
+        self.cleanup_interval = cleanup_interval
+
         self.executor = ThreadPoolExecutor(
-            max_workers=max_workers,
+            max_workers=self.max_workers,
             thread_name_prefix='aiprism_worker'
         )
+        # Running + waiting slots; acquired without blocking on submit
+        self.capacity = threading.BoundedSemaphore(self.max_workers + self.max_queue_size)
+
+        # task_id -> record for tasks not finished yet
         self.tasks: Dict[str, Dict[str, Any]] = {}
-        self.lock = threading.Lock()
-        self.max_workers = max_workers
-        self.cleanup_interval = cleanup_interval
+        # task_id -> record for finished tasks, oldest first
+        self.results: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.result_bytes = 0
+        self.lock = threading.RLock()
+
+        self.function_stats = defaultdict(lambda: {
+            'succeeded': 0,
+            'failed': 0,
+            'durations': deque(maxlen=TaskManagerConfig.LATENCY_WINDOW),
+            'queue_waits': deque(maxlen=TaskManagerConfig.LATENCY_WINDOW)
+        })
+        self.counters = {
+            'submitted': 0,
+            'rejected': 0,
+            'cancelled': 0,
+            'expired': 0,
+            'evicted': 0
+        }
 
         # Start cleanup thread
         self._cleanup_thread = threading.Thread(
@@ -51,7 +116,8 @@ class TaskManager:
         )
         self._cleanup_thread.start()
 
-        print(f"✅ TaskManager initialized with {max_workers} workers")
+        print(f"✅ TaskManager initialized with {self.max_workers} workers "
+              f"(queue: {self.max_queue_size}, result TTL: {self.result_ttl}s)")
 
     def submit_task(self, func: Callable, *args, **kwargs) -> str:
         """
@@ -64,11 +130,29 @@ class TaskManager:
 
         Returns:
             task_id: Unique identifier for the task
+
+        Raises:
+            TaskQueueFull: All workers busy and the waiting queue is full
         """
-        task_id = str(uuid.uuid4())
+        if not self.capacity.acquire(blocking=False):
+            with self.lock:
+                self.counters['rejected'] += 1
+            raise TaskQueueFull(
+                f"Task queue full ({self.max_workers} running, {self.max_queue_size} waiting)"
+            )
 
-        # Wrap function to capture exceptions
+        task_id = str(uuid.uuid4())
+        record = {
+            'function': func.__name__,
+            'created': time.time(),
+            'started': None,
+            'completed': None,
+            'future': None
+        }
+
+        # Wrap function to capture timing and exceptions
         def wrapped_func():
+            record['started'] = time.time()
             try:
                 return func(*args, **kwargs)
             except Exception as e:
@@ -76,21 +160,132 @@ class TaskManager:
                 traceback.print_exc()
                 raise
 
-        future = self.executor.submit(wrapped_func)
-
         with self.lock:
-            self.tasks[task_id] = {
-                'future': future,
-                'created': time.time(),
-                'status': 'PENDING',
-                'function': func.__name__,
-                'started': None,
-                'completed': None
-            }
+            self.tasks[task_id] = record
+            self.counters['submitted'] += 1
+
+        try:
+            future = self.executor.submit(wrapped_func)
+        except Exception:
+            with self.lock:
+                self.tasks.pop(task_id, None)
+            self.capacity.release()
+            raise
+
+        record['future'] = future
+        future.add_done_callback(lambda f: self._on_done(task_id, f))
 
         print(f"📤 Task {task_id[:8]} submitted: {func.__name__}")
         return task_id
 
+    def _on_done(self, task_id: str, future):
+        """Move a finished task into the result store"""
+        self.capacity.release()
+        now = time.time()
+
+        with self.lock:
+            record = self.tasks.pop(task_id, None)
+            if record is None:
+                return
+
+            record['completed'] = now
+            record['expires'] = now + self.result_ttl
+            stats = self.function_stats[record['function']]
+
+            if future.cancelled():
+                record['state'] = 'CANCELED'
+                record['error'] = 'Task cancelled'
+                self.counters['cancelled'] += 1
+            elif future.exception() is not None:
+                error = future.exception()
+                record['state'] = 'FAILURE'
+                record['error'] = str(error)
+                record['error_type'] = type(error).__name__
+                stats['failed'] += 1
+            else:
+                record['state'] = 'SUCCESS'
+                record['result'] = future.result()
+                stats['succeeded'] += 1
+
+            if record['started'] is not None:
+                stats['durations'].append(now - record['started'])
+                stats['queue_waits'].append(record['started'] - record['created'])
+
+            # The future holds the result too - keep only the record
+            record['future'] = None
+            record['size'] = _estimate_size(record.get('result'))
+            self.results[task_id] = record
+            self.result_bytes += record['size']
+            self._enforce_result_limits_locked()
+
+    def _enforce_result_limits_locked(self):
+        while self.results and (len(self.results) > self.max_results or
+                                self.result_bytes > self.max_result_bytes):
+            _, record = self.results.popitem(last=False)
+            self.result_bytes -= record['size']
+            self.counters['evicted'] += 1
+
+    def _build_status_locked(self, task_id: str) -> Dict[str, Any]:
+        """Status in the RQ build_job_status schema (caller holds the lock)"""
+        record = self.results.get(task_id) or self.tasks.get(task_id)
+        if record is None:
+            return {
+                'task_id': task_id,
+                'state': 'PENDING',
+                'status': 'Task not found',
+                'progress': 0,
+                'ready': False
+            }
+
+        response = {
+            'task_id': task_id,
+            'function': record['function']
+        }
+        state = record.get('state')
+
+        if state == 'SUCCESS':
+            response.update({
+                'state': 'SUCCESS',
+                'status': 'Task completed successfully',
+                'progress': 100,
+                'ready': True,
+                'result': record['result'],
+                'duration': round(record['completed'] - record['created'], 2)
+            })
+        elif state in ('FAILURE', 'CANCELED'):
+            response.update({
+                'state': state,
+                'status': 'Task failed' if state == 'FAILURE' else 'Task cancelled',
+                'progress': 0,
+                'ready': True,
+                'error': record['error']
+            })
+            if 'error_type' in record:
+                response['error_type'] = record['error_type']
+        elif record['started'] is not None:
+            response.update({
+                'state': 'PROGRESS',
+                'status': 'Task is running',
+                'progress': 50,
+                'ready': False,
+                'elapsed': round(time.time() - record['created'], 2)
+            })
+        else:
+            response.update({
+                'state': 'PENDING',
+                'status': 'Task is queued',
+                'progress': 0,
+                'ready': False,
+                'elapsed': round(time.time() - record['created'], 2)
+            })
+
+        return response
+
+    def has_task(self, task_id: str) -> bool:
+        """Whether this manager owns (or still remembers) a task id"""
+        with self.lock:
+            return task_id in self.tasks or task_id in self.results
+
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """
         Get status of a task
@@ -99,69 +294,34 @@ class TaskManager:
             task_id: Task identifier
 
         Returns:
-            Dictionary with status, result, or error
+            Dictionary with state, progress, ready and result or error
         """
         with self.lock:
-            if task_id not in self.tasks:
-                return {
-                    'status': 'NOT_FOUND',
-                    'error': f'Task {task_id} not found'
-                }
+            return self._build_status_locked(task_id)
 
-            task_info = self.tasks[task_id]
-            future = task_info['future']
-
-            if future.done():
-                if task_info['completed'] is None:
-                    task_info['completed'] = time.time()
-
-                try:
-                    result = future.result()
-                    task_info['status'] = 'SUCCESS'
-
-                    duration = task_info['completed'] - task_info['created']
-
-                    return {
-                        'status': 'SUCCESS',
-                        'result': result,
-                        'duration': round(duration, 2),
-                        'function': task_info['function']
-                    }
-                except Exception as e:
-                    task_info['status'] = 'FAILURE'
-                    return {
-                        'status': 'FAILURE',
-                        'error': str(e),
-                        'error_type': type(e).__name__,
-                        'function': task_info['function']
-                    }
-            else:
-                # Mark as started if not already
-                if task_info['started'] is None:
-                    task_info['started'] = time.time()
-
-                return {
-                    'status': 'PENDING',
-                    'function': task_info['function'],
-                    'elapsed': round(time.time() - task_info['created'], 2)
-                }
+    def get_task_statuses(self, task_ids) -> Dict[str, Dict[str, Any]]:
+        """Statuses of many tasks under one lock acquisition"""
+        with self.lock:
+            return {task_id: self._build_status_locked(task_id) for task_id in task_ids}
 
     def get_all_tasks(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all tasks"""
+        now = time.time()
         with self.lock:
+            records = list(self.tasks.items()) + list(self.results.items())
             return {
                 task_id: {
-                    'status': self.get_task_status(task_id)['status'],
-                    'function': task_info['function'],
-                    'created': task_info['created'],
-                    'age': time.time() - task_info['created']
+                    'state': self._build_status_locked(task_id)['state'],
+                    'function': record['function'],
+                    'created': record['created'],
+                    'age': now - record['created']
                 }
-                for task_id, task_info in self.tasks.items()
+                for task_id, record in records
             }
 
     def cancel_task(self, task_id: str) -> bool:
         """
-        Attempt to cancel a task
+        Attempt to cancel a task (only possible while it is still queued)
 
         Args:
             task_id: Task identifier
@@ -170,64 +330,74 @@ class TaskManager:
             True if cancelled, False otherwise
         """
         with self.lock:
-            if task_id not in self.tasks:
-                return False
+            record = self.tasks.get(task_id)
+            future = record['future'] if record else None
 
-            future = self.tasks[task_id]['future']
-            cancelled = future.cancel()
+        if future is None:
+            return False
 
-            if cancelled:
-                self.tasks[task_id]['status'] = 'CANCELLED'
-                print(f"❌ Task {task_id[:8]} cancelled")
-
-            return cancelled
+        # Runs the done callback, which records the cancellation
+        cancelled = future.cancel()
+        if cancelled:
+            print(f"❌ Task {task_id[:8]} cancelled")
+        return cancelled
 
     def get_stats(self) -> Dict[str, Any]:
         """Get task manager statistics"""
         with self.lock:
-            total = len(self.tasks)
-            statuses = {}
-
-            for task_info in self.tasks.values():
-                status = task_info['status']
-                statuses[status] = statuses.get(status, 0) + 1
+            running = sum(1 for record in self.tasks.values() if record['started'] is not None)
+            queued = len(self.tasks) - running
+
+            statuses = {'PENDING': queued, 'PROGRESS': running}
+            for record in self.results.values():
+                statuses[record['state']] = statuses.get(record['state'], 0) + 1
+
+            functions = {}
+            for name, stats in self.function_stats.items():
+                durations = sorted(stats['durations'])
+                waits = list(stats['queue_waits'])
+                functions[name] = {
+                    'succeeded': stats['succeeded'],
+                    'failed': stats['failed'],
+                    'avg_duration': round(sum(durations) / len(durations), 3) if durations else None,
+                    'p50_duration': round(durations[len(durations) // 2], 3) if durations else None,
+                    'p95_duration': round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 3) if durations else None,
+                    'avg_queue_wait': round(sum(waits) / len(waits), 3) if waits else None
+                }
 
             return {
-                'total_tasks': total,
+                'total_tasks': len(self.tasks) + len(self.results),
                 'max_workers': self.max_workers,
+                'max_queue_size': self.max_queue_size,
                 'statuses': statuses,
-                'active_tasks': statuses.get('PENDING', 0),
+                'active_tasks': running,
+                'queued_tasks': queued,
                 'completed_tasks': statuses.get('SUCCESS', 0),
-                'failed_tasks': statuses.get('FAILURE', 0)
+                'failed_tasks': statuses.get('FAILURE', 0),
+                'stored_results': len(self.results),
+                'stored_result_bytes': self.result_bytes,
+                'counters': self.counters.copy(),
+                'functions': functions
             }
 
     def _cleanup_old_tasks(self):
         """
-        Background thread to remove completed tasks older than 1 hour
+        Background thread removing finished results past their TTL
         Runs every cleanup_interval seconds
         """
         while True:
             try:
                 time.sleep(self.cleanup_interval)
-                current_time = time.time()
+                now = time.time()
 
                 with self.lock:
-                    to_remove = []
-
-                    for task_id, task_info in self.tasks.items():
-                        future = task_info['future']
-
-                        # Remove if done and older than 1 hour
-                        if future.done():
-                            age = current_time - task_info['created']
-                            if age > 3600:  # 1 hour
-                                to_remove.append(task_id)
-
-                    for task_id in to_remove:
-                        del self.tasks[task_id]
+                    expired = [task_id for task_id, record in self.results.items() if record['expires'] <= now]
+                    for task_id in expired:
+                        self.result_bytes -= self.results.pop(task_id)['size']
+                    self.counters['expired'] += len(expired)
 
-                    if to_remove:
-                        print(f"🧹 Cleaned up {len(to_remove)} old tasks")
+                if expired:
+                    print(f"🧹 Cleaned up {len(expired)} old tasks")
 
             except Exception as e:
                 print(f"⚠️ Cleanup error: {e}")
@@ -248,12 +418,12 @@ class TaskManager:
 _task_manager: Optional[TaskManager] = None
 _manager_lock = threading.Lock()
 
-def get_task_manager(max_workers: int = 10) -> TaskManager:
+def get_task_manager(max_workers: Optional[int] = None) -> TaskManager:
     """
     Get or create the global task manager instance
 
     Args:
-        max_workers: Maximum number of concurrent threads
+        max_workers: Maximum number of concurrent threads (default LOCAL_TASK_MAX_WORKERS)
 
     Returns:
         TaskManager instance